@@ -13,6 +13,23 @@ a = Analysis(
         ('requirements.txt', '.'), 
         ('app_interface.py', '.'), 
         ('gerador_vertices.py', '.'),
+        ('transformadores.py', '.'),
+        ('projecao.py', '.'),
+        ('ordenacao.py', '.'),
+        ('saida_tabela.py', '.'),
+        ('processamento_lote.py', '.'),
+        ('erros.py', '.'),
+        ('leitura.py', '.'),
+        ('saida_vetorial.py', '.'),
+        ('motor_io.py', '.'),
+        ('instrumentacao.py', '.'),
+        ('pontos.py', '.'),
+        ('cache_resultados.py', '.'),
+        ('servidor.py', '.'),
+        ('processamento_async.py', '.'),
+        ('progresso.py', '.'),
+        ('fila_log.py', '.'),
+        ('indice_vertices.py', '.'),
         
         # Diretórios de dados do pyogrio
         ('venv/Lib/site-packages/pyogrio/gdal_data', 'pyogrio/gdal_data'),
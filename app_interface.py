@@ -11,31 +11,63 @@ import os
 import sys
 import threading
 import traceback
+import logging
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                            QLabel, QLineEdit, QPushButton, QFileDialog, QTextEdit, 
-                            QProgressBar, QMessageBox, QGroupBox, QGridLayout, QSplashScreen)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSize
+                            QLabel, QLineEdit, QPushButton, QFileDialog, QPlainTextEdit, 
+                            QProgressBar, QMessageBox, QGroupBox, QGridLayout, QSplashScreen,
+                            QCheckBox)
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal, QSize
 from PyQt5.QtGui import QIcon, QPixmap, QFont
+from erros import ProcessamentoCancelado
+from progresso import TokenCancelamento, formatar_progresso
+from fila_log import FilaLog, INTERVALO_DRENAGEM_MS, LIMITE_LINHAS_PADRAO
+
+class EmissorLog(logging.Handler):
+    """
+    Handler de logging que coloca cada mensagem direto na fila de log.
+
+    A FilaLog é segura entre threads: a thread de trabalho apenas acrescenta
+    as linhas, sem postar eventos na thread da interface, e o QTimer da
+    janela as insere no widget em lotes.
+    """
+
+    def __init__(self, fila_log):
+        super().__init__(level=logging.INFO)
+        self.fila_log = fila_log
+        self.setFormatter(logging.Formatter("%(message)s"))
+
+    def emit(self, record):
+        try:
+            self.fila_log.adicionar(self.format(record))
+        except Exception:
+            self.handleError(record)
 
-# Importar o módulo gerador_vertices
-try:
-    from gerador_vertices import processar_shapefile
-except ImportError:
-    print("Erro: Não foi possível importar o módulo gerador_vertices.py")
-    sys.exit(1)
 
 class ProcessadorThread(QThread):
     """Thread para processar o shapefile sem bloquear a interface."""
     concluido = pyqtSignal(bool, str)  # Sinal para indicar conclusão (sucesso, mensagem)
-    progresso = pyqtSignal(str)  # Sinal para atualizar o progresso
+    andamento = pyqtSignal(int, str)  # Sinal com o percentual e a descrição do andamento
 
-    def __init__(self, caminho_shapefile, caminho_saida_excel, caminho_saida_shapefile):
+    def __init__(self, caminho_shapefile, caminho_saida_excel, caminho_saida_shapefile, fila_log,
+                 medir_memoria=False):
         super().__init__()
+        self.fila_log = fila_log
         self.caminho_shapefile = caminho_shapefile
         self.caminho_saida_excel = caminho_saida_excel
         self.caminho_saida_shapefile = caminho_saida_shapefile
+        self.medir_memoria = medir_memoria
         self.mensagem = ""
         self.cancelado = False
+        self.token = TokenCancelamento()
+
+    def cancelar(self):
+        """Pede o cancelamento; o processamento para no próximo ponto de verificação."""
+        self.cancelado = True
+        self.token.cancelar()
+
+    def relatar_andamento(self, estado):
+        """Função de progresso do processamento (chamada na thread de trabalho ou na de escrita do Excel)."""
+        self.andamento.emit(estado.percentual, formatar_progresso(estado))
 
     def run(self):
         """Executa o processamento do shapefile."""
@@ -46,54 +78,70 @@ class ProcessadorThread(QThread):
             
             # Verificar se é um arquivo shapefile
             if not self.caminho_shapefile.lower().endswith('.shp'):
-                self.progresso.emit(f"Aviso: O arquivo {self.caminho_shapefile} não tem extensão .shp")
+                self.fila_log.adicionar(f"Aviso: O arquivo {self.caminho_shapefile} não tem extensão .shp")
             
             # Emitir mensagem de início
-            self.progresso.emit(f"Iniciando processamento do shapefile: {self.caminho_shapefile}")
+            self.fila_log.adicionar(f"Iniciando processamento do shapefile: {self.caminho_shapefile}")
+            
+            # Importar o processamento apenas quando um trabalho é executado: o
+            # geopandas e o pyproj são pesados e atrasariam a abertura da janela
+            try:
+                from gerador_vertices import processar_shapefile
+                from instrumentacao import formatar_metricas
+            except ImportError as e:
+                raise ImportError(f"Não foi possível importar o módulo gerador_vertices.py: {e}") from e
+            
+            # Encaminhar as mensagens de progresso do processamento para o log da interface
+            emissor = EmissorLog(self.fila_log)
+            raiz = logging.getLogger()
+            nivel_anterior = raiz.level
+            raiz.addHandler(emissor)
+            raiz.setLevel(logging.INFO)
+            # O pyogrio registra cada gravação em nível INFO; manter apenas os avisos, como na linha de comando
+            logging.getLogger("pyogrio").setLevel(logging.WARNING)
             
             # Processar o shapefile
-            processar_shapefile(self.caminho_shapefile, self.caminho_saida_excel, self.caminho_saida_shapefile)
+            try:
+                resultado = processar_shapefile(
+                    self.caminho_shapefile, self.caminho_saida_excel, self.caminho_saida_shapefile,
+                    medir_memoria=self.medir_memoria,
+                    usar_cache=True,
+                    progresso=self.relatar_andamento,
+                    cancelamento=self.token
+                )
+            finally:
+                raiz.removeHandler(emissor)
+                raiz.setLevel(nivel_anterior)
+            
+            self.fila_log.adicionar(f"{resultado.num_pontos} vértices processados em {resultado.tempo_total:.2f}s")
+            for linha in formatar_metricas(resultado.metricas()):
+                self.fila_log.adicionar(linha)
             
             # Verificar se os arquivos de saída foram criados
             if self.caminho_saida_excel and not os.path.exists(self.caminho_saida_excel):
-                self.progresso.emit(f"Aviso: O arquivo Excel de saída não foi criado: {self.caminho_saida_excel}")
+                self.fila_log.adicionar(f"Aviso: O arquivo Excel de saída não foi criado: {self.caminho_saida_excel}")
             
             if self.caminho_saida_shapefile and not os.path.exists(self.caminho_saida_shapefile):
-                self.progresso.emit(f"Aviso: O shapefile de saída não foi criado: {self.caminho_saida_shapefile}")
+                self.fila_log.adicionar(f"Aviso: O shapefile de saída não foi criado: {self.caminho_saida_shapefile}")
             
             # Emitir sinal de conclusão com sucesso
             self.concluido.emit(True, "Processamento concluído com sucesso!")
+        except ProcessamentoCancelado as e:
+            self.mensagem = str(e)
+            self.fila_log.adicionar(str(e))
+            self.concluido.emit(False, self.mensagem)
         except Exception as e:
             # Capturar o erro
             traceback_str = traceback.format_exc()
             self.mensagem = f"Erro: {e}\n{traceback_str}"
             
             # Emitir mensagem de erro para o log
-            self.progresso.emit(f"ERRO: {str(e)}")
+            self.fila_log.adicionar(f"ERRO: {str(e)}")
             
             # Emitir sinal de conclusão com falha
             self.concluido.emit(False, self.mensagem)
 
 
-class RedirecionadorSaida:
-    """Classe para redirecionar a saída do console para um widget QTextEdit."""
-
-    def __init__(self, text_widget):
-        self.text_widget = text_widget
-        self.buffer = ""
-
-    def write(self, texto):
-        self.buffer += texto
-        self.text_widget.append(texto)
-        # Rolar para o final
-        cursor = self.text_widget.textCursor()
-        cursor.movePosition(cursor.End)
-        self.text_widget.setTextCursor(cursor)
-
-    def flush(self):
-        pass
-
-
 class GeradorVerticesApp(QMainWindow):
     """Aplicativo principal do Gerador de Vértices."""
 
@@ -113,9 +161,13 @@ class GeradorVerticesApp(QMainWindow):
         # Centralizar a janela
         self.centralizar_janela()
         
-        # Redirecionar a saída padrão para o widget de texto
-        self.redirecionador = RedirecionadorSaida(self.log_text)
-        sys.stdout = self.redirecionador
+        # Redirecionar a saída padrão para a fila de log, que pode receber
+        # mensagens de qualquer thread; a fila é esvaziada no widget em lotes
+        self.fila_log = FilaLog()
+        sys.stdout = self.fila_log
+        self.timer_log = QTimer(self)
+        self.timer_log.timeout.connect(self.descarregar_log)
+        self.timer_log.start(INTERVALO_DRENAGEM_MS)
 
     def setup_ui(self):
         """Configura a interface do usuário."""
@@ -175,6 +227,9 @@ class GeradorVerticesApp(QMainWindow):
         
         # Botões de ação
         botoes_layout = QHBoxLayout()
+        self.medir_memoria = QCheckBox("Medir memória por etapa")
+        self.medir_memoria.setToolTip("Registra o pico de memória de cada etapa no log (deixa o processamento mais lento)")
+        botoes_layout.addWidget(self.medir_memoria)
         botoes_layout.addStretch()
         
         self.btn_processar = QPushButton("Processar")
@@ -182,21 +237,33 @@ class GeradorVerticesApp(QMainWindow):
         self.btn_processar.clicked.connect(self.processar)
         botoes_layout.addWidget(self.btn_processar)
         
+        self.btn_cancelar = QPushButton("Cancelar")
+        self.btn_cancelar.setMinimumWidth(120)
+        self.btn_cancelar.setEnabled(False)
+        self.btn_cancelar.clicked.connect(self.cancelar_processamento)
+        botoes_layout.addWidget(self.btn_cancelar)
+        
         main_layout.addLayout(botoes_layout)
         
-        # Barra de progresso
+        # Barra de progresso com a etapa atual, a vazão e o tempo restante
         self.progresso = QProgressBar()
-        self.progresso.setTextVisible(False)
+        self.progresso.setRange(0, 100)
+        self.progresso.setTextVisible(True)
         main_layout.addWidget(self.progresso)
         
+        self.status_progresso = QLabel("")
+        main_layout.addWidget(self.status_progresso)
+        
         # Grupo de log
         log_group = QGroupBox("Log de Processamento")
         log_layout = QVBoxLayout()
         log_group.setLayout(log_layout)
         
         # Área de texto para o log
-        self.log_text = QTextEdit()
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
+        # Manter apenas as últimas linhas, para a memória não crescer em trabalhos longos
+        self.log_text.setMaximumBlockCount(LIMITE_LINHAS_PADRAO)
         log_layout.addWidget(self.log_text)
         
         main_layout.addWidget(log_group, 1)  # Stretch factor 1 para expandir
@@ -246,7 +313,7 @@ class GeradorVerticesApp(QMainWindow):
             self,
             "Salvar Shapefile",
             "",
-            "Shapefile (*.shp);;Todos os arquivos (*.*)"
+            "Shapefile (*.shp);;GeoPackage (*.gpkg);;GeoParquet (*.parquet);;Todos os arquivos (*.*)"
         )
         if arquivo:
             self.saida_shapefile.setText(arquivo)
@@ -283,58 +350,84 @@ class GeradorVerticesApp(QMainWindow):
             
             # Desabilitar os controles durante o processamento
             self.btn_processar.setEnabled(False)
-            self.progresso.setRange(0, 0)  # Modo indeterminado
+            self.btn_cancelar.setEnabled(True)
+            self.progresso.setValue(0)
+            self.status_progresso.setText("")
             
-            # Limpar o log
+            # Limpar o log (inclusive as linhas ainda na fila)
+            self.fila_log.drenar()
             self.log_text.clear()
             
             # Iniciar o processamento em uma thread separada
-            self.thread = ProcessadorThread(caminho_shapefile, caminho_saida_excel, caminho_saida_shapefile)
+            self.thread = ProcessadorThread(
+                caminho_shapefile, caminho_saida_excel, caminho_saida_shapefile,
+                self.fila_log, self.medir_memoria.isChecked()
+            )
             self.thread.concluido.connect(self.processamento_concluido)
-            self.thread.progresso.connect(self.atualizar_progresso)
+            self.thread.andamento.connect(self.atualizar_andamento)
             self.thread.start()
             
             # Mostrar mensagem de processamento
-            self.log_text.append("Processando shapefile, por favor aguarde...")
+            self.fila_log.adicionar("Processando shapefile, por favor aguarde...")
             
         except Exception as e:
             # Capturar qualquer exceção não tratada
             QMessageBox.critical(self, "Erro", f"Ocorreu um erro ao iniciar o processamento:\n{str(e)}")
             self.btn_processar.setEnabled(True)
-            self.progresso.setRange(0, 100)
+            self.btn_cancelar.setEnabled(False)
             self.progresso.setValue(0)
             
             # Registrar o erro no log
-            self.log_text.append(f"ERRO: {str(e)}")
+            self.fila_log.adicionar(f"ERRO: {str(e)}")
             import traceback
-            self.log_text.append(traceback.format_exc())
+            self.fila_log.adicionar(traceback.format_exc())
+
+    def cancelar_processamento(self):
+        """Pede o cancelamento do processamento em andamento."""
+        if hasattr(self, 'thread') and self.thread.isRunning():
+            self.thread.cancelar()
+            self.btn_cancelar.setEnabled(False)
+            self.status_progresso.setText("Cancelando...")
 
-    def atualizar_progresso(self, mensagem):
-        """Atualiza o log de progresso."""
-        self.log_text.append(mensagem)
+    def atualizar_andamento(self, percentual, descricao):
+        """Atualiza a barra de progresso e a descrição da etapa atual."""
+        self.progresso.setValue(percentual)
+        self.status_progresso.setText(descricao)
+
+    def descarregar_log(self):
+        """Insere no widget, de uma só vez, as linhas acumuladas na fila de log."""
+        linhas, descartadas = self.fila_log.drenar()
+        if not linhas:
+            return
+        if descartadas:
+            linhas.insert(0, f"... {descartadas} linha(s) omitida(s) ...")
+        self.log_text.appendPlainText("\n".join(linhas))
         # Rolar para o final
-        cursor = self.log_text.textCursor()
-        cursor.movePosition(cursor.End)
-        self.log_text.setTextCursor(cursor)
-        # Processar eventos para atualizar a interface
-        QApplication.processEvents()
+        barra = self.log_text.verticalScrollBar()
+        barra.setValue(barra.maximum())
 
     def processamento_concluido(self, sucesso, mensagem):
         """Callback chamado quando o processamento é concluído."""
         # Reabilitar os controles
         self.btn_processar.setEnabled(True)
-        self.progresso.setRange(0, 100)
+        self.btn_cancelar.setEnabled(False)
         self.progresso.setValue(100 if sucesso else 0)
         
+        if not sucesso and self.thread.cancelado:
+            self.status_progresso.setText("Processamento cancelado.")
+            self.fila_log.adicionar("⏹ " + mensagem)
+            QMessageBox.information(self, "Cancelado", mensagem)
+            return
+        
         # Exibir mensagem no log
         if sucesso:
-            self.log_text.append("✅ " + mensagem)
+            self.fila_log.adicionar("✅ " + mensagem)
         else:
-            self.log_text.append("❌ Erro durante o processamento")
+            self.fila_log.adicionar("❌ Erro durante o processamento")
             # Adicionar detalhes do erro ao log
             for linha in mensagem.split('\n'):
                 if linha.strip():
-                    self.log_text.append("   " + linha)
+                    self.fila_log.adicionar("   " + linha)
         
         # Exibir mensagem em diálogo
         if sucesso:
@@ -386,7 +479,7 @@ def main():
             border: 1px solid #cccccc;
             border-radius: 4px;
         }
-        QTextEdit {
+        QPlainTextEdit {
             border: 1px solid #cccccc;
             border-radius: 4px;
         }
@@ -12,47 +12,48 @@ import os
 import sys
 import argparse
 import traceback
+import multiprocessing
+import importlib.util
 
-def verificar_dependencias():
-    """Verifica se todas as dependências necessárias estão instaladas."""
-    dependencias_faltando = []
-    
-    # Verificar dependências principais
-    try:
-        import pandas
-    except ImportError:
-        dependencias_faltando.append("pandas")
-    
-    try:
-        import geopandas
-    except ImportError:
-        dependencias_faltando.append("geopandas")
-    
-    try:
-        import pyproj
-    except ImportError:
-        dependencias_faltando.append("pyproj")
+# Dependências principais (nome do módulo, nome do pacote no pip)
+DEPENDENCIAS = [
+    ("pandas", "pandas"),
+    ("geopandas", "geopandas"),
+    ("pyproj", "pyproj"),
+    ("openpyxl", "openpyxl"),
+    ("numpy", "numpy"),
+    ("shapely", "shapely"),
+]
+
+# Dependência da interface gráfica
+DEPENDENCIA_INTERFACE = ("PyQt5", "PyQt5")
+
+def verificar_dependencias(incluir_interface=True):
+    """
+    Verifica se todas as dependências necessárias estão instaladas.
     
-    try:
-        import openpyxl
-    except ImportError:
-        dependencias_faltando.append("openpyxl")
+    Usa importlib.util.find_spec, que apenas localiza os módulos sem
+    importá-los, para não pagar o custo de carregar geopandas, pyproj e
+    PyQt5 só para verificar se existem.
     
-    try:
-        import numpy
-    except ImportError:
-        dependencias_faltando.append("numpy")
+    Args:
+        incluir_interface (bool): Verificar também o PyQt5 da interface gráfica
     
-    try:
-        import shapely
-    except ImportError:
-        dependencias_faltando.append("shapely")
+    Returns:
+        list: Pacotes faltando (nomes para o pip)
+    """
+    dependencias = list(DEPENDENCIAS)
+    if incluir_interface:
+        dependencias.append(DEPENDENCIA_INTERFACE)
     
-    # Verificar PyQt5 para a interface gráfica
-    try:
-        import PyQt5
-    except ImportError:
-        dependencias_faltando.append("PyQt5")
+    dependencias_faltando = []
+    for modulo, pacote in dependencias:
+        try:
+            encontrado = importlib.util.find_spec(modulo) is not None
+        except (ImportError, ValueError):
+            encontrado = False
+        if not encontrado:
+            dependencias_faltando.append(pacote)
     
     return dependencias_faltando
 
@@ -88,17 +89,86 @@ def iniciar_interface_grafica():
 def processar_via_linha_comando(args):
     """Processa o shapefile via linha de comando."""
     try:
-        from gerador_vertices import processar_shapefile
-        processar_shapefile(args.shapefile, args.excel, args.saida)
-        return 0
+        from gerador_vertices import processar_shapefile, configurar_log
+        from erros import ErroGeradorVertices
     except ImportError:
         print("Erro: Não foi possível importar o módulo gerador_vertices.py")
         return 1
+    
+    try:
+        configurar_log()
+        resultado = processar_shapefile(args.shapefile, args.excel, args.saida, args.tamanho_bloco,
+                                        args.fuso_referencia, args.formato_saida, args.motor,
+                                        args.medir_memoria, args.metricas, not args.sem_cache,
+                                        args.diretorio_cache,
+                                        escrita_paralela=not args.escrita_sequencial,
+                                        formato_tabela=args.formato_tabela,
+                                        separador_decimal=args.separador_decimal,
+                                        linhas_por_planilha=args.linhas_por_planilha,
+                                        indice_espacial=args.indice_espacial,
+                                        ordenacao=args.ordenacao or ("contorno" if args.contorno else "angular"),
+                                        contorno=args.contorno)
+        print(f"{resultado.num_pontos} vértices processados em {resultado.tempo_total:.2f}s")
+        if args.medir_memoria:
+            from instrumentacao import formatar_metricas
+            print("Métricas por etapa:")
+            for linha in formatar_metricas(resultado.metricas()):
+                print(linha)
+        return 0
+    except ErroGeradorVertices as e:
+        print(f"Erro ao processar o shapefile: {e}")
+        return 1
     except Exception as e:
         print(f"Erro ao processar o shapefile: {e}")
         print(traceback.format_exc())
         return 1
 
+def servir_via_linha_comando(args):
+    """Inicia o servidor de trabalhos HTTP/JSON."""
+    try:
+        from servidor import servir
+    except ImportError:
+        print("Erro: Não foi possível importar o módulo servidor.py")
+        return 1
+    
+    # O processo principal só recebe os pedidos; as bibliotecas pesadas são
+    # carregadas nos processos do pool
+    import logging
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    try:
+        servir(args.host, args.porta, args.workers)
+    except OSError as e:
+        print(f"Erro ao iniciar o servidor em {args.host}:{args.porta}: {e}")
+        return 1
+    return 0
+
+def processar_lote_via_linha_comando(args):
+    """Processa vários shapefiles em lote via linha de comando."""
+    try:
+        from processamento_lote import processar_lote
+        resultados = processar_lote(args.lote, args.diretorio_saida, args.workers, args.resumo,
+                                    {"fuso_referencia": args.fuso_referencia,
+                                     "formato_saida": args.formato_saida,
+                                     "motor": args.motor,
+                                     "medir_memoria": args.medir_memoria,
+                                     "usar_cache": not args.sem_cache,
+                                     "diretorio_cache": args.diretorio_cache,
+                                     "escrita_paralela": not args.escrita_sequencial,
+                                     "formato_tabela": args.formato_tabela,
+                                     "separador_decimal": args.separador_decimal,
+                                     "linhas_por_planilha": args.linhas_por_planilha,
+                                     "indice_espacial": args.indice_espacial,
+                                     "ordenacao": args.ordenacao or ("contorno" if args.contorno else "angular"),
+                                     "contorno": args.contorno})
+        return 0 if resultados and all(r["sucesso"] for r in resultados) else 1
+    except ImportError:
+        print("Erro: Não foi possível importar o módulo processamento_lote.py")
+        return 1
+    except Exception as e:
+        print(f"Erro ao processar o lote: {e}")
+        print(traceback.format_exc())
+        return 1
+
 def criar_shapefile_exemplo(args):
     """Cria um shapefile de exemplo."""
     try:
@@ -149,11 +219,8 @@ def mostrar_menu_interativo():
             if not saida:
                 saida = None
             
-            # Criar um objeto args simulado
-            class Args:
-                pass
-            
-            args = Args()
+            # Partir dos padrões da linha de comando, para que todas as opções existam
+            args = criar_parser().parse_args([])
             args.shapefile = shapefile
             args.excel = excel
             args.saida = saida
@@ -191,6 +258,68 @@ def mostrar_menu_interativo():
         else:
             print("Opção inválida. Por favor escolha uma opção válida.")
 
+def criar_parser():
+    """
+    Cria o parser dos argumentos da linha de comando.
+    
+    Returns:
+        ArgumentParser: Parser com todas as opções do programa
+    """
+    parser = argparse.ArgumentParser(
+        description="Gerador de Vértices - Converte shapefile de pontos em tabela Excel e gera novo shapefile com pontos renomeados."
+    )
+    
+    # Adicionar argumentos
+    parser.add_argument("--gui", action="store_true", help="Iniciar a interface gráfica moderna")
+    parser.add_argument("--criar-exemplo", action="store_true", help="Criar um shapefile de exemplo")
+    parser.add_argument("--shapefile", help="Caminho para o shapefile de entrada")
+    parser.add_argument("--excel", help="Caminho para a tabela de coordenadas de saída (.xlsx ou .csv)")
+    parser.add_argument("--saida", help="Caminho para a camada de saída (.shp, .gpkg ou .parquet)")
+    parser.add_argument("--formato-saida", choices=["shapefile", "gpkg", "parquet"],
+                        help="Formato da camada de saída (padrão: pela extensão de --saida, ou shapefile)")
+    parser.add_argument("--formato-tabela", choices=["excel", "xlsxwriter", "csv"],
+                        help="Formato da tabela de coordenadas: excel (openpyxl), xlsxwriter (mais rápido) "
+                             "ou csv (padrão: pela extensão de --excel, ou excel)")
+    parser.add_argument("--separador-decimal", choices=[",", "."], default=",",
+                        help="Separador decimal da tabela CSV (padrão: vírgula, com colunas separadas por ponto e vírgula)")
+    parser.add_argument("--linhas-por-planilha", type=int, default=None,
+                        help="Linhas de dados por planilha do Excel; tabelas maiores são divididas em várias planilhas "
+                             "(padrão: o limite do Excel, 1.048.574)")
+    parser.add_argument("--indice-espacial", action="store_true",
+                        help="Gravar o índice espacial da camada de saída (.qix no shapefile, bbox no GeoParquet)")
+    parser.add_argument("--ordenacao", choices=["angular", "vizinho_mais_proximo", "contorno", "envoltoria_convexa"],
+                        help="Estratégia de ordenação dos vértices (padrão: angular, ou contorno com --contorno)")
+    parser.add_argument("--contorno", help="Arquivo com o polígono ao longo do qual os vértices são ordenados "
+                                           "(implica --ordenacao contorno)")
+    parser.add_argument("--tamanho-bloco", type=int, default=None,
+                        help="Ler o shapefile em blocos com este número de pontos (para arquivos muito grandes)")
+    parser.add_argument("--motor", choices=["arrow", "padrao"],
+                        help="Motor de leitura e escrita (padrão: arrow se pyogrio e pyarrow estiverem instalados)")
+    parser.add_argument("--fuso-referencia",
+                        help='Projetar todos os pontos em um único fuso UTM: "centroide" (fuso do centro dos pontos), 24 ou 24S')
+    parser.add_argument("--medir-memoria", action="store_true",
+                        help="Medir o pico de memória de cada etapa (tracemalloc e RSS; deixa o processamento mais lento)")
+    parser.add_argument("--metricas", help="Caminho para salvar o tempo e a memória de cada etapa em JSON")
+    parser.add_argument("--sem-cache", action="store_true",
+                        help="Não reaproveitar os pontos já processados de execuções anteriores")
+    parser.add_argument("--diretorio-cache", help="Diretório do cache de resultados (padrão: ~/.cache/gerador_vertices)")
+    parser.add_argument("--escrita-sequencial", action="store_true",
+                        help="Gravar a planilha Excel e a camada uma após a outra, em vez de ao mesmo tempo")
+    parser.add_argument("--lote", help="Diretório, padrão glob ou manifesto (.txt) com vários shapefiles para processar em lote")
+    parser.add_argument("--diretorio-saida", default="saida_lote", help="Diretório raiz para as saídas do processamento em lote")
+    parser.add_argument("--workers", type=int, default=None, help="Número de processos do processamento em lote ou do servidor (padrão: número de CPUs)")
+    parser.add_argument("--resumo", help="Caminho para salvar o resumo do processamento em lote em JSON")
+    parser.add_argument("--servir", action="store_true",
+                        help="Iniciar o servidor de trabalhos (API HTTP/JSON local) com as bibliotecas pré-carregadas")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço do servidor de trabalhos (padrão: 127.0.0.1)")
+    parser.add_argument("--porta", type=int, default=8765, help="Porta do servidor de trabalhos (padrão: 8765)")
+    parser.add_argument("--pontos", type=int, default=10, help="Número de pontos para o shapefile de exemplo")
+    parser.add_argument("--regiao", default="recife",
+                        choices=["recife", "sao_paulo", "rio", "brasilia", "todas"],
+                        help="Região para gerar os pontos do shapefile de exemplo")
+    
+    return parser
+
 def main():
     """Função principal."""
     # Verificar se estamos executando como um executável empacotado
@@ -200,9 +329,18 @@ def main():
     if executavel_empacotado:
         return iniciar_interface_grafica()
     
-    # Verificar dependências apenas se não for um executável empacotado
+    parser = criar_parser()
+    
+    # Analisar argumentos
+    args = parser.parse_args()
+    
+    # A interface gráfica é aberta quando não há argumentos ou com --gui
+    iniciar_interface = len(sys.argv) == 1 or args.gui
+    
+    # Verificar dependências apenas depois de analisar os argumentos, para que
+    # --help responda imediatamente; o PyQt5 só é exigido se a interface for aberta
     if not executavel_empacotado:
-        dependencias_faltando = verificar_dependencias()
+        dependencias_faltando = verificar_dependencias(incluir_interface=iniciar_interface)
         if dependencias_faltando:
             print("Algumas dependências estão faltando:")
             for dep in dependencias_faltando:
@@ -220,25 +358,6 @@ def main():
                 print(f"pip install {' '.join(dependencias_faltando)}")
                 return 1
     
-    # Configurar o parser de argumentos
-    parser = argparse.ArgumentParser(
-        description="Gerador de Vértices - Converte shapefile de pontos em tabela Excel e gera novo shapefile com pontos renomeados."
-    )
-    
-    # Adicionar argumentos
-    parser.add_argument("--gui", action="store_true", help="Iniciar a interface gráfica moderna")
-    parser.add_argument("--criar-exemplo", action="store_true", help="Criar um shapefile de exemplo")
-    parser.add_argument("--shapefile", help="Caminho para o shapefile de entrada")
-    parser.add_argument("--excel", help="Caminho para o arquivo Excel de saída")
-    parser.add_argument("--saida", help="Caminho para o shapefile de saída")
-    parser.add_argument("--pontos", type=int, default=10, help="Número de pontos para o shapefile de exemplo")
-    parser.add_argument("--regiao", default="recife",
-                        choices=["recife", "sao_paulo", "rio", "brasilia"],
-                        help="Região para gerar os pontos do shapefile de exemplo")
-    
-    # Analisar argumentos
-    args = parser.parse_args()
-    
     # Verificar se o usuário forneceu algum argumento
     if len(sys.argv) == 1:
         # Nenhum argumento fornecido, iniciar interface gráfica por padrão
@@ -251,6 +370,12 @@ def main():
     elif args.criar_exemplo:
         # Criar shapefile de exemplo
         return criar_shapefile_exemplo(args)
+    elif args.servir:
+        # Manter um processo aquecido recebendo trabalhos pela API HTTP
+        return servir_via_linha_comando(args)
+    elif args.lote:
+        # Processar vários shapefiles em lote
+        return processar_lote_via_linha_comando(args)
     elif args.shapefile:
         # Processar o shapefile via linha de comando
         return processar_via_linha_comando(args)
@@ -260,4 +385,6 @@ def main():
         return 0
 
 if __name__ == "__main__":
+    # Necessário para o pool de processos do modo em lote no executável empacotado
+    multiprocessing.freeze_support()
     sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark das Etapas do Processamento
+-------------------------------------
+Mede cada etapa de `processar_shapefile` (leitura, projeção, ordenação,
+formatação GMS, escrita do Excel e escrita do shapefile) em conjuntos de
+dados sintéticos de 10 a 1 milhão de pontos, gerados por
+`criar_shapefile_exemplo` para cada região.
+
+O resultado pode ser salvo em JSON e comparado com um resultado de
+referência (baseline): as etapas que ficarem mais lentas do que o limite
+de tolerância são listadas como regressões e o script termina com código 1.
+
+Uso:
+    python benchmarks/bench_etapas.py [--tamanhos 10 100 1000] [--regioes recife todas]
+        [--repeticoes 3] [--diretorio dados_bench] [--saida resultado.json]
+        [--baseline baseline.json] [--limite 0.2] [--salvar-baseline baseline.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+
+# conjuntos_dados coloca a raiz do projeto no sys.path
+from conjuntos_dados import REGIOES_DISPONIVEIS, TAMANHOS_PADRAO, preparar_entrada
+from gerador_vertices import processar_shapefile
+
+# Etapas de processar_shapefile, na ordem em que são executadas
+ETAPAS = ("leitura", "projecao", "ordenacao", "formatacao", "excel", "shapefile")
+
+# Variação relativa a partir da qual uma etapa é considerada uma regressão
+LIMITE_PADRAO = 0.2
+
+# Diferenças absolutas menores que isto (em segundos) são tratadas como ruído
+DIFERENCA_MINIMA = 0.005
+
+
+def medir_etapas(caminho_entrada, diretorio, repeticoes):
+    """
+    Processa um arquivo várias vezes e resume o tempo de cada etapa.
+
+    A primeira execução é de aquecimento e não entra na medição.
+
+    Args:
+        caminho_entrada (str): Shapefile de entrada
+        diretorio (str): Diretório para os arquivos gerados
+        repeticoes (int): Número de execuções
+
+    Returns:
+        dict: Mediana em segundos de cada etapa e do total
+    """
+    nome_base = os.path.splitext(os.path.basename(caminho_entrada))[0]
+    caminho_excel = os.path.join(diretorio, f"{nome_base}_coordenadas.xlsx")
+    caminho_saida = os.path.join(diretorio, f"{nome_base}_renomeado.shp")
+
+    # Uma execução de aquecimento, fora da medição (importações, caches do PROJ).
+    # O cache de resultados fica desligado para que todas as etapas sejam medidas.
+    processar_shapefile(caminho_entrada, caminho_excel, caminho_saida, usar_cache=False)
+
+    execucoes = []
+    for _ in range(repeticoes):
+        resultado = processar_shapefile(caminho_entrada, caminho_excel, caminho_saida, usar_cache=False)
+        execucoes.append(dict(resultado.tempos, total=resultado.tempo_total))
+
+    etapas = {etapa: statistics.median(tempos.get(etapa, 0.0) for tempos in execucoes) for etapa in ETAPAS}
+    etapas["total"] = statistics.median(tempos["total"] for tempos in execucoes)
+    return etapas
+
+
+def comparar_com_baseline(resultado, baseline, limite=LIMITE_PADRAO):
+    """
+    Compara um resultado com o baseline e lista as etapas que ficaram mais lentas.
+
+    Args:
+        resultado (dict): Resultado atual
+        baseline (dict): Resultado de referência
+        limite (float): Variação relativa tolerada (0.2 = 20% mais lento)
+
+    Returns:
+        list: Regressões, cada uma com região, pontos, etapa, tempos e variação
+    """
+    referencia = {(m["regiao"], m["pontos"]): m["etapas"] for m in baseline["medicoes"]}
+
+    regressoes = []
+    for medicao in resultado["medicoes"]:
+        etapas_baseline = referencia.get((medicao["regiao"], medicao["pontos"]))
+        if etapas_baseline is None:
+            continue
+        for etapa, atual in medicao["etapas"].items():
+            anterior = etapas_baseline.get(etapa)
+            if not anterior or atual - anterior < DIFERENCA_MINIMA:
+                continue
+            variacao = atual / anterior - 1
+            if variacao > limite:
+                regressoes.append({
+                    "regiao": medicao["regiao"],
+                    "pontos": medicao["pontos"],
+                    "etapa": etapa,
+                    "baseline": anterior,
+                    "atual": atual,
+                    "variacao": variacao
+                })
+    return regressoes
+
+
+def imprimir_medicao(medicao):
+    """Mostra os tempos de cada etapa de uma medição."""
+    etapas = medicao["etapas"]
+    print(f"\n{medicao['pontos']} pontos ({medicao['regiao']}): total {etapas['total']:.3f}s")
+    for etapa in ETAPAS:
+        print(f"  {etapa:12s} {etapas[etapa]:9.4f}s")
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Mede cada etapa do processamento do Gerador de Vértices.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=list(TAMANHOS_PADRAO),
+                        help="Números de pontos dos conjuntos de dados")
+    parser.add_argument("--regioes", nargs="+", default=list(REGIOES_DISPONIVEIS), choices=REGIOES_DISPONIVEIS,
+                        help="Regiões dos conjuntos de dados")
+    parser.add_argument("--repeticoes", "-n", type=int, default=3, help="Execuções por conjunto de dados")
+    parser.add_argument("--diretorio", "-d", help="Diretório para os conjuntos de dados (padrão: temporário)")
+    parser.add_argument("--saida", "-o", help="Caminho para salvar o resultado em JSON")
+    parser.add_argument("--baseline", "-b", help="Resultado de referência (JSON) para detectar regressões")
+    parser.add_argument("--limite", type=float, default=LIMITE_PADRAO,
+                        help="Variação tolerada em relação ao baseline (padrão: 0.2 = 20%%)")
+    parser.add_argument("--salvar-baseline", help="Salvar o resultado também como novo baseline")
+    args = parser.parse_args()
+
+    # Silenciar o progresso e os avisos repetidos a cada execução
+    logging.basicConfig(level=logging.ERROR, format="%(message)s")
+
+    resultado = {"python": sys.version.split()[0], "repeticoes": args.repeticoes, "medicoes": []}
+
+    with tempfile.TemporaryDirectory() as temporario:
+        diretorio_dados = args.diretorio or temporario
+        for regiao in args.regioes:
+            for num_pontos in args.tamanhos:
+                caminho_entrada = preparar_entrada(diretorio_dados, num_pontos, regiao)
+                medicao = {
+                    "regiao": regiao,
+                    "pontos": num_pontos,
+                    "etapas": medir_etapas(caminho_entrada, temporario, args.repeticoes)
+                }
+                resultado["medicoes"].append(medicao)
+                imprimir_medicao(medicao)
+
+    for caminho in (args.saida, args.salvar_baseline):
+        if caminho:
+            with open(caminho, "w", encoding="utf-8") as arquivo:
+                json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+            print(f"\nResultado salvo em: {caminho}")
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as arquivo:
+        baseline = json.load(arquivo)
+    regressoes = comparar_com_baseline(resultado, baseline, args.limite)
+
+    if not regressoes:
+        print(f"\nNenhuma regressão acima de {args.limite:.0%} em relação a {args.baseline}.")
+        return 0
+
+    print(f"\n{len(regressoes)} regressão(ões) acima de {args.limite:.0%} em relação a {args.baseline}:")
+    for regressao in regressoes:
+        print(f"  {regressao['regiao']}, {regressao['pontos']} pontos, {regressao['etapa']}: "
+              f"{regressao['baseline']:.4f}s -> {regressao['atual']:.4f}s (+{regressao['variacao']:.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark de Inicialização
+--------------------------
+Mede o tempo de inicialização do Gerador de Vértices:
+
+- tempo até a ajuda: `python app_main.py --help`, do início do processo até o fim;
+- tempo até a janela: do início do processo até a janela principal da
+  interface PyQt5 ser exibida;
+- custo de importação de cada módulo, a partir de `python -X importtime`.
+
+Uso:
+    python benchmarks/bench_inicializacao.py [--repeticoes 5] [--saida resultado.json]
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Diretório raiz do projeto (onde estão app_main.py e app_interface.py)
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Marcador impresso pelo processo filho quando a janela é exibida
+MARCADOR_JANELA = "JANELA_EXIBIDA"
+
+# Código executado no processo filho para abrir a janela principal
+CODIGO_JANELA = f"""
+import sys
+from PyQt5.QtWidgets import QApplication
+app = QApplication(sys.argv)
+from app_interface import GeradorVerticesApp
+janela = GeradorVerticesApp()
+janela.show()
+app.processEvents()
+sys.__stdout__.write("{MARCADOR_JANELA}\\n")
+sys.__stdout__.flush()
+"""
+
+
+def _ambiente():
+    """Ambiente dos processos filhos (Qt sem tela quando não há display)."""
+    ambiente = dict(os.environ)
+    if sys.platform.startswith("linux") and not ambiente.get("DISPLAY"):
+        ambiente.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return ambiente
+
+
+def medir_tempo_ate_ajuda(repeticoes):
+    """
+    Mede o tempo de `python app_main.py --help`.
+
+    Args:
+        repeticoes (int): Número de execuções
+
+    Returns:
+        list: Tempos de cada execução em segundos
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "app_main.py", "--help"],
+            cwd=RAIZ_PROJETO, env=_ambiente(), check=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def medir_tempo_ate_janela(repeticoes):
+    """
+    Mede o tempo do início do processo até a janela principal ser exibida.
+
+    Args:
+        repeticoes (int): Número de execuções
+
+    Returns:
+        list: Tempos de cada execução em segundos
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        processo = subprocess.Popen(
+            [sys.executable, "-c", CODIGO_JANELA],
+            cwd=RAIZ_PROJETO, env=_ambiente(),
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
+        try:
+            for linha in processo.stdout:
+                if linha.strip() == MARCADOR_JANELA:
+                    tempos.append(time.perf_counter() - inicio)
+                    break
+        finally:
+            processo.kill()
+            processo.wait()
+    return tempos
+
+
+def medir_importacoes(modulo, limite=15):
+    """
+    Lista os módulos mais caros de importar com `python -X importtime`.
+
+    Args:
+        modulo (str): Módulo importado no processo filho
+        limite (int): Quantidade de módulos listados
+
+    Returns:
+        dict: Tempo total de importação e os módulos mais caros (tempo acumulado em ms)
+    """
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=RAIZ_PROJETO, env=_ambiente(),
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+
+    # Formato: "import time:  self [us] | cumulative | imported package"
+    medicoes = []
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        partes = linha[len("import time:"):].split("|")
+        if len(partes) != 3:
+            continue
+        nome = partes[2].strip()
+        acumulado = int(partes[1]) / 1000
+        # Módulos de nível superior têm indentação mínima
+        nivel = (len(partes[2]) - len(partes[2].lstrip()) - 1) // 2
+        medicoes.append({"modulo": nome, "acumulado_ms": acumulado, "nivel": nivel})
+
+    total = sum(m["acumulado_ms"] for m in medicoes if m["nivel"] == 0)
+    mais_caros = sorted(medicoes, key=lambda m: m["acumulado_ms"], reverse=True)[:limite]
+
+    return {"total_ms": total, "mais_caros": mais_caros}
+
+
+def _resumir(tempos):
+    """Resume uma lista de tempos em segundos."""
+    if not tempos:
+        return None
+    return {
+        "mediana": statistics.median(tempos),
+        "minimo": min(tempos),
+        "maximo": max(tempos),
+        "execucoes": len(tempos)
+    }
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Mede o tempo de inicialização do Gerador de Vértices.")
+    parser.add_argument("--repeticoes", "-n", type=int, default=5, help="Execuções por medição")
+    parser.add_argument("--saida", "-o", help="Caminho para salvar o resultado em JSON")
+    args = parser.parse_args()
+
+    resultado = {
+        "python": sys.version.split()[0],
+        "tempo_ate_ajuda": _resumir(medir_tempo_ate_ajuda(args.repeticoes)),
+        "importacao_app_main": medir_importacoes("app_main"),
+    }
+
+    if importlib.util.find_spec("PyQt5") is not None:
+        resultado["tempo_ate_janela"] = _resumir(medir_tempo_ate_janela(args.repeticoes))
+        resultado["importacao_app_interface"] = medir_importacoes("app_interface")
+    else:
+        print("PyQt5 não está instalado: o tempo até a janela não será medido.")
+
+    print(f"Tempo até a ajuda: {resultado['tempo_ate_ajuda']['mediana'] * 1000:.0f} ms (mediana)")
+    if resultado.get("tempo_ate_janela"):
+        print(f"Tempo até a janela: {resultado['tempo_ate_janela']['mediana'] * 1000:.0f} ms (mediana)")
+
+    for chave in ("importacao_app_main", "importacao_app_interface"):
+        if chave not in resultado:
+            continue
+        print(f"\n{chave}: {resultado[chave]['total_ms']:.1f} ms")
+        for medicao in resultado[chave]["mais_caros"]:
+            print(f"  {medicao['acumulado_ms']:8.1f} ms  {medicao['modulo']}")
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+        print(f"\nResultado salvo em: {args.saida}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark dos Motores de E/S
+----------------------------
+Compara os motores de leitura e escrita de motor_io ("arrow" e "padrao") em
+arquivos de pontos de vários tamanhos criados por `criar_shapefile_exemplo`:
+
+- leitura: `leitura.ler_pontos` do shapefile de entrada;
+- escrita: `saida_vetorial.escrever_camada` da camada lida, como Shapefile
+  e como GeoPackage.
+
+Uso:
+    python benchmarks/bench_motores.py [--tamanhos 10000 100000 1000000]
+        [--repeticoes 3] [--diretorio dados_bench] [--saida resultado.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# conjuntos_dados coloca a raiz do projeto no sys.path
+from conjuntos_dados import preparar_entrada
+from leitura import ler_arquivo, ler_pontos
+from motor_io import MOTORES, arrow_disponivel
+from saida_vetorial import escrever_camada
+
+TAMANHOS_PADRAO = (10000, 100000, 1000000)
+
+# Formatos gravados na medição de escrita
+FORMATOS_ESCRITA = ("shapefile", "gpkg")
+
+
+def _medir(funcao, repeticoes):
+    """Executa a função várias vezes e retorna os tempos em segundos."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def medir_motor(caminho_entrada, diretorio, motor, repeticoes):
+    """
+    Mede a leitura e a escrita de um arquivo com um motor.
+
+    Args:
+        caminho_entrada (str): Shapefile de entrada
+        diretorio (str): Diretório para os arquivos gravados
+        motor (str): Motor de E/S
+        repeticoes (int): Número de execuções de cada medição
+
+    Returns:
+        dict: Mediana em segundos da leitura e da escrita em cada formato
+    """
+    resultado = {
+        "leitura": statistics.median(_medir(lambda: ler_pontos(caminho_entrada, motor), repeticoes))
+    }
+
+    camada = ler_arquivo(caminho_entrada, motor)
+    for formato in FORMATOS_ESCRITA:
+        extensao = ".shp" if formato == "shapefile" else f".{formato}"
+        caminho_saida = os.path.join(diretorio, f"saida_{motor}{extensao}")
+        tempos = _medir(lambda: escrever_camada(camada, caminho_saida, formato, motor), repeticoes)
+        resultado[f"escrita_{formato}"] = statistics.median(tempos)
+
+    return resultado
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Compara os motores de E/S do Gerador de Vértices.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=list(TAMANHOS_PADRAO),
+                        help="Números de pontos dos arquivos de teste")
+    parser.add_argument("--repeticoes", "-n", type=int, default=3, help="Execuções por medição")
+    parser.add_argument("--diretorio", "-d", help="Diretório para os arquivos de teste (padrão: temporário)")
+    parser.add_argument("--saida", "-o", help="Caminho para salvar o resultado em JSON")
+    args = parser.parse_args()
+
+    if not arrow_disponivel():
+        print("pyogrio/pyarrow não estão instalados: o motor arrow usaria o motor padrão.")
+        return 1
+
+    with tempfile.TemporaryDirectory() as temporario:
+        diretorio = args.diretorio or temporario
+        os.makedirs(diretorio, exist_ok=True)
+
+        resultado = {"python": sys.version.split()[0], "repeticoes": args.repeticoes, "medicoes": []}
+        for num_pontos in args.tamanhos:
+            caminho_entrada = preparar_entrada(diretorio, num_pontos)
+            medicao = {"pontos": num_pontos}
+            for motor in MOTORES:
+                medicao[motor] = medir_motor(caminho_entrada, diretorio, motor, args.repeticoes)
+            resultado["medicoes"].append(medicao)
+
+            print(f"\n{num_pontos} pontos")
+            for etapa in medicao[MOTORES[0]]:
+                tempos = {motor: medicao[motor][etapa] for motor in MOTORES}
+                ganho = tempos["padrao"] / tempos["arrow"] if tempos["arrow"] else float("nan")
+                print(f"  {etapa:18s} arrow {tempos['arrow']:8.3f}s  "
+                      f"padrao {tempos['padrao']:8.3f}s  ({ganho:.2f}x)")
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+        print(f"\nResultado salvo em: {args.saida}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
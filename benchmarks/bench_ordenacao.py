@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark das Estratégias de Ordenação
+--------------------------------------
+Compara o tempo das estratégias de ordenação de ordenacao (angular,
+vizinho_mais_proximo, contorno e envoltoria_convexa) em arquivos de pontos
+de vários tamanhos criados por `criar_shapefile_exemplo`.
+
+Os pontos são lidos e projetados uma única vez por arquivo; apenas a
+ordenação é medida. A estratégia "contorno" usa a envoltória convexa dos
+pontos, ampliada, como polígono. Além do tempo, é mostrado o tempo por
+ponto: em estratégias O(n log n) ele cresce pouco de um tamanho para o
+seguinte, enquanto em uma estratégia O(n²) ele cresceria na mesma
+proporção do número de pontos.
+
+Uso:
+    python benchmarks/bench_ordenacao.py [--tamanhos 10000 100000 1000000]
+        [--repeticoes 3] [--diretorio dados_bench] [--saida resultado.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import shapely
+
+# conjuntos_dados coloca a raiz do projeto no sys.path
+from conjuntos_dados import preparar_entrada
+from leitura import ler_pontos
+from ordenacao import ESTRATEGIAS_ORDENACAO, ordenar_vertices
+from projecao import projetar_coordenadas
+
+TAMANHOS_PADRAO = (10000, 100000, 1000000)
+
+
+def contorno_de_teste(pontos):
+    """Polígono que envolve os pontos, no SRC de entrada, para a estratégia "contorno"."""
+    envoltoria = shapely.convex_hull(shapely.multipoints(np.column_stack((pontos["x"], pontos["y"]))))
+    return envoltoria.buffer(envoltoria.length * 0.01)
+
+
+def medir_estrategia(pontos, estrategia, contorno, repeticoes):
+    """
+    Mede a ordenação dos pontos com uma estratégia.
+
+    Args:
+        pontos (PontosColunares): Pontos já projetados
+        estrategia (str): Nome da estratégia
+        contorno (Geometry): Polígono da estratégia "contorno"
+        repeticoes (int): Número de execuções
+
+    Returns:
+        float: Mediana do tempo em segundos
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        ordem = ordenar_vertices(pontos, estrategia, contorno)
+        tempos.append(time.perf_counter() - inicio)
+
+    # Toda estratégia deve produzir uma permutação dos pontos
+    if not np.array_equal(np.sort(ordem), np.arange(len(pontos))):
+        raise AssertionError(f"A estratégia {estrategia} não produziu uma permutação dos pontos.")
+    return statistics.median(tempos)
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Compara as estratégias de ordenação dos vértices.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=list(TAMANHOS_PADRAO),
+                        help="Números de pontos dos arquivos de teste")
+    parser.add_argument("--estrategias", nargs="+", choices=list(ESTRATEGIAS_ORDENACAO),
+                        default=list(ESTRATEGIAS_ORDENACAO), help="Estratégias medidas")
+    parser.add_argument("--repeticoes", "-n", type=int, default=3, help="Execuções por medição")
+    parser.add_argument("--diretorio", "-d", help="Diretório para os arquivos de teste (padrão: temporário)")
+    parser.add_argument("--saida", "-o", help="Caminho para salvar o resultado em JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporario:
+        diretorio = args.diretorio or temporario
+        os.makedirs(diretorio, exist_ok=True)
+
+        resultado = {"python": sys.version.split()[0], "repeticoes": args.repeticoes, "medicoes": []}
+        for num_pontos in args.tamanhos:
+            pontos, crs = ler_pontos(preparar_entrada(diretorio, num_pontos))
+            pontos = projetar_coordenadas(pontos, crs)
+            contorno = contorno_de_teste(pontos)
+
+            medicao = {"pontos": num_pontos}
+            for estrategia in args.estrategias:
+                medicao[estrategia] = medir_estrategia(pontos, estrategia, contorno, args.repeticoes)
+            resultado["medicoes"].append(medicao)
+
+            print(f"\n{num_pontos} pontos")
+            for estrategia in args.estrategias:
+                tempo = medicao[estrategia]
+                print(f"  {estrategia:22s} {tempo:8.3f}s  {tempo / num_pontos * 1e6:8.2f} µs/ponto")
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+        print(f"\nResultado salvo em: {args.saida}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark das Saídas em Tabela
+------------------------------
+Compara os formatos da tabela de coordenadas de saida_tabela ("excel" com o
+openpyxl, "xlsxwriter" e "csv") em arquivos de pontos de vários tamanhos
+criados por `criar_shapefile_exemplo`.
+
+A tabela de cada arquivo é gerada uma única vez por `processar_shapefile`;
+depois, apenas a escrita de cada formato é medida, com as mesmas linhas
+que o processamento envia ao escritor. Também são registrados o tamanho
+do arquivo gerado e o ganho em relação ao openpyxl.
+
+Uso:
+    python benchmarks/bench_tabelas.py [--tamanhos 10000 100000 1000000]
+        [--repeticoes 3] [--diretorio dados_bench] [--saida resultado.json]
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# conjuntos_dados coloca a raiz do projeto no sys.path
+from conjuntos_dados import preparar_entrada
+from gerador_vertices import processar_shapefile
+from saida_tabela import FORMATOS_TABELA, escrever_tabela
+
+# O openpyxl leva cerca de 20 s por 100 mil linhas; 1 milhão fica opcional
+TAMANHOS_PADRAO = (10000, 100000)
+
+# Formato de referência para o cálculo do ganho
+FORMATO_REFERENCIA = "excel"
+
+
+def gerar_tabela(caminho_entrada, diretorio):
+    """
+    Gera a tabela de coordenadas de um arquivo (gravando-a em CSV, o formato mais rápido).
+
+    Returns:
+        DataFrame: Tabela de coordenadas
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultado = processar_shapefile(
+            caminho_entrada, os.path.join(diretorio, "tabela.csv"), os.path.join(diretorio, "vertices.shp"),
+            usar_cache=False
+        )
+    return resultado.tabela
+
+
+def medir_formato(tabela, caminho_saida, formato, repeticoes):
+    """
+    Mede a escrita da tabela em um formato.
+
+    Args:
+        tabela (DataFrame): Tabela de coordenadas
+        caminho_saida (str): Arquivo gravado
+        formato (str): Formato da tabela (chave de FORMATOS_TABELA)
+        repeticoes (int): Número de execuções
+
+    Returns:
+        dict: Mediana do tempo em segundos e tamanho do arquivo em MB
+    """
+    colunas = list(tabela.columns)
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        escrever_tabela(caminho_saida, tabela.itertuples(index=False, name=None), colunas, formato)
+        tempos.append(time.perf_counter() - inicio)
+    return {"tempo": statistics.median(tempos), "tamanho_mb": os.path.getsize(caminho_saida) / (1024 * 1024)}
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Compara os formatos da tabela de coordenadas.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=list(TAMANHOS_PADRAO),
+                        help="Números de pontos dos arquivos de teste")
+    parser.add_argument("--repeticoes", "-n", type=int, default=3, help="Execuções por medição")
+    parser.add_argument("--diretorio", "-d", help="Diretório para os arquivos de teste (padrão: temporário)")
+    parser.add_argument("--saida", "-o", help="Caminho para salvar o resultado em JSON")
+    args = parser.parse_args()
+
+    formatos = list(FORMATOS_TABELA)
+    if importlib.util.find_spec("xlsxwriter") is None:
+        print("xlsxwriter não está instalado: o formato xlsxwriter não será medido.")
+        formatos.remove("xlsxwriter")
+
+    with tempfile.TemporaryDirectory() as temporario:
+        diretorio = args.diretorio or temporario
+        os.makedirs(diretorio, exist_ok=True)
+
+        resultado = {"python": sys.version.split()[0], "repeticoes": args.repeticoes, "medicoes": []}
+        for num_pontos in args.tamanhos:
+            tabela = gerar_tabela(preparar_entrada(diretorio, num_pontos), temporario)
+            medicao = {"pontos": num_pontos}
+            for formato in formatos:
+                extensao = FORMATOS_TABELA[formato][0]
+                caminho_saida = os.path.join(temporario, f"tabela_{formato}{extensao}")
+                medicao[formato] = medir_formato(tabela, caminho_saida, formato, args.repeticoes)
+            resultado["medicoes"].append(medicao)
+
+            print(f"\n{num_pontos} pontos")
+            referencia = medicao[FORMATO_REFERENCIA]["tempo"]
+            for formato in formatos:
+                tempo = medicao[formato]["tempo"]
+                ganho = referencia / tempo if tempo else float("nan")
+                print(f"  {formato:12s} {tempo:8.3f}s  {medicao[formato]['tamanho_mb']:8.1f} MB  ({ganho:.2f}x)")
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+        print(f"\nResultado salvo em: {args.saida}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Conjuntos de Dados dos Benchmarks
+---------------------------------
+Geração dos shapefiles sintéticos usados pelos benchmarks, a partir de
+`criar_shapefile_exemplo`. Os arquivos são criados uma única vez por
+(número de pontos, região) e reaproveitados nas execuções seguintes.
+"""
+
+import contextlib
+import io
+import os
+import sys
+
+# Diretório raiz do projeto (onde estão os módulos do Gerador de Vértices)
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ_PROJETO not in sys.path:
+    sys.path.insert(0, RAIZ_PROJETO)
+
+from criar_shapefile_exemplo import REGIOES, TODAS_REGIOES, criar_shapefile_exemplo  # noqa: E402
+
+# Tamanhos padrão dos conjuntos de dados, de 10 a 1 milhão de pontos
+TAMANHOS_PADRAO = (10, 100, 1000, 10000, 100000, 1000000)
+
+# Regiões disponíveis para os conjuntos de dados
+REGIOES_DISPONIVEIS = tuple(REGIOES) + (TODAS_REGIOES,)
+
+
+def preparar_entrada(diretorio, num_pontos, regiao="recife"):
+    """
+    Cria (ou reaproveita) o shapefile de exemplo com o número de pontos pedido.
+
+    Args:
+        diretorio (str): Diretório dos arquivos de teste
+        num_pontos (int): Número de pontos
+        regiao (str): Região dos pontos (ver criar_shapefile_exemplo)
+
+    Returns:
+        str: Caminho do shapefile
+    """
+    caminho = os.path.join(diretorio, f"pontos_{regiao}_{num_pontos}.shp")
+    if not os.path.exists(caminho):
+        os.makedirs(diretorio, exist_ok=True)
+        # criar_shapefile_exemplo imprime uma mensagem por arquivo criado
+        with contextlib.redirect_stdout(io.StringIO()):
+            criar_shapefile_exemplo(caminho, num_pontos, regiao)
+    return caminho
@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Cache de Resultados
+-------------------
+Cache persistente em disco dos pontos já projetados e ordenados, para que
+reprocessar o mesmo shapefile (ex: só mudando os caminhos de saída) pule a
+leitura, a projeção e a ordenação e apenas grave as saídas.
+
+A chave de cada entrada é um hash SHA-256 do conteúdo dos arquivos de
+entrada (.shp, .shx, .dbf, .prj e .cpg) e das opções que alteram o
+resultado. Cada entrada é um arquivo .npz com as colunas de
+PontosColunares já na ordem dos vértices e o CRS da entrada em WKT.
+
+O tamanho total do cache é limitado: ao gravar uma nova entrada, as
+entradas usadas há mais tempo são removidas (LRU). O uso de uma entrada é
+registrado na data de modificação do seu arquivo.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+
+import numpy as np
+from pyproj import CRS
+
+from pontos import PontosColunares
+
+logger = logging.getLogger(__name__)
+
+# Versão do formato das entradas; mudá-la invalida todo o cache existente
+VERSAO_CACHE = 1
+
+# Arquivos que compõem um shapefile e entram no hash
+EXTENSOES_ENTRADA = (".shp", ".shx", ".dbf", ".prj", ".cpg")
+
+# Tamanho máximo padrão do cache, em bytes
+TAMANHO_MAXIMO_PADRAO = 512 * 1024 * 1024
+
+EXTENSAO_ENTRADA_CACHE = ".npz"
+
+# Bytes lidos por vez ao calcular o hash dos arquivos
+TAMANHO_LEITURA = 1024 * 1024
+
+
+def diretorio_cache_padrao():
+    """
+    Diretório padrão do cache: a variável de ambiente GERADOR_VERTICES_CACHE
+    ou ~/.cache/gerador_vertices.
+
+    Returns:
+        str: Caminho do diretório
+    """
+    diretorio = os.environ.get("GERADOR_VERTICES_CACHE")
+    if diretorio:
+        return diretorio
+    return os.path.join(os.path.expanduser("~"), ".cache", "gerador_vertices")
+
+
+def arquivos_entrada(caminho):
+    """
+    Lista os arquivos que compõem uma entrada: o próprio arquivo e, se
+    existirem, os demais arquivos do shapefile com o mesmo nome.
+
+    Args:
+        caminho (str): Caminho do arquivo de entrada
+
+    Returns:
+        list: Caminhos dos arquivos, começando pelo informado
+    """
+    base = os.path.splitext(caminho)[0]
+    arquivos = [caminho]
+    for extensao in EXTENSOES_ENTRADA:
+        for candidato in (base + extensao, base + extensao.upper()):
+            if os.path.isfile(candidato) and candidato not in arquivos:
+                arquivos.append(candidato)
+                break
+    return arquivos
+
+
+class CacheResultados:
+    """
+    Cache LRU em disco dos pontos ordenados de cada entrada.
+
+    Falhas do cache nunca interrompem o processamento: uma entrada ilegível
+    é descartada e tratada como ausente, e uma falha ao gravar é apenas
+    registrada no log.
+    """
+
+    def __init__(self, diretorio=None, tamanho_maximo=TAMANHO_MAXIMO_PADRAO):
+        """
+        Args:
+            diretorio (str, opcional): Diretório das entradas (padrão:
+                diretorio_cache_padrao())
+            tamanho_maximo (int, opcional): Tamanho máximo do cache em bytes
+        """
+        self.diretorio = diretorio or diretorio_cache_padrao()
+        self.tamanho_maximo = tamanho_maximo
+
+    def calcular_chave(self, caminho, **opcoes):
+        """
+        Calcula a chave de uma entrada.
+
+        Args:
+            caminho (str): Caminho do arquivo de entrada
+            **opcoes: Opções do processamento que alteram o resultado
+
+        Returns:
+            str: Hash SHA-256 em hexadecimal
+
+        Raises:
+            OSError: Se o arquivo de entrada não puder ser lido
+        """
+        hash_entrada = hashlib.sha256(f"gerador_vertices:{VERSAO_CACHE}".encode())
+        for arquivo in arquivos_entrada(caminho):
+            hash_entrada.update(os.path.splitext(arquivo)[1].lower().encode())
+            with open(arquivo, "rb") as conteudo:
+                for parte in iter(lambda: conteudo.read(TAMANHO_LEITURA), b""):
+                    hash_entrada.update(parte)
+        for nome in sorted(opcoes):
+            hash_entrada.update(f"{nome}={opcoes[nome]!r}".encode())
+        return hash_entrada.hexdigest()
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, chave + EXTENSAO_ENTRADA_CACHE)
+
+    def carregar(self, chave):
+        """
+        Carrega os pontos de uma entrada do cache.
+
+        Args:
+            chave (str): Chave calculada por calcular_chave
+
+        Returns:
+            tuple: (PontosColunares, CRS) ou None se a entrada não existir
+        """
+        caminho = self._caminho(chave)
+        if not os.path.isfile(caminho):
+            return None
+
+        try:
+            with np.load(caminho, allow_pickle=False) as dados:
+                pontos = PontosColunares(indice=dados["indice"])
+                for nome in dados.files:
+                    if nome.startswith("coluna_"):
+                        pontos[nome[len("coluna_"):]] = dados[nome]
+                crs = CRS.from_wkt(str(dados["crs"]))
+        except Exception as e:
+            logger.warning(f"Entrada do cache ilegível descartada ({caminho}): {e}")
+            self._remover(caminho)
+            return None
+
+        # Marcar a entrada como usada recentemente
+        try:
+            os.utime(caminho)
+        except OSError:
+            pass
+        return pontos, crs
+
+    def salvar(self, chave, pontos, crs):
+        """
+        Grava os pontos de uma entrada e aplica o limite de tamanho do cache.
+
+        Args:
+            chave (str): Chave calculada por calcular_chave
+            pontos (PontosColunares): Pontos já na ordem dos vértices
+            crs: CRS da entrada
+        """
+        colunas = {f"coluna_{nome}": pontos[nome] for nome in pontos.colunas()}
+        try:
+            os.makedirs(self.diretorio, exist_ok=True)
+            # Gravar em um arquivo temporário e renomear, para que outro
+            # processo nunca leia uma entrada incompleta
+            descritor, temporario = tempfile.mkstemp(suffix=".tmp", dir=self.diretorio)
+            try:
+                with os.fdopen(descritor, "wb") as arquivo:
+                    np.savez(arquivo, indice=pontos.indice, crs=np.array(CRS(crs).to_wkt()), **colunas)
+                os.replace(temporario, self._caminho(chave))
+            except BaseException:
+                self._remover(temporario)
+                raise
+        except Exception as e:
+            logger.warning(f"Não foi possível gravar o cache em {self.diretorio}: {e}")
+            return
+
+        self.limitar()
+
+    def entradas(self):
+        """
+        Lista as entradas do cache, da usada há mais tempo à mais recente.
+
+        Returns:
+            list: Tuplas (caminho, tamanho em bytes)
+        """
+        if not os.path.isdir(self.diretorio):
+            return []
+
+        entradas = []
+        for nome in os.listdir(self.diretorio):
+            if not nome.endswith(EXTENSAO_ENTRADA_CACHE):
+                continue
+            caminho = os.path.join(self.diretorio, nome)
+            try:
+                estado = os.stat(caminho)
+            except OSError:
+                continue
+            entradas.append((estado.st_mtime, caminho, estado.st_size))
+        entradas.sort()
+        return [(caminho, tamanho) for _, caminho, tamanho in entradas]
+
+    def limitar(self):
+        """Remove as entradas usadas há mais tempo até o cache caber no tamanho máximo."""
+        entradas = self.entradas()
+        total = sum(tamanho for _, tamanho in entradas)
+        for caminho, tamanho in entradas:
+            if total <= self.tamanho_maximo:
+                break
+            self._remover(caminho)
+            total -= tamanho
+            logger.debug(f"Entrada removida do cache: {caminho}")
+
+    def limpar(self):
+        """Remove todas as entradas do cache."""
+        for caminho, _ in self.entradas():
+            self._remover(caminho)
+
+    @staticmethod
+    def _remover(caminho):
+        try:
+            os.remove(caminho)
+        except OSError:
+            pass
@@ -12,67 +12,82 @@ import os
 import numpy as np
 import pandas as pd
 import geopandas as gpd
-from shapely.geometry import Point
+import shapely
 
-def criar_shapefile_exemplo(caminho_saida="pontos_exemplo.shp", num_pontos=10, regiao="recife"):
+# Limites de coordenadas de cada região
+REGIOES = {
+    "recife": {
+        "lat_min": -8.1,
+        "lat_max": -7.9,
+        "lon_min": -35.0,
+        "lon_max": -34.8
+    },
+    "sao_paulo": {
+        "lat_min": -23.65,
+        "lat_max": -23.45,
+        "lon_min": -46.8,
+        "lon_max": -46.6
+    },
+    "rio": {
+        "lat_min": -23.0,
+        "lat_max": -22.8,
+        "lon_min": -43.3,
+        "lon_max": -43.1
+    },
+    "brasilia": {
+        "lat_min": -15.9,
+        "lat_max": -15.7,
+        "lon_min": -48.0,
+        "lon_max": -47.8
+    }
+}
+
+# Região especial que distribui os pontos entre todas as regiões
+TODAS_REGIOES = "todas"
+
+def criar_shapefile_exemplo(caminho_saida="pontos_exemplo.shp", num_pontos=10, regiao="recife", semente=42):
     """
     Cria um shapefile de exemplo com pontos aleatórios.
     
     Args:
         caminho_saida (str): Caminho para salvar o shapefile
         num_pontos (int): Número de pontos a serem criados
-        regiao (str): Região para gerar os pontos ('recife', 'sao_paulo', 'rio', 'brasilia')
+        regiao (str): Região para gerar os pontos ('recife', 'sao_paulo', 'rio', 'brasilia'
+            ou 'todas' para dividir os pontos entre todas as regiões)
+        semente (int): Semente do gerador aleatório, para reprodutibilidade
     
     Returns:
         GeoDataFrame: O GeoDataFrame criado
     """
-    # Definir limites de coordenadas para diferentes regiões
-    regioes = {
-        "recife": {
-            "lat_min": -8.1,
-            "lat_max": -7.9,
-            "lon_min": -35.0,
-            "lon_max": -34.8
-        },
-        "sao_paulo": {
-            "lat_min": -23.65,
-            "lat_max": -23.45,
-            "lon_min": -46.8,
-            "lon_max": -46.6
-        },
-        "rio": {
-            "lat_min": -23.0,
-            "lat_max": -22.8,
-            "lon_min": -43.3,
-            "lon_max": -43.1
-        },
-        "brasilia": {
-            "lat_min": -15.9,
-            "lat_max": -15.7,
-            "lon_min": -48.0,
-            "lon_max": -47.8
-        }
-    }
-    
     # Usar a região especificada ou recife como padrão
-    if regiao not in regioes:
+    if regiao != TODAS_REGIOES and regiao not in REGIOES:
         print(f"Região '{regiao}' não encontrada. Usando 'recife' como padrão.")
         regiao = "recife"
     
-    limites = regioes[regiao]
+    if regiao == TODAS_REGIOES:
+        # Dividir os pontos entre as regiões o mais igualmente possível
+        quantidades = np.diff(np.linspace(0, num_pontos, len(REGIOES) + 1).astype(int))
+        partes = list(zip(REGIOES.values(), quantidades))
+    else:
+        partes = [(REGIOES[regiao], num_pontos)]
     
     # Gerar coordenadas aleatórias
-    np.random.seed(42)  # Para reprodutibilidade
-    latitudes = np.random.uniform(limites["lat_min"], limites["lat_max"], num_pontos)
-    longitudes = np.random.uniform(limites["lon_min"], limites["lon_max"], num_pontos)
+    np.random.seed(semente)  # Para reprodutibilidade
+    latitudes = []
+    longitudes = []
+    for limites, quantidade in partes:
+        latitudes.append(np.random.uniform(limites["lat_min"], limites["lat_max"], quantidade))
+        longitudes.append(np.random.uniform(limites["lon_min"], limites["lon_max"], quantidade))
+    latitudes = np.concatenate(latitudes)
+    longitudes = np.concatenate(longitudes)
     
-    # Criar geometrias de pontos
-    geometrias = [Point(lon, lat) for lon, lat in zip(longitudes, latitudes)]
+    # Criar as geometrias de pontos de uma vez (rápido mesmo com milhões de pontos)
+    geometrias = shapely.points(longitudes, latitudes)
     
     # Criar um GeoDataFrame
     gdf = gpd.GeoDataFrame(
         {
-            "id": range(1, num_pontos + 1),
+            "id": np.arange(1, num_pontos + 1),
             "nome": [f"Ponto {i}" for i in range(1, num_pontos + 1)]
         },
         geometry=geometrias,
@@ -94,7 +109,7 @@ def main():
     parser.add_argument("--saida", "-o", default="pontos_exemplo.shp", help="Caminho para salvar o shapefile")
     parser.add_argument("--pontos", "-n", type=int, default=10, help="Número de pontos a serem criados")
     parser.add_argument("--regiao", "-r", default="recife", 
-                        choices=["recife", "sao_paulo", "rio", "brasilia"],
+                        choices=list(REGIOES) + [TODAS_REGIOES],
                         help="Região para gerar os pontos")
     
     # Analisar os argumentos
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Erros do Gerador de Vértices
+----------------------------
+Hierarquia de exceções levantadas pelo processamento. Todas derivam de
+ErroGeradorVertices, de modo que quem usa o processamento como biblioteca
+pode tratar qualquer falha com um único `except` sem encerrar o processo.
+"""
+
+
+class ErroGeradorVertices(Exception):
+    """Erro base de todas as falhas do processamento."""
+
+
+class ErroLeitura(ErroGeradorVertices):
+    """O arquivo de entrada não pôde ser lido."""
+
+
+class ErroEntradaVazia(ErroLeitura):
+    """O arquivo de entrada não contém nenhum ponto."""
+
+
+class ErroGeometria(ErroGeradorVertices):
+    """O arquivo de entrada contém geometrias que não são pontos."""
+
+
+class ErroProjecao(ErroGeradorVertices):
+    """As coordenadas não puderam ser convertidas (ex: CRS ausente ou inválido)."""
+
+
+class ErroOrdenacao(ErroGeradorVertices):
+    """Os vértices não puderam ser ordenados (ex: estratégia desconhecida ou contorno inválido)."""
+
+
+class ErroEscrita(ErroGeradorVertices):
+    """Um arquivo de saída não pôde ser gravado."""
+
+
+class ProcessamentoCancelado(ErroGeradorVertices):
+    """O processamento foi cancelado por quem o iniciou (ver progresso.TokenCancelamento)."""
+
+
+class ErroSaidas(ErroEscrita):
+    """
+    Uma ou mais saídas não puderam ser gravadas.
+
+    Attributes:
+        falhas (dict): Erro de cada saída que falhou (ex: {"excel": ErroEscrita(...)})
+    """
+
+    def __init__(self, falhas):
+        self.falhas = falhas
+        super().__init__("; ".join(str(erro) for erro in falhas.values()))
+
+    def __reduce__(self):
+        return (self.__class__, (self.falhas,))
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Fila de Log das Interfaces
+--------------------------
+Destino das mensagens exibidas no log das interfaces gráficas (PyQt5 e
+Tkinter). Em vez de escrever no widget a cada `print` ou mensagem do
+logging (o que é lento e, a partir da thread de processamento, inseguro),
+as linhas são guardadas em uma fila protegida por trava; a interface a
+esvazia periodicamente na sua própria thread (QTimer ou `after`) e insere
+todas as linhas pendentes de uma vez.
+
+A fila tem tamanho limitado: se a interface não acompanhar, as linhas mais
+antigas são descartadas e contadas.
+"""
+
+import threading
+from collections import deque
+
+# Linhas mantidas na fila (e no widget de log) no máximo
+LIMITE_LINHAS_PADRAO = 5000
+
+# Intervalo entre duas drenagens da fila pela interface, em milissegundos
+INTERVALO_DRENAGEM_MS = 100
+
+
+class FilaLog:
+    """
+    Fila de linhas de log segura entre threads.
+
+    Também funciona como arquivo de texto (`write`/`flush`), para substituir
+    o sys.stdout e receber os `print` de qualquer thread.
+    """
+
+    def __init__(self, limite=LIMITE_LINHAS_PADRAO):
+        """
+        Args:
+            limite (int, opcional): Número máximo de linhas pendentes
+        """
+        self._linhas = deque(maxlen=limite)
+        self._trava = threading.Lock()
+        self._parcial = ""
+        self._descartadas = 0
+
+    def write(self, texto):
+        """Recebe texto como um arquivo; cada linha completa entra na fila."""
+        with self._trava:
+            *completas, self._parcial = (self._parcial + texto).split("\n")
+            for linha in completas:
+                self._adicionar(linha)
+        return len(texto)
+
+    def flush(self):
+        pass
+
+    def adicionar(self, mensagem):
+        """
+        Coloca uma mensagem na fila (mensagens com várias linhas viram várias linhas).
+
+        Args:
+            mensagem (str): Mensagem a exibir
+        """
+        with self._trava:
+            for linha in str(mensagem).split("\n"):
+                self._adicionar(linha)
+
+    def _adicionar(self, linha):
+        if len(self._linhas) == self._linhas.maxlen:
+            self._descartadas += 1
+        self._linhas.append(linha)
+
+    def drenar(self):
+        """
+        Retira todas as linhas pendentes.
+
+        Returns:
+            tuple: (lista de linhas, número de linhas descartadas desde a
+            última drenagem por falta de espaço)
+        """
+        with self._trava:
+            linhas = list(self._linhas)
+            self._linhas.clear()
+            descartadas, self._descartadas = self._descartadas, 0
+        return linhas, descartadas
+
@@ -11,15 +11,46 @@ renomeados no formato P-01, P-02, etc.
 
 import os
 import sys
+import logging
 import pandas as pd
 import geopandas as gpd
-from pyproj import CRS, Transformer
 import numpy as np
 from shapely.geometry import Point
 import math
+from concurrent.futures import ThreadPoolExecutor
 import openpyxl
 from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
+from transformadores import pool_transformadores
+from projecao import adicionar_utm, projetar_coordenadas, projetar_geografico, rotular_fusos
+from pontos import PontosColunares
+from leitura import contar_feicoes, criar_geometrias, ler_contorno, ler_pontos, ler_pontos_em_blocos
+from ordenacao import ESTRATEGIA_PADRAO, ESTRATEGIAS_ORDENACAO, ordenar_vertices
+from saida_tabela import (LINHAS_POR_PLANILHA_PADRAO, SEPARADOR_DECIMAL_PADRAO, ajustar_extensao_tabela,
+                          escrever_tabela, identificar_formato_tabela)
+from saida_vetorial import ajustar_extensao, escrever_camada, identificar_formato
+from indice_vertices import IndiceVertices
+from motor_io import resolver_motor
+from instrumentacao import Instrumentacao, salvar_metricas
+from cache_resultados import CacheResultados
+from progresso import AcompanhamentoProgresso
+from erros import (ErroGeradorVertices, ErroLeitura, ErroProjecao, ErroOrdenacao, ErroEscrita,
+                   ErroSaidas, ProcessamentoCancelado)
+
+logger = logging.getLogger(__name__)
+
+# Linhas da planilha escritas entre dois relatos de progresso
+PASSO_PROGRESSO_LINHAS = 5000
+
+# Escala dos segundos no formato GMS (5 casas decimais)
+ESCALA_SEGUNDOS = 10 ** 5
+
+# Tabelas de partes pré-formatadas usadas por decimal_para_gms_lote
+_DIGITOS_GRAUS = np.array([f"{i:02d}" for i in range(361)])
+_DIGITOS_MINUTOS = np.array([f" {i:02d}' " for i in range(60)])
+_DIGITOS_SEGUNDOS = np.array([f"{i}." for i in range(60)])
+_DIGITOS_CENTESIMOS = np.array([f"{i:02d}" for i in range(100)])
+_DIGITOS_MILESIMOS = np.array([f"{i:03d}''" for i in range(1000)])
 
 def decimal_para_gms(coordenada, is_latitude=True):
     """
@@ -42,12 +73,74 @@ def decimal_para_gms(coordenada, is_latitude=True):
     minutos = int(minutos_decimal)
     segundos = (minutos_decimal - minutos) * 60
     
+    # Arredondar os segundos para as casas decimais exibidas e propagar o
+    # "vai um" quando o arredondamento chega a 60'' (ou os minutos a 60')
+    segundos_inteiros = round(segundos * ESCALA_SEGUNDOS)
+    if segundos_inteiros >= 60 * ESCALA_SEGUNDOS:
+        segundos_inteiros -= 60 * ESCALA_SEGUNDOS
+        minutos += 1
+        if minutos >= 60:
+            minutos -= 60
+            graus += 1
+    
     # Formatar a string com sinal negativo para sul e oeste
     # Formato como na planilha de referência: -03 19' 4031121''
+    texto = (f"{graus:02d} {minutos:02d}' "
+             f"{segundos_inteiros // ESCALA_SEGUNDOS}.{segundos_inteiros % ESCALA_SEGUNDOS:05d}''")
     if sinal < 0:
-        return f"-{graus:02d} {minutos:02d}' {segundos:.5f}''"
+        return f"-{texto}"
     else:
-        return f"{graus:02d} {minutos:02d}' {segundos:.5f}''"
+        return texto
+
+def decimal_para_gms_lote(coordenadas, is_latitude=True):
+    """
+    Converte um array de coordenadas decimais para o formato grau, minuto, segundo.
+    
+    Versão vetorizada de decimal_para_gms: produz exatamente as mesmas strings,
+    mas opera sobre a coluna inteira de uma vez com NumPy.
+    
+    Args:
+        coordenadas (numpy.ndarray): Coordenadas em formato decimal
+        is_latitude (bool): Indica se as coordenadas são latitudes (True) ou longitudes (False)
+    
+    Returns:
+        numpy.ndarray: Coordenadas no formato GMS
+    """
+    coordenadas = np.asarray(coordenadas, dtype=np.float64)
+    negativo = coordenadas < 0
+    absoluto = np.abs(coordenadas)
+    
+    # Calcular graus, minutos e segundos
+    graus = np.trunc(absoluto)
+    minutos_decimal = (absoluto - graus) * 60
+    minutos = np.trunc(minutos_decimal)
+    segundos = (minutos_decimal - minutos) * 60
+    
+    graus = graus.astype(np.int64)
+    minutos = minutos.astype(np.int64)
+    segundos_inteiros = np.rint(segundos * ESCALA_SEGUNDOS).astype(np.int64)
+    
+    # Propagar o "vai um" do arredondamento dos segundos e dos minutos
+    vai_um = segundos_inteiros >= 60 * ESCALA_SEGUNDOS
+    segundos_inteiros[vai_um] -= 60 * ESCALA_SEGUNDOS
+    minutos[vai_um] += 1
+    vai_um = minutos >= 60
+    minutos[vai_um] -= 60
+    graus[vai_um] += 1
+    
+    # Montar as strings no mesmo formato de decimal_para_gms, consultando
+    # tabelas de dígitos pré-formatados em vez de converter cada número
+    if graus.size and graus.max() >= len(_DIGITOS_GRAUS):
+        texto_graus = np.char.zfill(graus.astype(str), 2)
+    else:
+        texto_graus = _DIGITOS_GRAUS[graus]
+    texto = np.char.add(np.where(negativo, "-", ""), texto_graus)
+    texto = np.char.add(texto, _DIGITOS_MINUTOS[minutos])
+    texto = np.char.add(texto, _DIGITOS_SEGUNDOS[segundos_inteiros // ESCALA_SEGUNDOS])
+    texto = np.char.add(texto, _DIGITOS_CENTESIMOS[segundos_inteiros // 1000 % 100])
+    texto = np.char.add(texto, _DIGITOS_MILESIMOS[segundos_inteiros % 1000])
+    
+    return texto
 
 def calcular_azimute(ponto, centro):
     """
@@ -79,12 +172,9 @@ def obter_fuso_utm(longitude):
 
 def converter_para_utm(latitude, longitude, fuso):
     """Converte coordenadas geográficas para UTM."""
-    # Definir o CRS de origem (WGS84) e destino (UTM)
-    crs_origem = CRS.from_epsg(4326)  # WGS84
-    crs_destino = CRS.from_string(f"+proj=utm +zone={fuso} +south" if latitude < 0 else f"+proj=utm +zone={fuso}")
-    
-    # Criar o transformador
-    transformer = Transformer.from_crs(crs_origem, crs_destino, always_xy=True)
+    # Obter o transformador WGS84 -> UTM do pool (criado apenas na primeira vez)
+    hemisferio = "S" if latitude < 0 else "N"
+    transformer = pool_transformadores.obter_utm(fuso, hemisferio)
     
     # Converter as coordenadas
     leste, norte = transformer.transform(longitude, latitude)
@@ -93,11 +183,8 @@ def converter_para_utm(latitude, longitude, fuso):
 
 def converter_para_geografico(x, y, crs_shapefile):
     """Converte coordenadas do shapefile para coordenadas geográficas (latitude, longitude)."""
-    # Definir o CRS de destino (WGS84)
-    crs_destino = CRS.from_epsg(4326)  # WGS84
-    
-    # Criar o transformador
-    transformer = Transformer.from_crs(crs_shapefile, crs_destino, always_xy=True)
+    # Obter o transformador para WGS84 do pool (criado apenas na primeira vez)
+    transformer = pool_transformadores.obter_geografico(crs_shapefile)
     
     # Converter as coordenadas
     longitude, latitude = transformer.transform(x, y)
@@ -168,180 +255,519 @@ def formatar_planilha(caminho_excel):
     
     # Salvar o arquivo formatado
     wb.save(caminho_excel)
-    print(f"Planilha formatada salva em: {caminho_excel}")
+    logger.info(f"Planilha formatada salva em: {caminho_excel}")
+
+class ResultadoProcessamento:
+    """
+    Resultado de uma execução de processar_shapefile.
+    
+    Attributes:
+        num_pontos (int): Número de vértices processados
+        caminho_excel (str): Caminho do arquivo Excel gerado
+        caminho_shapefile (str): Caminho do shapefile gerado
+        tempos (dict): Tempo em segundos de cada etapa do processamento
+        duracao (float): Tempo decorrido do processamento em segundos (None se
+            não informado)
+        transformadores (dict): Acertos e falhas do pool de transformadores nesta execução
+        fusos (list): Fusos UTM usados nas coordenadas (ex: ["24S"])
+        memoria (dict): Picos de memória de cada etapa em MB (vazio se não medidos)
+        tabela (DataFrame): Tabela de coordenadas gerada
+        camada (GeoDataFrame): Camada de vértices gerada
+        indice (IndiceVertices): Índice espacial em memória dos vértices ordenados,
+            em coordenadas UTM (ESTE, NORTE), construído na primeira consulta
+    """
+    
+    def __init__(self, num_pontos, caminho_excel, caminho_shapefile, tempos, transformadores, tabela, camada,
+                 fusos=None, memoria=None, duracao=None):
+        self.num_pontos = num_pontos
+        self.caminho_excel = caminho_excel
+        self.caminho_shapefile = caminho_shapefile
+        self.tempos = tempos
+        self.duracao = duracao
+        self.transformadores = transformadores
+        self.fusos = fusos or []
+        self.memoria = memoria or {}
+        self.tabela = tabela
+        self.camada = camada
+        self._indice = None
+    
+    @property
+    def indice(self):
+        """Índice espacial dos vértices (STRtree) em coordenadas UTM, construído uma única vez por processamento."""
+        if self._indice is None:
+            self._indice = IndiceVertices.da_tabela(self.tabela)
+        return self._indice
+    
+    @property
+    def tempo_total(self):
+        """
+        Tempo total do processamento em segundos.
+        
+        Com as saídas gravadas em paralelo, é menor que a soma dos tempos das etapas.
+        """
+        if self.duracao is not None:
+            return self.duracao
+        return sum(self.tempos.values())
+    
+    def metricas(self):
+        """
+        Métricas do processamento em um dict serializável em JSON.
+        
+        Returns:
+            dict: Número de pontos, tempo total e tempo e memória de cada etapa
+        """
+        etapas = {}
+        for nome, tempo in self.tempos.items():
+            etapas[nome] = {"tempo": tempo}
+            etapas[nome].update(self.memoria.get(nome, {}))
+        return {"pontos": self.num_pontos, "tempo_total": self.tempo_total, "etapas": etapas}
+    
+    def __iter__(self):
+        # Permite desempacotar como o retorno anterior: df, gdf = processar_shapefile(...)
+        return iter((self.tabela, self.camada))
+    
+    def __repr__(self):
+        return (f"ResultadoProcessamento(num_pontos={self.num_pontos}, "
+                f"caminho_excel={self.caminho_excel!r}, caminho_shapefile={self.caminho_shapefile!r}, "
+                f"tempo_total={self.tempo_total:.3f})")
+
+
+def _validar_crs(crs):
+    """Garante que o arquivo de entrada tenha um sistema de coordenadas definido."""
+    if crs is None:
+        raise ErroProjecao("O shapefile não possui sistema de coordenadas definido (arquivo .prj).")
+
+def _projetar(funcao, *args):
+    """Executa uma etapa de projeção, convertendo falhas em ErroProjecao."""
+    try:
+        return funcao(*args)
+    except Exception as e:
+        raise ErroProjecao(f"Erro ao converter as coordenadas: {e}") from e
+
+def _ler_e_projetar(caminho_shapefile, tamanho_bloco, instrumentacao, fuso_referencia=None, motor=None,
+                    acompanhamento=None):
+    """
+    Lê os pontos de entrada e calcula suas coordenadas geográficas e UTM.
+    
+    Sem tamanho de bloco, o arquivo é lido de uma vez. Com tamanho de bloco,
+    cada bloco é lido e convertido para coordenadas geográficas antes da
+    leitura do próximo e apenas as colunas de coordenadas são mantidas; a
+    projeção UTM é feita ao final, quando o fuso de referência (ex: o do
+    centro dos pontos) já pode ser calculado sobre todos os pontos. O
+    progresso e o cancelamento são verificados a cada bloco.
+    
+    Returns:
+        tuple: (PontosColunares com as coordenadas de todos os pontos, CRS do arquivo)
+    """
+    if acompanhamento is None:
+        acompanhamento = AcompanhamentoProgresso()
+    
+    if not tamanho_bloco:
+        acompanhamento.iniciar_etapa('leitura')
+        with instrumentacao.etapa('leitura'):
+            pontos, crs = ler_pontos(caminho_shapefile, motor)
+        _validar_crs(crs)
+        acompanhamento.iniciar_etapa('projecao', len(pontos))
+        with instrumentacao.etapa('projecao'):
+            _projetar(projetar_coordenadas, pontos, crs, fuso_referencia)
+        acompanhamento.avancar(len(pontos))
+        return pontos, crs
+    
+    # A leitura em blocos relata o avanço de cada bloco lido e convertido
+    acompanhamento.iniciar_etapa('leitura', contar_feicoes(caminho_shapefile))
+    blocos = []
+    crs = None
+    leitor = ler_pontos_em_blocos(caminho_shapefile, tamanho_bloco, motor)
+    while True:
+        with instrumentacao.etapa('leitura'):
+            bloco = next(leitor, None)
+        if bloco is None:
+            break
+        pontos, crs = bloco
+        _validar_crs(crs)
+        with instrumentacao.etapa('projecao'):
+            blocos.append(_projetar(projetar_geografico, pontos, crs))
+        acompanhamento.avancar(len(pontos))
+    
+    # Blocos sem z (pontos 2D) recebem NaN, como no leitor do GDAL
+    pontos = PontosColunares.concatenar(blocos)
+    acompanhamento.iniciar_etapa('projecao', len(pontos))
+    with instrumentacao.etapa('projecao'):
+        _projetar(adicionar_utm, pontos, fuso_referencia)
+    acompanhamento.avancar(len(pontos))
+    logger.debug(f"{len(blocos)} bloco(s) de até {tamanho_bloco} pontos lidos.")
+    return pontos, crs
+
+def _gravar_tabela(caminho_saida_excel, formato_tabela, separador_decimal, linhas_por_planilha, df,
+                   instrumentacao, acompanhamento):
+    """
+    Grava a tabela de coordenadas (planilha Excel ou CSV) em uma única passagem,
+    relatando o avanço (e verificando o cancelamento) a cada grupo de linhas.
+    """
+    acompanhamento.iniciar_etapa('excel', len(df))
+    with instrumentacao.etapa('excel'):
+        linhas = acompanhamento.acompanhar(df.itertuples(index=False, name=None), PASSO_PROGRESSO_LINHAS)
+        # A tabela só substitui o arquivo de destino se for gravada até o fim;
+        # um cancelamento não deixa uma planilha incompleta para trás
+        try:
+            escrever_tabela(caminho_saida_excel, linhas, list(df.columns), formato_tabela, separador_decimal,
+                            linhas_por_planilha)
+        except ProcessamentoCancelado:
+            raise
+        except Exception as e:
+            raise ErroEscrita(f"Erro ao salvar a tabela {caminho_saida_excel}: {e}") from e
+    logger.info(f"Tabela de coordenadas ({formato_tabela}) salva em: {caminho_saida_excel}")
+
+def _gravar_camada(caminho_saida_shapefile, formato_saida, motor, indice_espacial, df, rotulos_fusos, pontos, crs,
+                   instrumentacao, acompanhamento=None):
+    """
+    Cria a camada de vértices com os pontos ordenados e a grava no formato escolhido.
+    
+    Returns:
+        GeoDataFrame: Camada gravada
+    """
+    if acompanhamento is not None:
+        acompanhamento.iniciar_etapa('shapefile', len(df))
+    with instrumentacao.etapa('shapefile'):
+        # Criar um novo GeoDataFrame com os pontos ordenados e apenas as colunas necessárias
+        novo_gdf = gpd.GeoDataFrame(
+            df.assign(FUSO=rotulos_fusos),
+            geometry=criar_geometrias(pontos['x'], pontos['y'], pontos.get('z')),
+            crs=crs
+        )
+        
+        # Salvar a camada no formato escolhido
+        try:
+            escrever_camada(novo_gdf, caminho_saida_shapefile, formato_saida, motor, indice_espacial)
+        except Exception as e:
+            raise ErroEscrita(f"Erro ao salvar a camada {caminho_saida_shapefile}: {e}") from e
+    logger.info(f"Nova camada de vértices ({formato_saida}) salva em: {caminho_saida_shapefile}")
+    return novo_gdf
 
-def processar_shapefile(caminho_shapefile, caminho_saida_excel=None, caminho_saida_shapefile=None):
+def _gravar_saidas(saidas, paralelo):
+    """
+    Grava as saídas, uma após a outra ou em paralelo, reunindo os erros de cada uma.
+    
+    Uma saída com ErroEscrita não impede a gravação das demais; qualquer
+    outra exceção é um erro de programação e é repassada como está. O
+    cancelamento interrompe a gravação sequencial imediatamente; em paralelo,
+    as demais saídas terminam antes de ele ser repassado.
+    
+    Args:
+        saidas (dict): Função de gravação de cada saída, pelo nome
+        paralelo (bool): Gravar todas as saídas ao mesmo tempo, em threads
+    
+    Returns:
+        dict: Retorno da função de cada saída
+    
+    Raises:
+        ProcessamentoCancelado: Se o processamento for cancelado
+        ErroSaidas: Se alguma saída não puder ser gravada, com o erro de cada uma
+    """
+    resultados = {}
+    falhas = {}
+    if paralelo:
+        with ThreadPoolExecutor(max_workers=len(saidas), thread_name_prefix="saida") as executor:
+            futuros = {nome: executor.submit(gravar) for nome, gravar in saidas.items()}
+        for nome, futuro in futuros.items():
+            try:
+                resultados[nome] = futuro.result()
+            except (ErroEscrita, ProcessamentoCancelado) as e:
+                falhas[nome] = e
+    else:
+        for nome, gravar in saidas.items():
+            try:
+                resultados[nome] = gravar()
+            except ErroEscrita as e:
+                falhas[nome] = e
+    
+    for erro in falhas.values():
+        if isinstance(erro, ProcessamentoCancelado):
+            raise erro
+    if falhas:
+        raise ErroSaidas(falhas)
+    return resultados
+
+def processar_shapefile(caminho_shapefile, caminho_saida_excel=None, caminho_saida_shapefile=None,
+                        tamanho_bloco=None, fuso_referencia=None, formato_saida=None, motor=None,
+                        medir_memoria=False, caminho_metricas=None, usar_cache=False, diretorio_cache=None,
+                        progresso=None, cancelamento=None, escrita_paralela=True, formato_tabela=None,
+                        separador_decimal=SEPARADOR_DECIMAL_PADRAO, linhas_por_planilha=None,
+                        indice_espacial=False, ordenacao=ESTRATEGIA_PADRAO, contorno=None):
     """
     Processa um arquivo shapefile, gera uma tabela Excel com coordenadas e um novo shapefile.
     
+    As mensagens de progresso são enviadas pelo módulo logging (logger
+    "gerador_vertices") e as falhas levantam exceções derivadas de
+    ErroGeradorVertices, de modo que a função pode ser chamada repetidamente
+    no mesmo processo.
+    
     Args:
         caminho_shapefile (str): Caminho para o arquivo shapefile de entrada
-        caminho_saida_excel (str, opcional): Caminho para salvar o arquivo Excel de saída
-        caminho_saida_shapefile (str, opcional): Caminho para salvar o novo shapefile
+        caminho_saida_excel (str, opcional): Caminho para salvar a tabela de coordenadas (Excel ou CSV)
+        caminho_saida_shapefile (str, opcional): Caminho para salvar a camada de vértices
+        tamanho_bloco (int, opcional): Lê a entrada em blocos com este número de
+            pontos, mantendo em memória apenas os arrays de coordenadas (para
+            arquivos muito grandes). Por padrão o arquivo é lido de uma vez.
+        fuso_referencia (opcional): Projeta todos os pontos em um único fuso UTM:
+            "centroide" (fuso do centro dos pontos), um número de fuso (ex: 24)
+            ou fuso com hemisfério (ex: "24S"). Por padrão cada ponto usa o
+            fuso da sua longitude.
+        formato_saida (str, opcional): Formato da camada de vértices: "shapefile",
+            "gpkg" ou "parquet". Por padrão é identificado pela extensão de
+            caminho_saida_shapefile (.shp, .gpkg ou .parquet).
+        motor (str, opcional): Motor de leitura e escrita dos arquivos vetoriais:
+            "arrow" (pyogrio com Apache Arrow) ou "padrao". Por padrão usa o
+            Arrow quando o pyogrio e o pyarrow estão instalados.
+        medir_memoria (bool, opcional): Mede também o pico de memória de cada
+            etapa (tracemalloc e RSS). O tempo de cada etapa é sempre medido.
+        caminho_metricas (str, opcional): Caminho para salvar as métricas por
+            etapa em JSON
+        usar_cache (bool, opcional): Reaproveita os pontos já projetados e
+            ordenados de uma execução anterior com a mesma entrada e o mesmo
+            fuso de referência, pulando a leitura, a projeção e a ordenação.
+            Desligado por padrão, para que a função não grave fora dos
+            caminhos de saída; a linha de comando, as interfaces, o lote e o
+            servidor o ligam.
+        diretorio_cache (str, opcional): Diretório do cache (padrão:
+            GERADOR_VERTICES_CACHE ou ~/.cache/gerador_vertices)
+        progresso (callable, opcional): Função chamada com um
+            progresso.EstadoProgresso (etapa, percentual, pontos por segundo e
+            tempo restante) no início de cada etapa e durante a leitura em
+            blocos e a escrita do Excel. É chamada na thread do processamento,
+            exceto durante a escrita paralela, quando o progresso do Excel é
+            enviado pela thread que grava a planilha; a função deve, portanto,
+            ser segura entre threads (ex: emitir um sinal ou usar uma fila).
+        cancelamento (TokenCancelamento, opcional): Token verificado nos mesmos
+            pontos; ao ser cancelado, o processamento é interrompido com
+            ProcessamentoCancelado.
+        escrita_paralela (bool, opcional): Grava a planilha Excel e a camada ao
+            mesmo tempo, em threads (padrão). Com medir_memoria, as saídas são
+            sempre gravadas uma após a outra.
+        formato_tabela (str, opcional): Formato da tabela de coordenadas: "excel"
+            (openpyxl), "xlsxwriter" ou "csv". Se não informado, é identificado
+            pela extensão de caminho_saida_excel (.xlsx: excel; .csv: csv).
+        separador_decimal (str, opcional): Separador decimal da saída CSV ("," ou ".")
+        linhas_por_planilha (int, opcional): Linhas de dados por planilha do Excel;
+            tabelas maiores são divididas em planilhas numeradas, cada uma com
+            o título e o cabeçalho (padrão: o limite de linhas do Excel)
+        indice_espacial (bool, opcional): Grava o índice espacial da camada de
+            saída (.qix no shapefile, coluna bbox no GeoParquet; o GeoPackage
+            sempre tem índice R-tree)
+        ordenacao (str, opcional): Estratégia de ordenação dos vértices: "angular"
+            (padrão), "vizinho_mais_proximo", "contorno" ou "envoltoria_convexa"
+            (ver ordenacao)
+        contorno (str ou Geometry, opcional): Polígono ao longo do qual os vértices
+            são ordenados pela estratégia "contorno": caminho de um arquivo com
+            o polígono ou geometria no SRC da entrada
     
     Returns:
-        tuple: (DataFrame com coordenadas, GeoDataFrame do novo shapefile)
+        ResultadoProcessamento: Número de pontos, caminhos gerados, tempos e memória por etapa,
+        tabela de coordenadas e camada de vértices
+    
+    Raises:
+        ErroLeitura: Se o shapefile não puder ser lido ou não contiver pontos
+        ErroGeometria: Se o shapefile contiver geometrias que não são pontos
+        ErroProjecao: Se as coordenadas não puderem ser convertidas
+        ErroOrdenacao: Se a estratégia de ordenação não existir ou o contorno faltar
+        ErroEscrita: Se algum arquivo de saída não puder ser gravado (ErroSaidas
+            traz o erro de cada saída)
+        ProcessamentoCancelado: Se o token de cancelamento for acionado
     """
-    # Obter o nome base do arquivo de entrada
-    nome_base = os.path.splitext(os.path.basename(caminho_shapefile))[0]
-    
     # Definir caminhos de saída padrão se não forem fornecidos
     if caminho_saida_excel is None:
-        caminho_saida_excel = "TABELA DE COORDENADAS GERADA.xlsx"
-    else:
-        # Verificar se o caminho fornecido é um diretório
-        if os.path.isdir(caminho_saida_excel):
-            caminho_saida_excel = os.path.join(caminho_saida_excel, "TABELA DE COORDENADAS GERADA.xlsx")
-        # Verificar se o caminho tem uma extensão
-        elif not os.path.splitext(caminho_saida_excel)[1]:
-            caminho_saida_excel = f"{caminho_saida_excel}.xlsx"
+        caminho_saida_excel = "TABELA DE COORDENADAS GERADA"
+    # Verificar se o caminho fornecido é um diretório
+    elif os.path.isdir(caminho_saida_excel):
+        caminho_saida_excel = os.path.join(caminho_saida_excel, "TABELA DE COORDENADAS GERADA")
     
-    if caminho_saida_shapefile is None:
-        caminho_saida_shapefile = "VERTICES_GERADOS.shp"
-    else:
-        # Verificar se o caminho fornecido é um diretório
-        if os.path.isdir(caminho_saida_shapefile):
-            caminho_saida_shapefile = os.path.join(caminho_saida_shapefile, "VERTICES_GERADOS.shp")
-        # Verificar se o caminho tem uma extensão
-        elif not os.path.splitext(caminho_saida_shapefile)[1]:
-            caminho_saida_shapefile = f"{caminho_saida_shapefile}.shp"
-    
-    # Ler o shapefile
+    # Formato da tabela: o informado ou o da extensão (Excel se não houver)
     try:
-        gdf = gpd.read_file(caminho_shapefile)
-        print(f"Shapefile carregado com sucesso: {len(gdf)} pontos encontrados.")
-    except Exception as e:
-        print(f"Erro ao carregar o shapefile: {e}")
-        sys.exit(1)
-    
-    # Verificar se o shapefile contém pontos
-    if not all(gdf.geometry.type == 'Point'):
-        print("ERRO: O shapefile deve conter apenas geometrias do tipo ponto.")
-        sys.exit(1)
-    
-    # Obter o sistema de coordenadas do shapefile
-    crs_shapefile = gdf.crs
-    
-    # Criar um novo GeoDataFrame para o shapefile de saída
-    novo_gdf = gdf.copy()
+        formato_tabela = identificar_formato_tabela(caminho_saida_excel, formato_tabela)
+    except ValueError as e:
+        raise ErroEscrita(str(e)) from e
+    if formato_tabela == 'csv' and separador_decimal not in (',', '.'):
+        raise ErroEscrita(f'Separador decimal não suportado: {separador_decimal!r} (use "," ou ".")')
+    if linhas_por_planilha is None:
+        linhas_por_planilha = LINHAS_POR_PLANILHA_PADRAO
+    elif not 1 <= linhas_por_planilha <= LINHAS_POR_PLANILHA_PADRAO:
+        raise ErroEscrita(f"Linhas por planilha devem estar entre 1 e {LINHAS_POR_PLANILHA_PADRAO}: "
+                          f"{linhas_por_planilha}")
+    caminho_saida_excel = ajustar_extensao_tabela(caminho_saida_excel, formato_tabela)
     
-    # Lista para armazenar informações dos pontos
-    pontos_info = []
+    if caminho_saida_shapefile is None:
+        caminho_saida_shapefile = "VERTICES_GERADOS"
+    # Verificar se o caminho fornecido é um diretório
+    elif os.path.isdir(caminho_saida_shapefile):
+        caminho_saida_shapefile = os.path.join(caminho_saida_shapefile, "VERTICES_GERADOS")
     
-    # Processar cada ponto
-    for i, ponto in enumerate(gdf.geometry):
-        # Obter coordenadas x, y do ponto no sistema original
-        x, y = ponto.x, ponto.y
-        
-        # Converter para coordenadas geográficas (latitude, longitude)
-        latitude, longitude = converter_para_geografico(x, y, crs_shapefile)
-        
-        # Determinar o fuso UTM com base na longitude
-        fuso = obter_fuso_utm(longitude)
-        
-        # Converter para coordenadas UTM
-        norte_utm, leste_utm = converter_para_utm(latitude, longitude, fuso)
+    # Formato da camada de saída: o informado ou o da extensão (shapefile se não houver)
+    try:
+        formato_saida = identificar_formato(caminho_saida_shapefile, formato_saida)
+    except ValueError as e:
+        raise ErroEscrita(str(e)) from e
+    caminho_saida_shapefile = ajustar_extensao(caminho_saida_shapefile, formato_saida)
+    
+    # Estratégia de ordenação dos vértices
+    if ordenacao not in ESTRATEGIAS_ORDENACAO:
+        raise ErroOrdenacao(f"Estratégia de ordenação não suportada: {ordenacao} "
+                            f"(use {', '.join(ESTRATEGIAS_ORDENACAO)})")
+    if ordenacao == 'contorno' and contorno is None:
+        raise ErroOrdenacao('A ordenação "contorno" requer um polígono de contorno.')
+    
+    # Motor de leitura e escrita (cai para o padrão se o Arrow não estiver disponível)
+    try:
+        motor = resolver_motor(motor)
+    except ValueError as e:
+        raise ErroLeitura(str(e)) from e
+    logger.debug(f"Motor de E/S: {motor}")
+    
+    # Relatar o andamento e verificar o cancelamento entre os passos
+    acompanhamento = AcompanhamentoProgresso(progresso, cancelamento, formato_tabela)
+    
+    # Medir o tempo (e, se pedido, a memória) de cada etapa
+    with Instrumentacao(medir_memoria) as instrumentacao:
+        # Guardar os contadores do pool para registrar o uso neste processamento
+        estatisticas_iniciais = pool_transformadores.estatisticas()
         
-        # Adicionar informações à lista
-        pontos_info.append({
-            'indice_original': i,
-            'geometria': ponto,
-            'latitude': latitude,
-            'longitude': longitude,
-            'norte_utm': norte_utm,
-            'leste_utm': leste_utm,
-            'fuso': fuso
-        })
-    
-    # Calcular o centro geométrico real dos pontos
-    centro_lon = sum(p['longitude'] for p in pontos_info) / len(pontos_info)
-    centro_lat = sum(p['latitude'] for p in pontos_info) / len(pontos_info)
-    centro = (centro_lon, centro_lat)
-    
-    # Encontrar o ponto mais ao norte
-    ponto_mais_norte = max(pontos_info, key=lambda p: p['norte_utm'])
-    
-    # Calcular o azimute para cada ponto em relação ao centro
-    for ponto in pontos_info:
-        ponto['azimute'] = calcular_azimute((ponto['longitude'], ponto['latitude']), centro)
-    
-    # Ordenar os pontos pelo azimute (sentido horário a partir do norte)
-    pontos_ordenados = []
-    
-    # Adicionar o ponto mais ao norte como o primeiro
-    pontos_ordenados.append(ponto_mais_norte)
-    pontos_restantes = [p for p in pontos_info if p != ponto_mais_norte]
-    
-    # Ordenar os pontos restantes no sentido horário, sempre pegando o próximo mais próximo
-    ponto_atual = ponto_mais_norte
-    while pontos_restantes:
-        # Filtrar pontos com azimute maior que o ponto atual (sentido horário)
-        proximos_pontos = [p for p in pontos_restantes if p['azimute'] > ponto_atual['azimute']]
+        # Pontos já ordenados de uma execução anterior com a mesma entrada
+        cache = CacheResultados(diretorio_cache) if usar_cache else None
+        chave_cache = None
+        entrada_cache = None
+        if cache is not None:
+            acompanhamento.iniciar_etapa('cache')
+            with instrumentacao.etapa('cache'):
+                try:
+                    # O contorno entra na chave pelo conteúdo (do arquivo ou da geometria)
+                    chave_contorno = None
+                    if ordenacao == 'contorno':
+                        chave_contorno = (cache.calcular_chave(contorno) if isinstance(contorno, str)
+                                          else contorno.wkb_hex)
+                    chave_cache = cache.calcular_chave(
+                        caminho_shapefile, fuso_referencia=fuso_referencia, ordenacao=ordenacao,
+                        contorno=chave_contorno
+                    )
+                    entrada_cache = cache.carregar(chave_cache)
+                except OSError as e:
+                    # A leitura informa o erro da entrada
+                    logger.debug(f"Cache não consultado: {e}")
         
-        # Se não houver pontos com azimute maior, pegar os pontos restantes (completou uma volta)
-        if not proximos_pontos:
-            proximos_pontos = pontos_restantes
+        if entrada_cache is not None:
+            pontos, crs_shapefile = entrada_cache
+            logger.info(f"Pontos reaproveitados do cache: {len(pontos)} pontos, já projetados e ordenados.")
+        else:
+            # Ler os pontos e calcular as coordenadas geográficas e UTM, em colunas
+            pontos, crs_shapefile = _ler_e_projetar(
+                caminho_shapefile, tamanho_bloco, instrumentacao, fuso_referencia, motor, acompanhamento
+            )
+            logger.info(f"Shapefile carregado com sucesso: {len(pontos)} pontos encontrados.")
+            logger.debug(f"Pontos em memória: {pontos.nbytes / len(pontos):.0f} bytes por vértice "
+                         f"({', '.join(pontos.colunas())}).")
+            
+            acompanhamento.iniciar_etapa('ordenacao', len(pontos))
+            with instrumentacao.etapa('ordenacao'):
+                # O contorno informado por caminho é lido já no SRC dos pontos
+                if isinstance(contorno, str):
+                    contorno = ler_contorno(contorno, crs_shapefile, motor)
+                
+                # Ordenar os pontos a partir do ponto mais ao norte com a estratégia
+                # escolhida, aplicando a mesma permutação a todas as colunas
+                try:
+                    ordem = ordenar_vertices(pontos, ordenacao, contorno)
+                except (ValueError, ImportError) as e:
+                    raise ErroOrdenacao(f"Erro ao ordenar os vértices: {e}") from e
+                pontos = pontos.reordenar(ordem)
+            logger.info(f"Vértices ordenados com a estratégia {ordenacao}.")
+            
+            if chave_cache is not None:
+                with instrumentacao.etapa('cache'):
+                    cache.salvar(chave_cache, pontos, crs_shapefile)
         
-        # Encontrar o ponto mais próximo no sentido horário
-        proximo_ponto = min(proximos_pontos, key=lambda p: abs(p['azimute'] - ponto_atual['azimute']) 
-                            if p['azimute'] > ponto_atual['azimute'] 
-                            else abs(p['azimute'] + 360 - ponto_atual['azimute']))
+        # Fuso e hemisfério UTM de cada ponto (ex: "24S")
+        rotulos_fusos = rotular_fusos(pontos['fuso'], pontos['sul'])
+        fusos = sorted(set(rotulos_fusos.tolist()))
+        if fuso_referencia is not None:
+            logger.info(f"Coordenadas UTM calculadas no fuso de referência {fusos[0]}.")
+        elif len(fusos) > 1:
+            logger.warning(f"Os pontos abrangem {len(fusos)} fusos UTM ({', '.join(fusos)}); "
+                           f"as coordenadas ESTE/NORTE de fusos diferentes não são comparáveis. "
+                           f"Use um fuso de referência para projetar todos no mesmo fuso.")
         
-        pontos_ordenados.append(proximo_ponto)
-        pontos_restantes.remove(proximo_ponto)
-        ponto_atual = proximo_ponto
-    
-    # Criar um DataFrame para armazenar as coordenadas
-    dados = []
-    
-    # Processar os pontos ordenados
-    for i, ponto in enumerate(pontos_ordenados):
-        # Criar nome do ponto no formato P-XX
-        nome_ponto = f"P-{i+1:02d}"
+        # Criar o DataFrame com as colunas da planilha de referência, já na ordem dos vértices
+        acompanhamento.iniciar_etapa('formatacao', len(pontos))
+        with instrumentacao.etapa('formatacao'):
+            df = pd.DataFrame({
+                'PONTOS': [f"P-{i:02d}" for i in range(1, len(pontos) + 1)],
+                'LATITUDE': decimal_para_gms_lote(pontos['latitude'], True),
+                'LONGITUDE': decimal_para_gms_lote(pontos['longitude'], False),
+                'ESTE': [round(valor, 3) for valor in pontos['leste_utm'].tolist()],
+                'NORTE': [round(valor, 3) for valor in pontos['norte_utm'].tolist()]
+            })
+            # A planilha só ganha a coluna FUSO quando os pontos estão em mais de um fuso
+            if len(fusos) > 1:
+                df['FUSO'] = rotulos_fusos
         
-        # Converter coordenadas para formato GMS
-        latitude_gms = decimal_para_gms(ponto['latitude'], True)
-        longitude_gms = decimal_para_gms(ponto['longitude'], False)
+        # Gravar a planilha e a camada a partir dos mesmos pontos ordenados. As
+        # duas saídas são independentes: em paralelo, a camada é gravada pelo
+        # GDAL/Arrow (que liberam o GIL) enquanto o openpyxl escreve a planilha.
+        # Com a medição de memória, as saídas são gravadas uma após a outra para
+        # que o pico de cada etapa continue separado.
+        paralelo = escrita_paralela and not medir_memoria
+        saidas = {
+            'excel': lambda: _gravar_tabela(
+                caminho_saida_excel, formato_tabela, separador_decimal, linhas_por_planilha, df,
+                instrumentacao, acompanhamento
+            ),
+            'camada': lambda: _gravar_camada(
+                caminho_saida_shapefile, formato_saida, motor, indice_espacial, df, rotulos_fusos, pontos,
+                crs_shapefile, instrumentacao, None if paralelo else acompanhamento
+            )
+        }
+        resultados_saidas = _gravar_saidas(saidas, paralelo)
+        novo_gdf = resultados_saidas['camada']
+        acompanhamento.concluir()
         
-        # Adicionar dados à lista - apenas as colunas necessárias para a planilha de referência
-        dados.append({
-            'PONTOS': nome_ponto,
-            'LATITUDE': latitude_gms,
-            'LONGITUDE': longitude_gms,
-            'ESTE': round(ponto['leste_utm'], 3),
-            'NORTE': round(ponto['norte_utm'], 3)
-        })
-    
-    # Criar DataFrame com os dados
-    df = pd.DataFrame(dados)
-    
-    # Salvar DataFrame como Excel
-    df.to_excel(caminho_saida_excel, index=False)
-    print(f"Arquivo Excel salvo em: {caminho_saida_excel}")
-    
-    # Aplicar formatação à planilha
-    formatar_planilha(caminho_saida_excel)
-    
-    # Criar um novo GeoDataFrame com os pontos ordenados e apenas as colunas necessárias
-    geometrias = [ponto['geometria'] for ponto in pontos_ordenados]
-    novo_gdf = gpd.GeoDataFrame(
-        {
-            'PONTOS': [d['PONTOS'] for d in dados],
-            'LATITUDE': [d['LATITUDE'] for d in dados],
-            'LONGITUDE': [d['LONGITUDE'] for d in dados],
-            'ESTE': [d['ESTE'] for d in dados],
-            'NORTE': [d['NORTE'] for d in dados],
-            'geometry': geometrias
-        }, 
-        geometry='geometry',
-        crs=crs_shapefile
+        # Registrar o uso do pool de transformadores
+        estatisticas = pool_transformadores.estatisticas()
+        transformadores = {
+            'acertos': estatisticas['acertos'] - estatisticas_iniciais['acertos'],
+            'falhas': estatisticas['falhas'] - estatisticas_iniciais['falhas']
+        }
+        logger.info(f"Pool de transformadores: {transformadores['acertos']} acertos, "
+                    f"{transformadores['falhas']} falhas, {estatisticas['tamanho']} em cache.")
+    
+    resultado = ResultadoProcessamento(
+        num_pontos=len(df),
+        caminho_excel=caminho_saida_excel,
+        caminho_shapefile=caminho_saida_shapefile,
+        tempos=instrumentacao.tempos,
+        duracao=instrumentacao.duracao,
+        transformadores=transformadores,
+        fusos=fusos,
+        tabela=df,
+        camada=novo_gdf,
+        memoria=instrumentacao.memoria
     )
     
-    # Salvar o novo shapefile
-    novo_gdf.to_file(caminho_saida_shapefile)
-    print(f"Novo shapefile salvo em: {caminho_saida_shapefile}")
+    if caminho_metricas:
+        try:
+            salvar_metricas(caminho_metricas, dict(entrada=caminho_shapefile, **resultado.metricas()))
+        except Exception as e:
+            raise ErroEscrita(f"Erro ao salvar as métricas {caminho_metricas}: {e}") from e
+        logger.info(f"Métricas salvas em: {caminho_metricas}")
+    
+    return resultado
+
+def configurar_log(nivel=logging.INFO):
+    """
+    Configura o logging para exibir as mensagens de progresso no console.
     
-    return df, novo_gdf
+    Args:
+        nivel (int, opcional): Nível mínimo das mensagens exibidas
+    """
+    logging.basicConfig(level=nivel, format="%(message)s", stream=sys.stdout)
+    # O pyogrio registra cada gravação em nível INFO; manter apenas os avisos
+    logging.getLogger("pyogrio").setLevel(logging.WARNING)
 
 def main():
     """Função principal do script."""
@@ -362,7 +788,12 @@ def main():
         caminho_saida_shapefile = sys.argv[3]
     
     # Processar o shapefile
-    processar_shapefile(caminho_shapefile, caminho_saida_excel, caminho_saida_shapefile)
+    configurar_log()
+    try:
+        processar_shapefile(caminho_shapefile, caminho_saida_excel, caminho_saida_shapefile, usar_cache=True)
+    except ErroGeradorVertices as e:
+        print(f"ERRO: {e}")
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Índice Espacial dos Vértices
+----------------------------
+Consultas espaciais em memória sobre os vértices ordenados de um
+processamento: vértice mais próximo de um ponto e vértices a até uma
+distância, usando uma STRtree do shapely.
+
+A árvore é construída uma única vez por processamento (na primeira
+consulta a `ResultadoProcessamento.indice`) e reaproveitada por todas as
+consultas seguintes. Os índices retornados são posições na ordem dos
+vértices, as mesmas das linhas da tabela e da camada geradas.
+
+A árvore usa as coordenadas UTM projetadas (ESTE, NORTE) da tabela, e não a
+geometria da camada, que fica no SRC da entrada (muitas vezes geográfico):
+as consultas recebem coordenadas UTM e as distâncias são em metros. Quando
+os pontos abrangem mais de um fuso, as coordenadas de fusos diferentes não
+são comparáveis; use um fuso de referência no processamento.
+
+Uso:
+    resultado = processar_shapefile("parcela.shp")
+    # Vértice mais próximo de um ponto em coordenadas UTM (ESTE, NORTE), em metros
+    posicao, distancia = resultado.indice.mais_proximo(301400.0, 9126300.0)
+    resultado.indice.rotulos[posicao]   # ex: "P-01"
+"""
+
+import numpy as np
+import shapely
+from shapely import STRtree
+
+
+class IndiceVertices:
+    """
+    STRtree dos vértices ordenados, com as consultas usadas pelo Gerador de Vértices.
+
+    Attributes:
+        geometrias (ndarray): Pontos dos vértices, na ordem dos vértices
+        rotulos (ndarray): Rótulos dos vértices (ex: "P-01"), ou None
+        arvore (STRtree): Árvore espacial dos pontos
+    """
+
+    def __init__(self, geometrias, rotulos=None):
+        """
+        Args:
+            geometrias (array-like): Pontos dos vértices, na ordem dos vértices
+            rotulos (array-like, opcional): Rótulo de cada vértice
+        """
+        self.geometrias = np.asarray(geometrias, dtype=object)
+        self.rotulos = None if rotulos is None else np.asarray(rotulos, dtype=object)
+        self.arvore = STRtree(self.geometrias)
+
+    @classmethod
+    def da_tabela(cls, tabela, coluna_rotulos="PONTOS"):
+        """
+        Cria o índice a partir das coordenadas UTM (ESTE, NORTE) da tabela de coordenadas.
+
+        Args:
+            tabela (DataFrame): Tabela (ou camada) de vértices com as colunas ESTE e NORTE
+            coluna_rotulos (str, opcional): Coluna com os rótulos dos vértices
+
+        Returns:
+            IndiceVertices: Índice dos vértices, em coordenadas UTM
+        """
+        rotulos = tabela[coluna_rotulos].to_numpy() if coluna_rotulos in tabela.columns else None
+        geometrias = shapely.points(tabela["ESTE"].to_numpy(dtype=float), tabela["NORTE"].to_numpy(dtype=float))
+        return cls(geometrias, rotulos)
+
+    def __len__(self):
+        return len(self.geometrias)
+
+    def mais_proximo(self, x, y):
+        """
+        Encontra o vértice mais próximo de um ponto.
+
+        Args:
+            x (float): Coordenada ESTE (UTM) do ponto
+            y (float): Coordenada NORTE (UTM) do ponto
+
+        Returns:
+            tuple: (posição do vértice, distância), ou (None, None) se não houver vértices
+        """
+        if len(self) == 0:
+            return None, None
+        posicoes, distancias = self.arvore.query_nearest(
+            shapely.Point(x, y), return_distance=True, all_matches=False
+        )
+        return int(posicoes[0]), float(distancias[0])
+
+    def mais_proximos(self, x, y):
+        """
+        Encontra o vértice mais próximo de cada ponto, em uma única consulta.
+
+        Args:
+            x (array-like): Coordenadas ESTE (UTM) dos pontos
+            y (array-like): Coordenadas NORTE (UTM) dos pontos
+
+        Returns:
+            tuple: (posições dos vértices, distâncias), arrays alinhados aos pontos
+        """
+        pontos = shapely.points(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        (entradas, posicoes), distancias = self.arvore.query_nearest(
+            pontos, return_distance=True, all_matches=False
+        )
+        # Uma resposta por ponto, na ordem dos pontos
+        ordem = np.argsort(entradas, kind="stable")
+        return posicoes[ordem], distancias[ordem]
+
+    def a_distancia(self, x, y, distancia):
+        """
+        Lista os vértices a até uma distância de um ponto.
+
+        Args:
+            x (float): Coordenada ESTE (UTM) do ponto
+            y (float): Coordenada NORTE (UTM) do ponto
+            distancia (float): Distância máxima, em metros
+
+        Returns:
+            ndarray: Posições dos vértices, na ordem dos vértices
+        """
+        posicoes = self.arvore.query(shapely.Point(x, y), predicate="dwithin", distance=distancia)
+        return np.sort(posicoes)
+
+    def na_geometria(self, geometria):
+        """
+        Lista os vértices que tocam ou estão dentro de uma geometria (ex: uma feição).
+
+        Args:
+            geometria (Geometry): Geometria em coordenadas UTM, no fuso da tabela
+
+        Returns:
+            ndarray: Posições dos vértices, na ordem dos vértices
+        """
+        return np.sort(self.arvore.query(geometria, predicate="intersects"))
@@ -35,9 +35,12 @@ def main():
     parser.add_argument("--shapefile", help="Caminho para o shapefile de entrada")
     parser.add_argument("--excel", help="Caminho para o arquivo Excel de saída")
     parser.add_argument("--saida", help="Caminho para o shapefile de saída")
+    parser.add_argument("--lote", help="Diretório, padrão glob ou manifesto (.txt) com vários shapefiles para processar em lote")
+    parser.add_argument("--diretorio-saida", default="saida_lote", help="Diretório raiz para as saídas do processamento em lote")
+    parser.add_argument("--workers", type=int, default=None, help="Número de processos do processamento em lote (padrão: número de CPUs)")
     parser.add_argument("--pontos", type=int, default=10, help="Número de pontos para o shapefile de exemplo")
     parser.add_argument("--regiao", default="recife", 
-                        choices=["recife", "sao_paulo", "rio", "brasilia"],
+                        choices=["recife", "sao_paulo", "rio", "brasilia", "todas"],
                         help="Região para gerar os pontos do shapefile de exemplo")
     
     # Analisar argumentos
@@ -83,14 +86,28 @@ def main():
             import traceback
             print(traceback.format_exc())
             sys.exit(1)
+    elif args.lote:
+        # Processar vários shapefiles em lote
+        try:
+            from processamento_lote import processar_lote
+            resultados = processar_lote(args.lote, args.diretorio_saida, args.workers)
+            if not resultados or not all(r["sucesso"] for r in resultados):
+                sys.exit(1)
+        except ImportError:
+            print("Erro: Não foi possível importar o módulo processamento_lote.py")
+            sys.exit(1)
     elif args.shapefile:
         # Processar o shapefile via linha de comando
         try:
-            from gerador_vertices import processar_shapefile
-            processar_shapefile(args.shapefile, args.excel, args.saida)
+            from gerador_vertices import processar_shapefile, configurar_log
+            configurar_log()
+            processar_shapefile(args.shapefile, args.excel, args.saida, usar_cache=True)
         except ImportError:
             print("Erro: Não foi possível importar o módulo gerador_vertices.py")
             sys.exit(1)
+        except Exception as e:
+            print(f"Erro ao processar o shapefile: {e}")
+            sys.exit(1)
     else:
         # Nenhuma ação específica, mostrar ajuda
         parser.print_help()
@@ -156,8 +173,9 @@ def mostrar_menu():
                 saida = None
             
             try:
-                from gerador_vertices import processar_shapefile
-                processar_shapefile(shapefile, excel, saida)
+                from gerador_vertices import processar_shapefile, configurar_log
+                configurar_log()
+                processar_shapefile(shapefile, excel, saida, usar_cache=True)
                 break
             except ImportError:
                 print("Erro: Não foi possível importar o módulo gerador_vertices.py")
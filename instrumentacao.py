@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Instrumentação do Processamento
+-------------------------------
+Medição do tempo e da memória de cada etapa de `processar_shapefile`.
+
+O tempo de cada etapa é sempre medido (uma chamada a `time.perf_counter` no
+início e no fim). A medição de memória é opcional, porque tem custo: com
+ela ativada, cada etapa registra
+
+- o pico de memória alocada pelo Python (tracemalloc), e
+- o pico do RSS do processo, amostrado por uma thread em segundo plano.
+
+Quando a medição de memória está desativada, nada além dos cronômetros é
+executado.
+"""
+
+import importlib.util
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Intervalo entre as amostras do RSS, em segundos
+INTERVALO_AMOSTRAGEM = 0.01
+
+MEGABYTE = 1024 * 1024
+
+
+def rss_atual():
+    """
+    Lê o RSS (memória residente) atual do processo.
+
+    Usa /proc/self/statm no Linux e o psutil, se estiver instalado, nos
+    demais sistemas.
+
+    Returns:
+        int: RSS em bytes, ou None se não puder ser lido
+    """
+    try:
+        with open("/proc/self/statm") as arquivo:
+            return int(arquivo.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError, IndexError):
+        pass
+
+    if importlib.util.find_spec("psutil") is not None:
+        import psutil
+        return psutil.Process().memory_info().rss
+    return None
+
+
+class _AmostradorRSS:
+    """Thread que acompanha o maior RSS observado desde o último reinício."""
+
+    def __init__(self, intervalo=INTERVALO_AMOSTRAGEM):
+        self.intervalo = intervalo
+        self.pico = rss_atual()
+        self._parar = threading.Event()
+        self._trava = threading.Lock()
+        self._thread = threading.Thread(target=self._amostrar, name="AmostradorRSS", daemon=True)
+
+    def _amostrar(self):
+        while not self._parar.wait(self.intervalo):
+            self._registrar()
+
+    def _registrar(self):
+        valor = rss_atual()
+        if valor is None:
+            return
+        with self._trava:
+            if self.pico is None or valor > self.pico:
+                self.pico = valor
+
+    def iniciar(self):
+        self._thread.start()
+
+    def reiniciar(self):
+        """Recomeça a medição do pico a partir do RSS atual."""
+        with self._trava:
+            self.pico = rss_atual()
+
+    def ler_pico(self):
+        """Faz uma última amostra e retorna o pico desde o último reinício."""
+        self._registrar()
+        with self._trava:
+            return self.pico
+
+    def parar(self):
+        self._parar.set()
+        self._thread.join()
+
+
+class Instrumentacao:
+    """
+    Cronômetros (e, opcionalmente, medidores de memória) das etapas de um processamento.
+
+    Uso:
+        instrumentacao = Instrumentacao(medir_memoria=True)
+        with instrumentacao:
+            with instrumentacao.etapa("leitura"):
+                ...
+        instrumentacao.tempos, instrumentacao.memoria
+
+    Attributes:
+        tempos (dict): Tempo em segundos de cada etapa
+        duracao (float): Tempo decorrido entre a entrada e a saída do bloco
+            `with`, em segundos; menor que a soma das etapas quando elas
+            rodam ao mesmo tempo (None antes da saída)
+        memoria (dict): Picos de memória de cada etapa, em MB ('pico_python_mb'
+            e 'pico_rss_mb'); vazio se a medição de memória estiver desativada
+    """
+
+    def __init__(self, medir_memoria=False):
+        self.medir_memoria = medir_memoria
+        self.tempos = {}
+        self.memoria = {}
+        self.duracao = None
+        self._inicio = None
+        self._amostrador = None
+        self._parar_tracemalloc = False
+
+    def __enter__(self):
+        if self.medir_memoria:
+            # Não interromper um tracemalloc iniciado por quem chamou
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._parar_tracemalloc = True
+            self._amostrador = _AmostradorRSS()
+            self._amostrador.iniciar()
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excecao):
+        self.duracao = time.perf_counter() - self._inicio
+        if self._amostrador is not None:
+            self._amostrador.parar()
+            self._amostrador = None
+        if self._parar_tracemalloc:
+            tracemalloc.stop()
+            self._parar_tracemalloc = False
+        return False
+
+    @contextmanager
+    def etapa(self, nome):
+        """
+        Mede uma etapa. Uma etapa repetida (ex: a leitura em blocos) acumula
+        o tempo e mantém o maior pico de memória.
+
+        Etapas diferentes podem ser medidas ao mesmo tempo em threads
+        distintas, desde que a medição de memória esteja desativada (os picos
+        do tracemalloc e do RSS são do processo inteiro).
+
+        Args:
+            nome (str): Nome da etapa
+        """
+        medir_memoria = self._amostrador is not None
+        if medir_memoria:
+            tracemalloc.reset_peak()
+            self._amostrador.reiniciar()
+
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.tempos[nome] = self.tempos.get(nome, 0.0) + time.perf_counter() - inicio
+            if medir_memoria:
+                self._registrar_memoria(nome)
+
+    def _registrar_memoria(self, nome):
+        pico_python = tracemalloc.get_traced_memory()[1] / MEGABYTE
+        pico_rss = self._amostrador.ler_pico()
+        pico_rss = pico_rss / MEGABYTE if pico_rss is not None else None
+
+        anterior = self.memoria.get(nome)
+        if anterior is not None:
+            pico_python = max(pico_python, anterior["pico_python_mb"])
+            if anterior["pico_rss_mb"] is not None:
+                pico_rss = max(pico_rss or 0.0, anterior["pico_rss_mb"])
+        self.memoria[nome] = {"pico_python_mb": pico_python, "pico_rss_mb": pico_rss}
+
+
+def formatar_metricas(metricas):
+    """
+    Formata as métricas em linhas de texto para o log.
+
+    Args:
+        metricas (dict): Métricas com o tempo e a memória de cada etapa
+            (ver ResultadoProcessamento.metricas)
+
+    Returns:
+        list: Uma linha por etapa
+    """
+    linhas = []
+    for nome, etapa in metricas["etapas"].items():
+        linha = f"  {nome:12s} {etapa['tempo']:8.3f}s"
+        if "pico_python_mb" in etapa:
+            linha += f"  pico Python {etapa['pico_python_mb']:8.1f} MB"
+        if etapa.get("pico_rss_mb") is not None:
+            linha += f"  pico RSS {etapa['pico_rss_mb']:8.1f} MB"
+        linhas.append(linha)
+    return linhas
+
+
+def salvar_metricas(caminho, metricas):
+    """
+    Salva as métricas em um arquivo JSON.
+
+    Args:
+        caminho (str): Caminho do arquivo JSON
+        metricas (dict): Métricas a salvar
+    """
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(metricas, arquivo, ensure_ascii=False, indent=2)
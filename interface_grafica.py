@@ -11,6 +11,9 @@ import os
 import sys
 import threading
 import traceback
+import logging
+
+from fila_log import FilaLog, INTERVALO_DRENAGEM_MS, LIMITE_LINHAS_PADRAO
 
 # Verificar se o Tkinter está disponível
 TKINTER_DISPONIVEL = True
@@ -23,33 +26,6 @@ except Exception as e:
     print(f"Erro ao importar Tkinter: {e}")
     TKINTER_DISPONIVEL = False
 
-# Importar o módulo gerador_vertices
-try:
-    from gerador_vertices import processar_shapefile
-except ImportError:
-    if TKINTER_DISPONIVEL:
-        messagebox.showerror("Erro", "Não foi possível importar o módulo gerador_vertices.py")
-    else:
-        print("Erro: Não foi possível importar o módulo gerador_vertices.py")
-    sys.exit(1)
-
-class RedirecionadorSaida:
-    """Classe para redirecionar a saída do console para um widget Text."""
-    
-    def __init__(self, text_widget):
-        self.text_widget = text_widget
-        self.buffer = ""
-    
-    def write(self, texto):
-        self.buffer += texto
-        self.text_widget.config(state=tk.NORMAL)
-        self.text_widget.insert(tk.END, texto)
-        self.text_widget.see(tk.END)
-        self.text_widget.config(state=tk.DISABLED)
-    
-    def flush(self):
-        pass
-
 class AplicativoGeradorVertices:
     """Aplicativo de interface gráfica para o Gerador de Vértices."""
     
@@ -131,9 +107,33 @@ class AplicativoGeradorVertices:
         scrollbar.pack(fill=tk.Y, side=tk.RIGHT)
         self.log_text.config(yscrollcommand=scrollbar.set)
         
-        # Redirecionar a saída padrão para o widget de texto
-        self.redirecionador = RedirecionadorSaida(self.log_text)
-        sys.stdout = self.redirecionador
+        # Redirecionar a saída padrão para a fila de log, que pode receber
+        # mensagens da thread de processamento; a fila é esvaziada no widget
+        # em lotes, na thread da interface
+        self.fila_log = FilaLog()
+        sys.stdout = self.fila_log
+        
+        # Exibir também as mensagens de progresso enviadas pelo logging
+        logging.basicConfig(level=logging.INFO, format="%(message)s", stream=self.fila_log)
+        # O pyogrio registra cada gravação em nível INFO; manter apenas os avisos, como na linha de comando
+        logging.getLogger("pyogrio").setLevel(logging.WARNING)
+        self.root.after(INTERVALO_DRENAGEM_MS, self.descarregar_log)
+    
+    def descarregar_log(self):
+        """Insere no widget, de uma só vez, as linhas acumuladas na fila de log."""
+        linhas, descartadas = self.fila_log.drenar()
+        if linhas:
+            if descartadas:
+                linhas.insert(0, f"... {descartadas} linha(s) omitida(s) ...")
+            self.log_text.config(state=tk.NORMAL)
+            self.log_text.insert(tk.END, "\n".join(linhas) + "\n")
+            # Manter apenas as últimas linhas, para a memória não crescer em trabalhos longos
+            excedentes = int(self.log_text.index("end-1c").split(".")[0]) - 1 - LIMITE_LINHAS_PADRAO
+            if excedentes > 0:
+                self.log_text.delete("1.0", f"{excedentes + 1}.0")
+            self.log_text.see(tk.END)
+            self.log_text.config(state=tk.DISABLED)
+        self.root.after(INTERVALO_DRENAGEM_MS, self.descarregar_log)
     
     def centralizar_janela(self):
         """Centraliza a janela na tela."""
@@ -182,7 +182,8 @@ class AplicativoGeradorVertices:
         arquivo = filedialog.asksaveasfilename(
             title="Salvar Shapefile",
             defaultextension=".shp",
-            filetypes=[("Shapefile", "*.shp"), ("Todos os arquivos", "*.*")]
+            filetypes=[("Shapefile", "*.shp"), ("GeoPackage", "*.gpkg"), ("GeoParquet", "*.parquet"),
+                       ("Todos os arquivos", "*.*")]
         )
         if arquivo:
             self.saida_shapefile.delete(0, tk.END)
@@ -204,7 +205,8 @@ class AplicativoGeradorVertices:
         self.btn_processar.config(state=tk.DISABLED)
         self.progresso.start()
         
-        # Limpar o log
+        # Limpar o log (inclusive as linhas ainda na fila)
+        self.fila_log.drenar()
         self.log_text.config(state=tk.NORMAL)
         self.log_text.delete(1.0, tk.END)
         self.log_text.config(state=tk.DISABLED)
@@ -219,8 +221,12 @@ class AplicativoGeradorVertices:
     def executar_processamento(self, caminho_shapefile, caminho_saida_excel, caminho_saida_shapefile):
         """Executa o processamento do shapefile."""
         try:
+            # Importar o processamento apenas quando um trabalho é executado,
+            # para que a janela abra sem esperar o carregamento do geopandas
+            from gerador_vertices import processar_shapefile
+            
             # Processar o shapefile
-            processar_shapefile(caminho_shapefile, caminho_saida_excel, caminho_saida_shapefile)
+            processar_shapefile(caminho_shapefile, caminho_saida_excel, caminho_saida_shapefile, usar_cache=True)
             
             # Exibir mensagem de sucesso
             self.root.after(0, lambda: messagebox.showinfo("Sucesso", "Processamento concluído com sucesso!"))
@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Leitura de Pontos
+-----------------
+Leitura do arquivo de entrada do Gerador de Vértices e extração das
+coordenadas dos pontos para um contêiner em colunas (PontosColunares).
+
+Além da leitura completa, há um modo em blocos para arquivos muito grandes:
+o arquivo é lido em faixas limitadas de feições pelo leitor do GDAL e de
+cada bloco são guardadas apenas as coordenadas, de modo que nunca há mais de
+um bloco carregado como GeoDataFrame.
+"""
+
+import importlib.util
+import logging
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from erros import ErroEntradaVazia, ErroGeometria, ErroLeitura
+from motor_io import opcoes_motor, resolver_motor
+from pontos import PontosColunares
+
+logger = logging.getLogger(__name__)
+
+# Número padrão de feições lidas por bloco no modo em blocos
+TAMANHO_BLOCO_PADRAO = 100000
+
+
+def validar_pontos(geometrias):
+    """
+    Verifica se todas as geometrias são do tipo ponto.
+
+    Args:
+        geometrias (GeoSeries): Geometrias lidas do arquivo
+
+    Raises:
+        ErroGeometria: Se houver alguma geometria que não seja ponto
+    """
+    if not all(geometrias.geom_type == 'Point'):
+        raise ErroGeometria("O shapefile deve conter apenas geometrias do tipo ponto.")
+
+
+def extrair_pontos(geometrias):
+    """
+    Extrai as coordenadas dos pontos em arrays.
+
+    Args:
+        geometrias (GeoSeries): Geometrias do tipo ponto
+
+    Returns:
+        tuple: (array de x, array de y, array de z ou None se os pontos forem 2D)
+    """
+    geometrias = np.asarray(geometrias)
+    coordenadas = shapely.get_coordinates(geometrias, include_z=True)
+    z = coordenadas[:, 2].copy() if shapely.has_z(geometrias).any() else None
+    return coordenadas[:, 0].copy(), coordenadas[:, 1].copy(), z
+
+
+def criar_geometrias(x, y, z=None):
+    """
+    Cria as geometrias de ponto a partir dos arrays de coordenadas.
+
+    Args:
+        x (numpy.ndarray): Coordenadas x
+        y (numpy.ndarray): Coordenadas y
+        z (numpy.ndarray, opcional): Coordenadas z
+
+    Returns:
+        numpy.ndarray: Array de pontos do shapely
+    """
+    if z is None:
+        return shapely.points(x, y)
+    return shapely.points(x, y, z)
+
+
+def ler_arquivo(caminho, motor=None, **kwargs):
+    """
+    Lê o arquivo de entrada como GeoDataFrame.
+
+    Args:
+        caminho (str): Caminho do arquivo de entrada
+        motor (str, opcional): Motor de leitura ("arrow" ou "padrao", ver motor_io)
+        **kwargs: Argumentos repassados para geopandas.read_file (ex: rows)
+
+    Returns:
+        GeoDataFrame: Feições lidas
+
+    Raises:
+        ErroLeitura: Se o arquivo não puder ser lido
+    """
+    try:
+        return gpd.read_file(caminho, **opcoes_motor(resolver_motor(motor)), **kwargs)
+    except Exception as e:
+        raise ErroLeitura(f"Erro ao carregar o shapefile: {e}") from e
+
+
+def contar_feicoes(caminho):
+    """
+    Conta as feições do arquivo sem lê-las, para relatar o progresso da
+    leitura em blocos.
+
+    Args:
+        caminho (str): Caminho do arquivo de entrada
+
+    Returns:
+        int: Número de feições, ou None se o pyogrio não estiver instalado
+        ou o formato não informar a contagem
+    """
+    if importlib.util.find_spec("pyogrio") is None:
+        return None
+    import pyogrio
+    try:
+        total = pyogrio.read_info(caminho)["features"]
+    except Exception:
+        return None
+    return total if total >= 0 else None
+
+
+def ler_contorno(caminho, crs=None, motor=None):
+    """
+    Lê o polígono de contorno usado para ordenar os vértices.
+
+    Todos os polígonos do arquivo são unidos em uma única geometria.
+
+    Args:
+        caminho (str): Caminho do arquivo com o polígono (ex: a parcela)
+        crs (CRS, opcional): SRC dos pontos, para o qual o contorno é convertido
+        motor (str, opcional): Motor de leitura ("arrow" ou "padrao")
+
+    Returns:
+        Geometry: Polígono ou multipolígono no SRC dos pontos
+
+    Raises:
+        ErroLeitura: Se o arquivo não puder ser lido ou não contiver polígonos
+    """
+    gdf = ler_arquivo(caminho, motor)
+    gdf = gdf[gdf.geometry.geom_type.isin(["Polygon", "MultiPolygon"])]
+    if len(gdf) == 0:
+        raise ErroLeitura(f"O arquivo de contorno não contém nenhum polígono: {caminho}")
+    if crs is not None and gdf.crs is not None:
+        gdf = gdf.to_crs(crs)
+    return shapely.union_all(gdf.geometry.to_numpy())
+
+
+def ler_pontos(caminho, motor=None):
+    """
+    Lê todos os pontos do arquivo de uma vez.
+
+    Args:
+        caminho (str): Caminho do arquivo de entrada
+        motor (str, opcional): Motor de leitura ("arrow" ou "padrao")
+
+    Returns:
+        tuple: (PontosColunares com as colunas x, y e z se 3D, CRS do arquivo)
+
+    Raises:
+        ErroLeitura: Se o arquivo não puder ser lido ou estiver vazio
+        ErroGeometria: Se houver geometrias que não sejam pontos
+    """
+    gdf = ler_arquivo(caminho, motor)
+    if len(gdf) == 0:
+        raise ErroEntradaVazia(f"O shapefile não contém nenhum ponto: {caminho}")
+    validar_pontos(gdf.geometry)
+
+    x, y, z = extrair_pontos(gdf.geometry)
+    return PontosColunares(x=x, y=y, z=z), gdf.crs
+
+
+def ler_pontos_em_blocos(caminho, tamanho_bloco=TAMANHO_BLOCO_PADRAO, motor=None):
+    """
+    Lê os pontos do arquivo em blocos de tamanho limitado.
+
+    Cada bloco é lido como uma faixa de feições (rows) pelo leitor do GDAL,
+    validado e reduzido às suas coordenadas antes da leitura do próximo.
+
+    Args:
+        caminho (str): Caminho do arquivo de entrada
+        tamanho_bloco (int): Número máximo de feições por bloco
+        motor (str, opcional): Motor de leitura ("arrow" ou "padrao")
+
+    Yields:
+        tuple: (PontosColunares do bloco, CRS do arquivo); o índice de cada
+        ponto é a sua posição no arquivo
+
+    Raises:
+        ErroLeitura: Se o arquivo não puder ser lido ou estiver vazio
+        ErroGeometria: Se houver geometrias que não sejam pontos
+    """
+    if tamanho_bloco < 1:
+        raise ValueError("O tamanho do bloco deve ser de pelo menos 1 feição.")
+
+    motor = resolver_motor(motor)
+    inicio = 0
+    while True:
+        bloco = ler_arquivo(caminho, motor, rows=slice(inicio, inicio + tamanho_bloco))
+        if len(bloco) == 0:
+            if inicio == 0:
+                raise ErroEntradaVazia(f"O shapefile não contém nenhum ponto: {caminho}")
+            return
+
+        validar_pontos(bloco.geometry)
+        x, y, z = extrair_pontos(bloco.geometry)
+        crs = bloco.crs
+        num_feicoes = len(bloco)
+        del bloco
+
+        logger.debug(f"Bloco lido: feições {inicio} a {inicio + num_feicoes - 1}")
+        indice = np.arange(inicio, inicio + num_feicoes, dtype=np.int64)
+        yield PontosColunares(indice=indice, x=x, y=y, z=z), crs
+
+        if num_feicoes < tamanho_bloco:
+            return
+        inicio += num_feicoes
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Motor de Entrada e Saída
+------------------------
+Escolha do caminho usado pelo geopandas para ler e gravar os arquivos
+vetoriais:
+
+- "arrow": pyogrio com transferência em Apache Arrow (use_arrow=True), que
+  troca colunas inteiras com o GDAL em vez de converter feição por feição;
+- "padrao": o caminho padrão de `gpd.read_file` / `GeoDataFrame.to_file`.
+
+O motor "arrow" precisa do pyogrio e do pyarrow; quando algum deles não está
+instalado, o motor padrão é usado no lugar.
+"""
+
+import importlib.util
+import logging
+
+logger = logging.getLogger(__name__)
+
+MOTOR_ARROW = "arrow"
+MOTOR_PADRAO = "padrao"
+MOTORES = (MOTOR_ARROW, MOTOR_PADRAO)
+
+# Pacotes necessários para o motor Arrow
+DEPENDENCIAS_ARROW = ("pyogrio", "pyarrow")
+
+
+def arrow_disponivel():
+    """
+    Verifica se o motor Arrow pode ser usado.
+
+    Returns:
+        bool: True se o pyogrio e o pyarrow estiverem instalados
+    """
+    return all(importlib.util.find_spec(modulo) is not None for modulo in DEPENDENCIAS_ARROW)
+
+
+def resolver_motor(motor=None):
+    """
+    Resolve o motor efetivamente usado.
+
+    Args:
+        motor (str, opcional): "arrow", "padrao" ou None (Arrow quando disponível)
+
+    Returns:
+        str: Motor usado
+
+    Raises:
+        ValueError: Se o motor não for suportado
+    """
+    if motor is None:
+        return MOTOR_ARROW if arrow_disponivel() else MOTOR_PADRAO
+
+    motor = motor.lower()
+    if motor not in MOTORES:
+        raise ValueError(f"Motor de E/S não suportado: {motor} (use {', '.join(MOTORES)})")
+
+    if motor == MOTOR_ARROW and not arrow_disponivel():
+        logger.warning("O motor Arrow requer os pacotes pyogrio e pyarrow; usando o motor padrão.")
+        return MOTOR_PADRAO
+    return motor
+
+
+def opcoes_motor(motor):
+    """
+    Argumentos de `gpd.read_file` e `GeoDataFrame.to_file` para um motor.
+
+    Args:
+        motor (str): Motor já resolvido por `resolver_motor`
+
+    Returns:
+        dict: Argumentos adicionais de leitura e escrita
+    """
+    if motor == MOTOR_ARROW:
+        return {"engine": "pyogrio", "use_arrow": True}
+    return {}
@@ -0,0 +1,366 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Ordenação de Vértices
+---------------------
+Estratégias de ordenação dos vértices, todas a partir do ponto mais ao
+norte e sem algoritmos O(n²):
+
+- angular (padrão): sentido horário pelo azimute em relação ao centro dos
+  pontos, calculada com arrays NumPy em O(n log n). É a mesma sequência
+  produzida pela caminhada ponto a ponto original: a partir do ponto atual,
+  o próximo vértice é sempre o de menor azimute estritamente maior; quando
+  não há mais nenhum, a caminhada dá uma nova volta a partir do menor
+  azimute restante. Pontos com o mesmo azimute são visitados um por volta,
+  na ordem original. Adequada a parcelas convexas ou quase convexas.
+- vizinho_mais_proximo: cadeia em que o próximo vértice é sempre o mais
+  próximo ainda não visitado (coordenadas UTM, todas em um único fuso), com
+  uma KD-tree do scipy reconstruída à medida que os pontos são visitados,
+  em O(n log n). Segue o desenho de parcelas côncavas quando os vértices
+  são densos. O sentido da cadeia não é definido: ela parte do ponto mais
+  ao norte para o vizinho mais próximo, que pode estar a leste ou a oeste,
+  e portanto não é necessariamente horária.
+- contorno: ordem ao longo do contorno de um polígono existente (ex: a
+  própria parcela), no sentido horário; cada vértice é projetado no ponto
+  mais próximo do contorno. É a estratégia indicada para parcelas côncavas.
+- envoltoria_convexa: como o contorno, usando a envoltória convexa dos
+  próprios pontos como polígono.
+
+As demais estratégias seguem o sentido horário. Cada estratégia retorna
+uma permutação de índices.
+"""
+
+import importlib.util
+import math
+
+import numpy as np
+import shapely
+from shapely.geometry.polygon import orient
+
+from projecao import FUSO_CENTROIDE, projetar_para_utm
+
+# Vizinhos consultados de cada vez na cadeia de vizinhos mais próximos;
+# a consulta é repetida com o dobro de vizinhos se todos já foram visitados
+VIZINHOS_CONSULTADOS = 16
+
+
+def calcular_azimutes(x, y, centro):
+    """
+    Calcula o azimute (ângulo em relação ao norte) de cada ponto em relação a um centro.
+
+    Args:
+        x (numpy.ndarray): Coordenadas x dos pontos
+        y (numpy.ndarray): Coordenadas y dos pontos
+        centro (tuple): Coordenadas (x, y) do centro
+
+    Returns:
+        numpy.ndarray: Ângulos em graus (0-360)
+    """
+    dx = np.asarray(x, dtype=np.float64) - centro[0]
+    dy = np.asarray(y, dtype=np.float64) - centro[1]
+
+    # math.atan2 (libm) em vez de numpy.arctan2: a implementação SIMD do NumPy
+    # pode diferir em 1 ulp, o que desfaz empates de azimute entre pontos
+    # colineares com o centro e mudaria a ordem em relação a calcular_azimute
+    angulos = np.fromiter(map(math.atan2, dx.tolist(), dy.tolist()), dtype=np.float64, count=len(dx))
+    azimutes = np.degrees(angulos)
+    azimutes[azimutes < 0] += 360
+
+    return azimutes
+
+
+def calcular_centro(x, y):
+    """
+    Calcula o centro geométrico (média simples) dos pontos.
+
+    Args:
+        x (numpy.ndarray): Coordenadas x dos pontos
+        y (numpy.ndarray): Coordenadas y dos pontos
+
+    Returns:
+        tuple: Coordenadas (x, y) do centro
+    """
+    # A soma sequencial do Python mantém o mesmo arredondamento do cálculo
+    # original, de modo que pontos em empate de azimute continuem empatados
+    n = len(x)
+    return (sum(np.asarray(x).tolist()) / n, sum(np.asarray(y).tolist()) / n)
+
+
+def ordenar_sentido_horario(azimutes, nortes_utm):
+    """
+    Calcula a ordem dos vértices no sentido horário a partir do ponto mais ao norte.
+
+    Args:
+        azimutes (numpy.ndarray): Azimute de cada ponto em relação ao centro
+        nortes_utm (numpy.ndarray): Coordenada norte UTM de cada ponto
+
+    Returns:
+        numpy.ndarray: Permutação de índices com a ordem dos vértices
+    """
+    azimutes = np.asarray(azimutes, dtype=np.float64)
+    n = len(azimutes)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+
+    # O primeiro vértice é o ponto mais ao norte (o primeiro deles, em caso de empate)
+    primeiro = int(np.argmax(nortes_utm))
+    azimute_primeiro = azimutes[primeiro]
+
+    restantes = np.delete(np.arange(n, dtype=np.int64), primeiro)
+    azimutes_restantes = azimutes[restantes]
+
+    # Ordenar os pontos restantes por (azimute, índice original)
+    ordem = np.lexsort((restantes, azimutes_restantes))
+    azimutes_ordenados = azimutes_restantes[ordem]
+
+    # Posição de cada ponto dentro do seu grupo de azimutes iguais
+    posicoes = np.arange(len(ordem))
+    inicio_grupo = np.ones(len(ordem), dtype=bool)
+    inicio_grupo[1:] = azimutes_ordenados[1:] != azimutes_ordenados[:-1]
+    posicao_no_grupo = posicoes - np.maximum.accumulate(np.where(inicio_grupo, posicoes, 0))
+
+    # A primeira volta só contém azimutes maiores que o do ponto inicial;
+    # cada ponto repetido de um mesmo azimute fica para a volta seguinte
+    volta = posicao_no_grupo + np.where(azimutes_ordenados > azimute_primeiro, 1, 2)
+
+    # Ordenação estável por volta, mantendo (azimute, índice) dentro de cada volta
+    ordem = ordem[np.argsort(volta, kind="stable")]
+
+    return np.concatenate(([primeiro], restantes[ordem]))
+
+
+def _primeiro_vertice(nortes_utm):
+    """Índice do ponto mais ao norte (o primeiro deles, em caso de empate)."""
+    return int(np.argmax(nortes_utm))
+
+
+def ordenar_vizinho_mais_proximo(x, y, nortes_utm):
+    """
+    Calcula a ordem dos vértices por uma cadeia de vizinhos mais próximos,
+    a partir do ponto mais ao norte.
+
+    Os vizinhos de todos os pontos são consultados de uma vez; a KD-tree dos
+    pontos ainda não visitados só é usada quando todos esses vizinhos já
+    foram visitados, e é reconstruída sempre que metade dos seus pontos foi
+    visitada, de modo que as consultas não se degradam no fim da cadeia.
+
+    Args:
+        x (numpy.ndarray): Coordenadas x dos pontos, em um sistema métrico (ex: UTM)
+        y (numpy.ndarray): Coordenadas y dos pontos, no mesmo sistema
+        nortes_utm (numpy.ndarray): Coordenada norte UTM de cada ponto
+
+    Returns:
+        numpy.ndarray: Permutação de índices com a ordem dos vértices
+
+    Raises:
+        ImportError: Se o scipy não estiver instalado
+    """
+    if importlib.util.find_spec("scipy") is None:
+        raise ImportError("A ordenação por vizinho mais próximo requer o pacote scipy (pip install scipy).")
+    from scipy.spatial import cKDTree
+
+    coordenadas = np.column_stack((np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)))
+    n = len(coordenadas)
+    ordem = np.empty(n, dtype=np.int64)
+    if n == 0:
+        return ordem
+
+    # Vizinhos mais próximos de todos os pontos, em uma única consulta vetorizada.
+    # O primeiro ainda não visitado da lista é o vizinho mais próximo não
+    # visitado; só quando todos já foram visitados a cadeia consulta a árvore
+    # dos pontos restantes
+    _, vizinhos_iniciais = cKDTree(coordenadas).query(coordenadas, k=min(VIZINHOS_CONSULTADOS + 1, n))
+    vizinhos_iniciais = vizinhos_iniciais.reshape(n, -1)
+
+    # bytearray e listas: o laço trata um ponto por vez, e o acesso a
+    # escalares do NumPy custaria mais que o próprio teste
+    visitado = bytearray(n)
+    atual = _primeiro_vertice(nortes_utm)
+    ordem[0] = atual
+    visitado[atual] = 1
+
+    # Árvore dos pontos não visitados, criada quando necessária e reconstruída
+    # sempre que metade dos seus pontos já foi visitada
+    arvore = None
+    ativos = []
+    visitados_na_arvore = 0
+
+    for passo in range(1, n):
+        proximo = None
+        for vizinho in vizinhos_iniciais[atual].tolist():
+            if not visitado[vizinho]:
+                proximo = vizinho
+                break
+
+        if proximo is None:
+            if arvore is None or 2 * visitados_na_arvore > len(ativos):
+                ativos = np.flatnonzero(np.frombuffer(visitado, dtype=np.uint8) == 0)
+                arvore = cKDTree(coordenadas[ativos])
+                ativos = ativos.tolist()
+                visitados_na_arvore = 0
+
+            k = min(VIZINHOS_CONSULTADOS, len(ativos))
+            while proximo is None:
+                _, vizinhos = arvore.query(coordenadas[atual], k=k)
+                for vizinho in np.atleast_1d(vizinhos).tolist():
+                    if not visitado[ativos[vizinho]]:
+                        proximo = ativos[vizinho]
+                        break
+                k = min(2 * k, len(ativos))
+
+        atual = proximo
+        ordem[passo] = atual
+        visitado[atual] = 1
+        if arvore is not None:
+            visitados_na_arvore += 1
+
+    return ordem
+
+
+def _linha_do_contorno(contorno):
+    """
+    Linha percorrida pela ordenação: o anel externo do polígono no sentido
+    horário (a maior parte, se for um multipolígono) ou a própria linha.
+    """
+    if contorno.geom_type == "MultiPolygon":
+        contorno = max(contorno.geoms, key=lambda parte: parte.area)
+    if contorno.geom_type == "Polygon":
+        return orient(contorno, sign=-1.0).exterior
+    if contorno.geom_type in ("LineString", "LinearRing", "Point"):
+        return contorno
+    raise ValueError(f"O contorno deve ser um polígono ou uma linha, não {contorno.geom_type}.")
+
+
+def ordenar_por_contorno(x, y, contorno, nortes_utm):
+    """
+    Calcula a ordem dos vértices ao longo do contorno de um polígono, no
+    sentido horário, a partir do ponto mais ao norte.
+
+    Cada vértice é posicionado pela distância, ao longo do contorno, do
+    ponto do contorno mais próximo dele; vértices na mesma posição mantêm a
+    ordem original.
+
+    Args:
+        x (numpy.ndarray): Coordenadas x dos pontos
+        y (numpy.ndarray): Coordenadas y dos pontos
+        contorno (Geometry): Polígono (ou linha) no mesmo SRC dos pontos
+        nortes_utm (numpy.ndarray): Coordenada norte UTM de cada ponto
+
+    Returns:
+        numpy.ndarray: Permutação de índices com a ordem dos vértices
+
+    Raises:
+        ValueError: Se o contorno não for um polígono nem uma linha
+    """
+    n = len(x)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+
+    linha = _linha_do_contorno(contorno)
+    primeiro = _primeiro_vertice(nortes_utm)
+    if linha.geom_type == "Point" or linha.length == 0:
+        posicoes = np.zeros(n)
+    else:
+        # Distância ao longo do contorno, contada a partir do primeiro vértice
+        posicoes = shapely.line_locate_point(linha, shapely.points(np.asarray(x), np.asarray(y)))
+        posicoes = np.mod(posicoes - posicoes[primeiro], linha.length)
+    posicoes[primeiro] = -1.0
+
+    return np.lexsort((np.arange(n), posicoes))
+
+
+def ordenar_por_envoltoria(x, y, nortes_utm):
+    """
+    Calcula a ordem dos vértices ao longo da envoltória convexa dos pontos,
+    no sentido horário, a partir do ponto mais ao norte.
+
+    Args:
+        x (numpy.ndarray): Coordenadas x dos pontos
+        y (numpy.ndarray): Coordenadas y dos pontos
+        nortes_utm (numpy.ndarray): Coordenada norte UTM de cada ponto
+
+    Returns:
+        numpy.ndarray: Permutação de índices com a ordem dos vértices
+    """
+    if len(x) == 0:
+        return np.empty(0, dtype=np.int64)
+    envoltoria = shapely.convex_hull(shapely.multipoints(np.column_stack((np.asarray(x), np.asarray(y)))))
+    return ordenar_por_contorno(x, y, envoltoria, nortes_utm)
+
+
+def _ordenar_angular(pontos, contorno=None):
+    # Azimute de cada ponto em relação ao centro geométrico real dos pontos
+    centro = calcular_centro(pontos["longitude"], pontos["latitude"])
+    pontos["azimute"] = calcular_azimutes(pontos["longitude"], pontos["latitude"], centro)
+    return ordenar_sentido_horario(pontos["azimute"], pontos["norte_utm"])
+
+
+def _coordenadas_em_um_fuso(pontos):
+    """
+    Coordenadas UTM dos pontos em um único fuso, para medir distâncias entre eles.
+
+    Coordenadas de fusos (ou hemisférios) diferentes não são comparáveis;
+    quando os pontos abrangem mais de um, eles são reprojetados no fuso do
+    centro dos pontos. As colunas dos pontos não são alteradas.
+
+    Returns:
+        tuple: (array de lestes, array de nortes)
+    """
+    fusos = np.asarray(pontos["fuso"])
+    sul = np.asarray(pontos["sul"])
+    if len(fusos) == 0 or (np.all(fusos == fusos[0]) and np.all(sul == sul[0])):
+        return pontos["leste_utm"], pontos["norte_utm"]
+    nortes, lestes, _, _ = projetar_para_utm(pontos["latitude"], pontos["longitude"], FUSO_CENTROIDE)
+    return lestes, nortes
+
+
+def _ordenar_vizinho_mais_proximo(pontos, contorno=None):
+    lestes, nortes = _coordenadas_em_um_fuso(pontos)
+    return ordenar_vizinho_mais_proximo(lestes, nortes, nortes)
+
+
+def _ordenar_contorno(pontos, contorno=None):
+    if contorno is None:
+        raise ValueError('A ordenação "contorno" requer um polígono de contorno.')
+    return ordenar_por_contorno(pontos["x"], pontos["y"], contorno, pontos["norte_utm"])
+
+
+def _ordenar_envoltoria(pontos, contorno=None):
+    return ordenar_por_envoltoria(pontos["x"], pontos["y"], pontos["norte_utm"])
+
+
+# Estratégias de ordenação: nome -> função (pontos, contorno) -> permutação
+ESTRATEGIAS_ORDENACAO = {
+    "angular": _ordenar_angular,
+    "vizinho_mais_proximo": _ordenar_vizinho_mais_proximo,
+    "contorno": _ordenar_contorno,
+    "envoltoria_convexa": _ordenar_envoltoria,
+}
+
+# Estratégia usada quando nenhuma é informada
+ESTRATEGIA_PADRAO = "angular"
+
+
+def ordenar_vertices(pontos, estrategia=ESTRATEGIA_PADRAO, contorno=None):
+    """
+    Calcula a ordem dos vértices com a estratégia escolhida.
+
+    Args:
+        pontos (PontosColunares): Pontos com as colunas x, y, latitude,
+            longitude, leste_utm, norte_utm, fuso e sul; a estratégia angular
+            acrescenta a coluna azimute
+        estrategia (str, opcional): Nome da estratégia (chave de ESTRATEGIAS_ORDENACAO)
+        contorno (Geometry, opcional): Polígono no SRC da entrada, usado pela
+            estratégia "contorno"
+
+    Returns:
+        numpy.ndarray: Permutação de índices com a ordem dos vértices
+
+    Raises:
+        ValueError: Se a estratégia não existir ou o contorno faltar ou for inválido
+    """
+    if estrategia not in ESTRATEGIAS_ORDENACAO:
+        raise ValueError(f"Estratégia de ordenação não suportada: {estrategia} "
+                         f"(use {', '.join(ESTRATEGIAS_ORDENACAO)})")
+    return ESTRATEGIAS_ORDENACAO[estrategia](pontos, contorno)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Pontos em Colunas
+-----------------
+Representação compacta dos vértices durante o processamento: em vez de um
+objeto (ou dict) por ponto, cada atributo é uma coluna NumPy (estrutura de
+arrays). Todas as etapas leem e acrescentam colunas no mesmo contêiner, e a
+reordenação no sentido horário é uma única permutação de índices aplicada
+a cada coluna.
+
+Colunas usadas pelo Gerador de Vértices:
+
+- x, y, z: coordenadas no CRS de origem (z apenas para pontos 3D);
+- latitude, longitude: coordenadas geográficas (WGS84);
+- norte_utm, leste_utm, fuso, sul: coordenadas UTM, fuso e hemisfério;
+- azimute: ângulo em relação ao centro dos pontos (ordenação angular).
+
+Além das colunas, o contêiner guarda o índice de cada ponto no arquivo de
+entrada, que acompanha as reordenações.
+"""
+
+import numpy as np
+
+
+class PontosColunares:
+    """
+    Conjunto de pontos armazenado como colunas NumPy de mesmo comprimento.
+
+    As colunas são acessadas como em um dict (`pontos["latitude"]`), o que
+    permite que as funções de projeção preencham o contêiner diretamente.
+
+    Attributes:
+        indice (numpy.ndarray): Índice de cada ponto no arquivo de entrada
+    """
+
+    __slots__ = ("indice", "_colunas")
+
+    def __init__(self, indice=None, **colunas):
+        """
+        Args:
+            indice (numpy.ndarray, opcional): Índice de cada ponto na entrada
+                (padrão: 0, 1, 2, ...)
+            **colunas: Colunas iniciais (arrays de mesmo comprimento)
+        """
+        self._colunas = {}
+        for nome, valores in colunas.items():
+            if valores is not None:
+                self[nome] = valores
+        if indice is None:
+            indice = np.arange(len(self), dtype=np.int64)
+        self.indice = np.asarray(indice, dtype=np.int64)
+
+    def __len__(self):
+        if not self._colunas:
+            return 0
+        return len(next(iter(self._colunas.values())))
+
+    def __getitem__(self, nome):
+        return self._colunas[nome]
+
+    def __setitem__(self, nome, valores):
+        valores = np.asarray(valores)
+        if self._colunas and len(valores) != len(self):
+            raise ValueError(f"A coluna {nome!r} tem {len(valores)} valores; esperados {len(self)}.")
+        self._colunas[nome] = valores
+
+    def __contains__(self, nome):
+        return nome in self._colunas
+
+    def get(self, nome, padrao=None):
+        """Retorna a coluna, ou o valor padrão se ela não existir."""
+        return self._colunas.get(nome, padrao)
+
+    def colunas(self):
+        """Nomes das colunas, na ordem em que foram criadas."""
+        return list(self._colunas)
+
+    def reordenar(self, ordem):
+        """
+        Reordena todos os pontos com uma única permutação de índices.
+
+        Args:
+            ordem (numpy.ndarray): Índices (posições atuais) na nova ordem
+
+        Returns:
+            PontosColunares: Novo contêiner com as colunas e o índice reordenados
+        """
+        ordem = np.asarray(ordem)
+        reordenado = PontosColunares(indice=self.indice[ordem])
+        for nome, valores in self._colunas.items():
+            reordenado._colunas[nome] = valores[ordem]
+        return reordenado
+
+    @classmethod
+    def concatenar(cls, blocos):
+        """
+        Junta contêineres com as mesmas colunas (ex: blocos de leitura).
+
+        Uma coluna ausente em parte dos blocos (como o z de blocos 2D) é
+        completada com NaN.
+
+        Args:
+            blocos (list): Contêineres na ordem de leitura
+
+        Returns:
+            PontosColunares: Contêiner com todos os pontos
+        """
+        nomes = []
+        for bloco in blocos:
+            nomes.extend(nome for nome in bloco.colunas() if nome not in nomes)
+
+        juntos = cls(indice=np.concatenate([bloco.indice for bloco in blocos]))
+        for nome in nomes:
+            juntos._colunas[nome] = np.concatenate([
+                bloco[nome] if nome in bloco else np.full(len(bloco), np.nan)
+                for bloco in blocos
+            ])
+        return juntos
+
+    @property
+    def nbytes(self):
+        """Memória ocupada pelas colunas e pelo índice, em bytes."""
+        return self.indice.nbytes + sum(valores.nbytes for valores in self._colunas.values())
+
+    def __repr__(self):
+        return f"PontosColunares({len(self)} pontos, colunas={self.colunas()})"
@@ -0,0 +1,318 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Processamento Assíncrono
+------------------------
+API asyncio para converter muitos shapefiles e receber os resultados à
+medida que terminam, para pipelines de ingestão que já rodam em um loop
+de eventos.
+
+- `processar_async`: converte um arquivo sem bloquear o loop;
+- `FilaTrabalhos`: fila com limite de concorrência, contrapressão (o envio
+  espera quando a fila está cheia) e cancelamento por trabalho.
+
+Cada trabalho roda inteiro em um processo de um pool (leitura, projeção,
+ordenação e escrita das saídas). A escrita do Excel com o openpyxl é
+código Python que segura o GIL, então executá-la em threads do processo
+principal não sobreporia os trabalhos e ainda disputaria o loop de
+eventos; as threads ficam apenas com as esperas bloqueantes, como o
+encerramento do pool. O resultado de cada trabalho é o mesmo dict do
+processamento em lote.
+
+Uso:
+    async with FilaTrabalhos(max_concorrencia=4) as fila:
+        for caminho in caminhos:
+            await fila.submeter(caminho)
+        fila.encerrar_envios()
+        async for trabalho in fila.concluidos():
+            print(trabalho.entrada, trabalho.resultado()["sucesso"])
+"""
+
+import asyncio
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from processamento_lote import _processar_item, caminhos_saida, inicializar_processo
+
+# Estados de um trabalho
+NA_FILA = "na_fila"
+EXECUTANDO = "executando"
+CONCLUIDO = "concluido"
+FALHOU = "falhou"
+CANCELADO = "cancelado"
+
+# Pool de processos compartilhado por processar_async quando nenhum é informado
+_executor_padrao = None
+
+
+def _obter_executor_padrao():
+    global _executor_padrao
+    if _executor_padrao is None:
+        _executor_padrao = ProcessPoolExecutor(initializer=inicializar_processo)
+    return _executor_padrao
+
+
+def _caminhos(caminho_shapefile, caminho_saida_excel, caminho_saida_shapefile):
+    """Caminhos absolutos de um trabalho; sem saídas, elas ficam ao lado da entrada."""
+    caminho_shapefile = os.path.abspath(caminho_shapefile)
+    diretorio = os.path.dirname(caminho_shapefile)
+    excel_padrao, saida_padrao = caminhos_saida(caminho_shapefile, diretorio, diretorio)
+    return (
+        caminho_shapefile,
+        os.path.abspath(caminho_saida_excel or excel_padrao),
+        os.path.abspath(caminho_saida_shapefile or saida_padrao)
+    )
+
+
+async def processar_async(caminho_shapefile, caminho_saida_excel=None, caminho_saida_shapefile=None,
+                          executor=None, **opcoes):
+    """
+    Converte um shapefile em um processo do pool, sem bloquear o loop de eventos.
+
+    Args:
+        caminho_shapefile (str): Caminho do shapefile de entrada
+        caminho_saida_excel (str, opcional): Excel de saída (padrão: ao lado da entrada)
+        caminho_saida_shapefile (str, opcional): Camada de saída (padrão: ao lado da entrada)
+        executor (ProcessPoolExecutor, opcional): Pool de processos (padrão:
+            um pool compartilhado com um processo por CPU)
+        **opcoes: Argumentos adicionais de processar_shapefile
+
+    Returns:
+        dict: Resultado do processamento, como no processamento em lote
+    """
+    loop = asyncio.get_running_loop()
+    entrada, excel, saida = _caminhos(caminho_shapefile, caminho_saida_excel, caminho_saida_shapefile)
+    return await loop.run_in_executor(
+        executor or _obter_executor_padrao(), _processar_item, entrada, excel, saida, opcoes
+    )
+
+
+class TrabalhoAsync:
+    """
+    Um trabalho enviado a uma FilaTrabalhos.
+
+    Pode ser aguardado diretamente (`resultado = await trabalho`).
+
+    Attributes:
+        id (int): Número do trabalho na fila, a partir de 1
+        entrada (str): Arquivo de entrada
+        excel (str): Caminho do Excel de saída
+        saida (str): Caminho da camada de saída
+        opcoes (dict): Argumentos adicionais de processar_shapefile
+        futuro (asyncio.Future): Resultado do trabalho
+    """
+
+    def __init__(self, id_trabalho, entrada, excel, saida, opcoes):
+        self.id = id_trabalho
+        self.entrada = entrada
+        self.excel = excel
+        self.saida = saida
+        self.opcoes = opcoes
+        self.futuro = asyncio.get_running_loop().create_future()
+        self._execucao = None
+
+    @property
+    def estado(self):
+        """Estado atual: na_fila, executando, concluido, falhou ou cancelado."""
+        if self.futuro.cancelled():
+            return CANCELADO
+        if not self.futuro.done():
+            return NA_FILA if self._execucao is None else EXECUTANDO
+        if self.futuro.exception() is not None or not self.futuro.result()["sucesso"]:
+            return FALHOU
+        return CONCLUIDO
+
+    def resultado(self):
+        """Resultado do trabalho concluído (levanta CancelledError se foi cancelado)."""
+        return self.futuro.result()
+
+    def cancelar(self):
+        """
+        Cancela o trabalho.
+
+        Um trabalho na fila não chega a ser executado. Um trabalho já em
+        execução deixa de ser aguardado, mas o processo do pool termina o
+        arquivo atual.
+
+        Returns:
+            bool: True se o trabalho foi cancelado
+        """
+        if self.futuro.done():
+            return False
+        if self._execucao is not None:
+            self._execucao.cancel()
+        return self.futuro.cancel()
+
+    def __await__(self):
+        return self.futuro.__await__()
+
+    def __repr__(self):
+        return f"TrabalhoAsync(id={self.id}, entrada={self.entrada!r}, estado={self.estado!r})"
+
+
+class FilaTrabalhos:
+    """
+    Fila assíncrona de conversões com concorrência limitada e contrapressão.
+
+    No máximo `max_concorrencia` trabalhos rodam ao mesmo tempo (um por
+    processo do pool) e no máximo `tamanho_fila` aguardam; quando a fila
+    está cheia, `submeter` espera uma vaga, o que limita a memória de quem
+    envia milhares de arquivos.
+    """
+
+    def __init__(self, max_concorrencia=None, tamanho_fila=None, opcoes=None):
+        """
+        Args:
+            max_concorrencia (int, opcional): Trabalhos simultâneos (padrão: número de CPUs)
+            tamanho_fila (int, opcional): Trabalhos aguardando (padrão: o dobro da concorrência)
+            opcoes (dict, opcional): Argumentos de processar_shapefile aplicados a
+                todos os trabalhos (cada envio pode sobrescrevê-los)
+        """
+        self.max_concorrencia = max_concorrencia or os.cpu_count()
+        self.tamanho_fila = tamanho_fila or 2 * self.max_concorrencia
+        self.opcoes = dict(opcoes or {})
+        self._executor = None
+        self._fila = None
+        self._finalizados = None
+        self._consumidores = []
+        # Apenas os trabalhos ainda não finalizados ficam referenciados; os
+        # demais são contados, para que a memória não cresça com os envios
+        self._em_andamento = set()
+        self._enviados = 0
+        self._entregues = 0
+        self._contador = itertools.count(1)
+        self._envio_encerrado = False
+
+    async def iniciar(self):
+        """Cria o pool de processos e as tarefas que consomem a fila."""
+        if self._executor is not None:
+            return
+        self._executor = ProcessPoolExecutor(max_workers=self.max_concorrencia, initializer=inicializar_processo)
+        self._fila = asyncio.Queue(maxsize=self.tamanho_fila)
+        self._finalizados = asyncio.Queue()
+        self._consumidores = [asyncio.create_task(self._consumir()) for _ in range(self.max_concorrencia)]
+
+    async def __aenter__(self):
+        await self.iniciar()
+        return self
+
+    async def __aexit__(self, tipo_excecao, excecao, rastreamento):
+        await self.fechar(cancelar_pendentes=tipo_excecao is not None)
+        return False
+
+    async def submeter(self, caminho_shapefile, caminho_saida_excel=None, caminho_saida_shapefile=None, **opcoes):
+        """
+        Envia um trabalho, esperando uma vaga se a fila estiver cheia.
+
+        Args:
+            caminho_shapefile (str): Caminho do shapefile de entrada
+            caminho_saida_excel (str, opcional): Excel de saída (padrão: ao lado da entrada)
+            caminho_saida_shapefile (str, opcional): Camada de saída (padrão: ao lado da entrada)
+            **opcoes: Argumentos adicionais de processar_shapefile
+
+        Returns:
+            TrabalhoAsync: Trabalho enviado
+
+        Raises:
+            RuntimeError: Se os envios já foram encerrados
+        """
+        if self._envio_encerrado:
+            raise RuntimeError("A fila não aceita novos trabalhos: os envios foram encerrados.")
+        await self.iniciar()
+
+        entrada, excel, saida = _caminhos(caminho_shapefile, caminho_saida_excel, caminho_saida_shapefile)
+        trabalho = TrabalhoAsync(next(self._contador), entrada, excel, saida, {**self.opcoes, **opcoes})
+        trabalho.futuro.add_done_callback(lambda _: self._finalizar(trabalho))
+        self._em_andamento.add(trabalho)
+        self._enviados += 1
+        await self._fila.put(trabalho)
+        return trabalho
+
+    def encerrar_envios(self):
+        """Indica que não haverá novos trabalhos, para que `concluidos` possa terminar."""
+        self._envio_encerrado = True
+        if self._finalizados is not None:
+            # Acordar quem espera em `concluidos`
+            self._finalizados.put_nowait(None)
+
+    async def concluidos(self):
+        """
+        Entrega os trabalhos à medida que terminam (concluídos, com falha ou cancelados).
+
+        Termina depois de `encerrar_envios`, quando todos os trabalhos
+        enviados tiverem sido entregues.
+
+        Yields:
+            TrabalhoAsync: Trabalho finalizado
+        """
+        await self.iniciar()
+        while not (self._envio_encerrado and self._entregues == self._enviados):
+            trabalho = await self._finalizados.get()
+            if trabalho is None:
+                continue
+            self._entregues += 1
+            yield trabalho
+            # A fila não guarda os trabalhos já entregues
+            trabalho = None
+
+    def pendentes(self):
+        """Número de trabalhos na fila ou em execução."""
+        return len(self._em_andamento)
+
+    def _finalizar(self, trabalho):
+        """Retira o trabalho finalizado dos pendentes e o deixa pronto para `concluidos`."""
+        self._em_andamento.discard(trabalho)
+        self._finalizados.put_nowait(trabalho)
+
+    async def _consumir(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            trabalho = await self._fila.get()
+            try:
+                if trabalho.futuro.done():
+                    # Cancelado enquanto aguardava na fila
+                    continue
+                trabalho._execucao = loop.run_in_executor(
+                    self._executor, _processar_item,
+                    trabalho.entrada, trabalho.excel, trabalho.saida, trabalho.opcoes
+                )
+                # asyncio.wait não propaga o cancelamento do trabalho para o consumidor
+                await asyncio.wait([trabalho._execucao])
+                if trabalho.futuro.done():
+                    continue
+                if trabalho._execucao.cancelled():
+                    trabalho.futuro.cancel()
+                elif trabalho._execucao.exception() is not None:
+                    trabalho.futuro.set_exception(trabalho._execucao.exception())
+                else:
+                    trabalho.futuro.set_result(trabalho._execucao.result())
+            finally:
+                self._fila.task_done()
+
+    async def fechar(self, cancelar_pendentes=False):
+        """
+        Encerra os envios, espera (ou cancela) os trabalhos e encerra o pool.
+
+        Args:
+            cancelar_pendentes (bool, opcional): Cancela os trabalhos que ainda
+                não terminaram em vez de esperá-los
+        """
+        self.encerrar_envios()
+        if self._executor is None:
+            return
+
+        if cancelar_pendentes:
+            for trabalho in list(self._em_andamento):
+                trabalho.cancelar()
+        await self._fila.join()
+
+        for consumidor in self._consumidores:
+            consumidor.cancel()
+        await asyncio.gather(*self._consumidores, return_exceptions=True)
+        self._consumidores = []
+
+        # Aguardar o encerramento dos processos em uma thread, sem bloquear o loop
+        executor, self._executor = self._executor, None
+        await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
@@ -0,0 +1,285 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Processamento em Lote
+---------------------
+Processa vários shapefiles de uma vez (um diretório, um padrão glob ou um
+arquivo de manifesto), distribuindo os arquivos entre processos de um
+ProcessPoolExecutor. Cada entrada gera sua própria tabela Excel e seu
+próprio shapefile em uma árvore de saída que espelha a de entrada, e uma
+falha em um arquivo não interrompe os demais.
+"""
+
+import glob
+import json
+import os
+import signal
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Extensões aceitas como arquivo de manifesto (um caminho por linha)
+EXTENSOES_MANIFESTO = (".txt", ".lst")
+
+
+def listar_entradas(origem):
+    """
+    Lista os shapefiles de entrada e o diretório raiz usado para montar a árvore de saída.
+
+    Args:
+        origem (str): Diretório (busca recursiva por .shp), padrão glob
+            (ex: "dados/**/*.shp") ou manifesto .txt/.lst com um caminho por linha
+
+    Returns:
+        tuple: (lista de caminhos dos shapefiles, diretório raiz das entradas)
+    """
+    if os.path.isdir(origem):
+        entradas = glob.glob(os.path.join(origem, "**", "*.shp"), recursive=True)
+        raiz = origem
+    elif os.path.isfile(origem) and origem.lower().endswith(EXTENSOES_MANIFESTO):
+        diretorio_manifesto = os.path.dirname(os.path.abspath(origem))
+        entradas = []
+        with open(origem, encoding="utf-8") as manifesto:
+            for linha in manifesto:
+                linha = linha.strip()
+                # Ignorar linhas vazias e comentários
+                if not linha or linha.startswith("#"):
+                    continue
+                if not os.path.isabs(linha):
+                    linha = os.path.join(diretorio_manifesto, linha)
+                entradas.append(linha)
+        raiz = None
+    else:
+        entradas = glob.glob(origem, recursive=True)
+        raiz = None
+
+    entradas = sorted(os.path.abspath(entrada) for entrada in entradas)
+
+    if raiz is None:
+        raiz = os.path.commonpath([os.path.dirname(entrada) for entrada in entradas]) if entradas else "."
+
+    return entradas, os.path.abspath(raiz)
+
+
+def caminhos_saida(caminho_shapefile, raiz, diretorio_saida):
+    """
+    Calcula os caminhos de saída de uma entrada, espelhando a árvore de entrada.
+
+    Args:
+        caminho_shapefile (str): Caminho do shapefile de entrada
+        raiz (str): Diretório raiz das entradas
+        diretorio_saida (str): Diretório raiz das saídas
+
+    Returns:
+        tuple: (caminho do Excel de saída, caminho do shapefile de saída)
+    """
+    nome_base = os.path.splitext(os.path.basename(caminho_shapefile))[0]
+    subdiretorio = os.path.relpath(os.path.dirname(caminho_shapefile), raiz)
+    destino = os.path.normpath(os.path.join(diretorio_saida, subdiretorio))
+
+    return (
+        os.path.join(destino, f"{nome_base}_coordenadas.xlsx"),
+        os.path.join(destino, f"{nome_base}_renomeado.shp")
+    )
+
+
+def inicializar_processo():
+    """
+    Prepara um processo de longa duração (servidor ou fila assíncrona):
+    importa as bibliotecas pesadas uma única vez e deixa o Ctrl+C para o
+    processo principal, que encerra o pool.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    import gerador_vertices  # noqa: F401  (geopandas, pyproj, pandas, openpyxl)
+    import saida_tabela  # noqa: F401
+
+
+def _processar_item(caminho_shapefile, caminho_saida_excel, caminho_saida_shapefile, opcoes=None):
+    """
+    Processa uma única entrada do lote dentro de um processo do pool.
+
+    Args:
+        opcoes (dict, opcional): Argumentos adicionais de processar_shapefile
+            (ex: {"fuso_referencia": "centroide"})
+
+    Returns:
+        dict: Resultado do processamento da entrada
+    """
+    # Importar aqui para que o processo principal não precise carregar o geopandas
+    from gerador_vertices import processar_shapefile
+
+    inicio = time.perf_counter()
+    resultado = {
+        "entrada": caminho_shapefile,
+        "excel": caminho_saida_excel,
+        "shapefile": caminho_saida_shapefile,
+        "sucesso": False,
+        "erro": None,
+        "tempo": 0.0
+    }
+
+    try:
+        os.makedirs(os.path.dirname(caminho_saida_excel), exist_ok=True)
+        processamento = processar_shapefile(
+            caminho_shapefile, caminho_saida_excel, caminho_saida_shapefile, **(opcoes or {})
+        )
+        resultado["sucesso"] = True
+        resultado["excel"] = processamento.caminho_excel
+        resultado["shapefile"] = processamento.caminho_shapefile
+        resultado["pontos"] = processamento.num_pontos
+        resultado["etapas"] = processamento.tempos
+        resultado["fusos"] = processamento.fusos
+        if processamento.memoria:
+            resultado["memoria"] = processamento.memoria
+    except Exception as e:
+        resultado["erro"] = f"{type(e).__name__}: {e}"
+        resultado["detalhes"] = traceback.format_exc()
+
+    resultado["tempo"] = time.perf_counter() - inicio
+    return resultado
+
+
+def processar_lote(origem, diretorio_saida, workers=None, caminho_resumo=None, opcoes=None):
+    """
+    Processa todos os shapefiles de uma origem em um pool de processos.
+
+    Args:
+        origem (str): Diretório, padrão glob ou manifesto com os shapefiles de entrada
+        diretorio_saida (str): Diretório raiz onde as saídas serão gravadas
+        workers (int, opcional): Número de processos (padrão: número de CPUs)
+        caminho_resumo (str, opcional): Caminho para salvar o resumo em JSON
+        opcoes (dict, opcional): Argumentos adicionais de processar_shapefile,
+            aplicados a todas as entradas
+
+    Returns:
+        list: Resultados de cada entrada (dicts), na ordem das entradas
+    """
+    entradas, raiz = listar_entradas(origem)
+    if not entradas:
+        print(f"Nenhum shapefile encontrado em: {origem}")
+        return []
+
+    print(f"Processando {len(entradas)} shapefile(s) com {workers or os.cpu_count()} processo(s)...")
+    inicio = time.perf_counter()
+    resultados = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futuros = {}
+        for entrada in entradas:
+            caminho_saida_excel, caminho_saida_shapefile = caminhos_saida(entrada, raiz, diretorio_saida)
+            futuro = executor.submit(
+                _processar_item, entrada, caminho_saida_excel, caminho_saida_shapefile, opcoes
+            )
+            futuros[futuro] = entrada
+
+        for concluidos, futuro in enumerate(as_completed(futuros), 1):
+            entrada = futuros[futuro]
+            try:
+                resultado = futuro.result()
+            except Exception as e:
+                # Falha do próprio processo (ex: processo encerrado abruptamente)
+                resultado = {"entrada": entrada, "sucesso": False, "erro": f"{type(e).__name__}: {e}", "tempo": 0.0}
+            resultados[entrada] = resultado
+
+            situacao = "OK" if resultado["sucesso"] else f"FALHA ({resultado['erro']})"
+            print(f"[{concluidos}/{len(entradas)}] {entrada}: {situacao} em {resultado['tempo']:.2f}s")
+
+    resultados = [resultados[entrada] for entrada in entradas]
+    imprimir_resumo(resultados, time.perf_counter() - inicio)
+
+    if caminho_resumo:
+        with open(caminho_resumo, "w", encoding="utf-8") as arquivo:
+            json.dump(resultados, arquivo, ensure_ascii=False, indent=2)
+        print(f"Resumo salvo em: {caminho_resumo}")
+
+    return resultados
+
+
+def imprimir_resumo(resultados, tempo_total):
+    """
+    Mostra o resumo de tempos e falhas de um lote.
+
+    Args:
+        resultados (list): Resultados de cada entrada
+        tempo_total (float): Tempo total do lote em segundos
+    """
+    sucessos = [r for r in resultados if r["sucesso"]]
+    falhas = [r for r in resultados if not r["sucesso"]]
+    tempos = sorted(r["tempo"] for r in sucessos)
+
+    print("\n" + "=" * 50)
+    print("RESUMO DO LOTE".center(50))
+    print("=" * 50)
+    print(f"Arquivos processados: {len(resultados)}")
+    print(f"Sucessos: {len(sucessos)}")
+    print(f"Falhas: {len(falhas)}")
+    print(f"Tempo total: {tempo_total:.2f}s")
+    if tempos:
+        print(f"Tempo por arquivo: mínimo {tempos[0]:.2f}s, "
+              f"mediana {tempos[len(tempos) // 2]:.2f}s, máximo {tempos[-1]:.2f}s")
+    for falha in falhas:
+        print(f"- {falha['entrada']}: {falha['erro']}")
+
+
+def main():
+    """Função principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Processa vários shapefiles de pontos em lote.")
+    parser.add_argument("origem", help="Diretório, padrão glob ou manifesto (.txt) com os shapefiles de entrada")
+    parser.add_argument("--diretorio-saida", "-o", default="saida_lote", help="Diretório raiz para as saídas")
+    parser.add_argument("--workers", "-w", type=int, default=None, help="Número de processos (padrão: número de CPUs)")
+    parser.add_argument("--resumo", help="Caminho para salvar o resumo do lote em JSON")
+    parser.add_argument("--formato-saida", choices=["shapefile", "gpkg", "parquet"],
+                        help="Formato da camada de vértices (padrão: shapefile)")
+    parser.add_argument("--motor", choices=["arrow", "padrao"],
+                        help="Motor de leitura e escrita (padrão: arrow se pyogrio e pyarrow estiverem instalados)")
+    parser.add_argument("--medir-memoria", action="store_true",
+                        help="Medir o pico de memória de cada etapa e incluí-lo no resumo")
+    parser.add_argument("--fuso-referencia",
+                        help='Projetar todos os pontos de cada arquivo em um único fuso UTM: "centroide", 24 ou 24S')
+    parser.add_argument("--sem-cache", action="store_true",
+                        help="Não reaproveitar os pontos já processados de execuções anteriores")
+    parser.add_argument("--diretorio-cache", help="Diretório do cache de resultados (padrão: ~/.cache/gerador_vertices)")
+    parser.add_argument("--formato-tabela", choices=["excel", "xlsxwriter", "csv"],
+                        help="Formato da tabela de coordenadas: excel (openpyxl), xlsxwriter (mais rápido) "
+                             "ou csv (padrão: excel)")
+    parser.add_argument("--separador-decimal", choices=[",", "."], default=",",
+                        help="Separador decimal da tabela CSV (padrão: vírgula, com colunas separadas por ponto e vírgula)")
+    parser.add_argument("--linhas-por-planilha", type=int, default=None,
+                        help="Linhas de dados por planilha do Excel; tabelas maiores são divididas em várias planilhas "
+                             "(padrão: o limite do Excel, 1.048.574)")
+    parser.add_argument("--indice-espacial", action="store_true",
+                        help="Gravar o índice espacial da camada de saída (.qix no shapefile, bbox no GeoParquet)")
+    parser.add_argument("--ordenacao", choices=["angular", "vizinho_mais_proximo", "contorno", "envoltoria_convexa"],
+                        help="Estratégia de ordenação dos vértices (padrão: angular, ou contorno com --contorno)")
+    parser.add_argument("--contorno", help="Arquivo com o polígono ao longo do qual os vértices são ordenados "
+                                           "(implica --ordenacao contorno)")
+    parser.add_argument("--escrita-sequencial", action="store_true",
+                        help="Gravar a planilha Excel e a camada uma após a outra, em vez de ao mesmo tempo")
+
+    args = parser.parse_args()
+
+    opcoes = {
+        "fuso_referencia": args.fuso_referencia,
+        "formato_saida": args.formato_saida,
+        "motor": args.motor,
+        "medir_memoria": args.medir_memoria,
+        "usar_cache": not args.sem_cache,
+        "diretorio_cache": args.diretorio_cache,
+        "escrita_paralela": not args.escrita_sequencial,
+        "formato_tabela": args.formato_tabela,
+        "separador_decimal": args.separador_decimal,
+        "linhas_por_planilha": args.linhas_por_planilha,
+        "indice_espacial": args.indice_espacial,
+        "ordenacao": args.ordenacao or ("contorno" if args.contorno else "angular"),
+        "contorno": args.contorno
+    }
+    resultados = processar_lote(args.origem, args.diretorio_saida, args.workers, args.resumo, opcoes)
+    return 0 if resultados and all(r["sucesso"] for r in resultados) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Progresso e Cancelamento
+------------------------
+Acompanhamento do andamento de `processar_shapefile` e cancelamento
+cooperativo, para que interfaces gráficas mostrem o percentual, a etapa
+atual, a vazão (pontos por segundo) e o tempo restante, e possam
+interromper o processamento.
+
+O processamento verifica o token de cancelamento a cada relato de
+progresso: no início de cada etapa, a cada bloco da leitura em blocos e a
+cada grupo de linhas da planilha Excel. Ao ser cancelado, levanta
+ProcessamentoCancelado.
+"""
+
+import threading
+import time
+
+from erros import ProcessamentoCancelado
+
+# Peso aproximado de cada etapa no tempo total, medido com bench_etapas:
+# a escrita do Excel com o openpyxl domina o processamento
+PESOS_ETAPAS = {
+    "cache": 0.01,
+    "leitura": 0.04,
+    "projecao": 0.03,
+    "ordenacao": 0.02,
+    "formatacao": 0.05,
+    "excel": 0.80,
+    "shapefile": 0.05,
+}
+
+# Peso da etapa "excel" em cada formato da tabela, na mesma escala de
+# PESOS_ETAPAS, pelo tempo de escrita relativo ao openpyxl medido com
+# bench_tabelas (xlsxwriter cerca de 2 vezes e CSV cerca de 11 vezes mais rápidos)
+PESOS_TABELA = {
+    "excel": 0.80,
+    "xlsxwriter": 0.40,
+    "csv": 0.07,
+}
+
+# Etapas na ordem em que são executadas
+ORDEM_ETAPAS = tuple(PESOS_ETAPAS)
+
+# Nomes das etapas exibidos ao usuário
+NOMES_ETAPAS = {
+    "cache": "Cache",
+    "leitura": "Leitura",
+    "projecao": "Projeção",
+    "ordenacao": "Ordenação",
+    "formatacao": "Formatação",
+    "excel": "Tabela de coordenadas",
+    "shapefile": "Camada de saída",
+}
+
+# Intervalo mínimo entre dois relatos dentro de uma mesma etapa, em segundos
+INTERVALO_MINIMO = 0.1
+
+
+class TokenCancelamento:
+    """
+    Sinal de cancelamento compartilhado entre quem pede e quem processa.
+
+    A interface chama `cancelar()` (de qualquer thread) e o processamento
+    chama `verificar()` entre os passos do trabalho.
+    """
+
+    def __init__(self):
+        self._evento = threading.Event()
+
+    def cancelar(self):
+        """Pede o cancelamento do processamento."""
+        self._evento.set()
+
+    @property
+    def cancelado(self):
+        """Indica se o cancelamento foi pedido."""
+        return self._evento.is_set()
+
+    def verificar(self):
+        """
+        Raises:
+            ProcessamentoCancelado: Se o cancelamento foi pedido
+        """
+        if self._evento.is_set():
+            raise ProcessamentoCancelado("Processamento cancelado pelo usuário.")
+
+
+class EstadoProgresso:
+    """
+    Situação do processamento enviada à função de progresso.
+
+    Attributes:
+        etapa (str): Etapa atual (ver ORDEM_ETAPAS)
+        fracao (float): Fração estimada do processamento concluída (0 a 1)
+        pontos (int): Pontos já tratados na etapa atual
+        total (int): Total de pontos da etapa atual, ou None se desconhecido
+        pontos_por_segundo (float): Vazão da etapa atual, ou None
+        restante (float): Tempo restante estimado em segundos, ou None
+        decorrido (float): Tempo desde o início do processamento em segundos
+    """
+
+    __slots__ = ("etapa", "fracao", "pontos", "total", "pontos_por_segundo", "restante", "decorrido")
+
+    def __init__(self, etapa, fracao, pontos, total, pontos_por_segundo, restante, decorrido):
+        self.etapa = etapa
+        self.fracao = fracao
+        self.pontos = pontos
+        self.total = total
+        self.pontos_por_segundo = pontos_por_segundo
+        self.restante = restante
+        self.decorrido = decorrido
+
+    @property
+    def percentual(self):
+        """Percentual concluído, de 0 a 100."""
+        return int(self.fracao * 100)
+
+    def __repr__(self):
+        return f"EstadoProgresso(etapa={self.etapa!r}, percentual={self.percentual}, pontos={self.pontos})"
+
+
+def pesos_etapas(formato_tabela=None):
+    """
+    Calcula o peso de cada etapa para o formato da tabela de coordenadas.
+
+    Args:
+        formato_tabela (str, opcional): Formato da tabela (chave de PESOS_TABELA);
+            por padrão, o peso medido com o openpyxl
+
+    Returns:
+        dict: Peso de cada etapa, somando 1
+    """
+    pesos = dict(PESOS_ETAPAS, excel=PESOS_TABELA.get(formato_tabela, PESOS_ETAPAS["excel"]))
+    total = sum(pesos.values())
+    return {etapa: peso / total for etapa, peso in pesos.items()}
+
+
+class AcompanhamentoProgresso:
+    """
+    Acompanha as etapas de um processamento, relata o progresso e verifica o cancelamento.
+
+    Sem função de progresso e sem token, todas as chamadas são quase gratuitas.
+    """
+
+    def __init__(self, funcao=None, token=None, formato_tabela=None):
+        """
+        Args:
+            funcao (callable, opcional): Chamada com um EstadoProgresso a cada relato;
+                roda na thread do processamento ou, na escrita paralela, na
+                thread que grava a planilha
+            token (TokenCancelamento, opcional): Token verificado a cada relato
+            formato_tabela (str, opcional): Formato da tabela de coordenadas,
+                que define o peso da etapa "excel" no percentual
+        """
+        self.funcao = funcao
+        self.token = token
+        self.pesos = pesos_etapas(formato_tabela)
+        self._inicio = time.perf_counter()
+        self._etapa = None
+        self._inicio_etapa = self._inicio
+        self._pontos = 0
+        self._total = None
+        self._ultimo_relato = 0.0
+
+    def iniciar_etapa(self, etapa, total=None):
+        """
+        Marca o início de uma etapa.
+
+        Args:
+            etapa (str): Nome da etapa (ver ORDEM_ETAPAS)
+            total (int, opcional): Número de pontos que a etapa vai tratar
+
+        Raises:
+            ProcessamentoCancelado: Se o cancelamento foi pedido
+        """
+        self._etapa = etapa
+        self._inicio_etapa = time.perf_counter()
+        self._pontos = 0
+        self._total = total
+        self._relatar(forcar=True)
+
+    def avancar(self, pontos):
+        """
+        Registra pontos tratados na etapa atual.
+
+        Args:
+            pontos (int): Pontos tratados desde o último avanço
+
+        Raises:
+            ProcessamentoCancelado: Se o cancelamento foi pedido
+        """
+        self._pontos += pontos
+        self._relatar()
+
+    def acompanhar(self, itens, passo=1000):
+        """
+        Percorre um iterável relatando o avanço a cada `passo` itens.
+
+        Args:
+            itens (iterable): Itens da etapa atual (ex: linhas da planilha)
+            passo (int, opcional): Itens entre dois avanços
+
+        Yields:
+            Os mesmos itens
+        """
+        if self.funcao is None and self.token is None:
+            yield from itens
+            return
+
+        contador = 0
+        for item in itens:
+            yield item
+            contador += 1
+            if contador == passo:
+                self.avancar(contador)
+                contador = 0
+        if contador:
+            self.avancar(contador)
+
+    def concluir(self):
+        """Relata o fim do processamento (100%)."""
+        self._etapa = None
+        self._relatar(forcar=True)
+
+    def _relatar(self, forcar=False):
+        if self.token is not None:
+            self.token.verificar()
+        if self.funcao is None:
+            return
+
+        agora = time.perf_counter()
+        if not forcar and agora - self._ultimo_relato < INTERVALO_MINIMO:
+            return
+        self._ultimo_relato = agora
+        self.funcao(self._estado(agora))
+
+    def _estado(self, agora):
+        decorrido = agora - self._inicio
+        if self._etapa is None:
+            return EstadoProgresso(None, 1.0, self._pontos, self._total, None, 0.0, decorrido)
+
+        # Fração: etapas anteriores completas mais a parte concluída da atual
+        indice = ORDEM_ETAPAS.index(self._etapa)
+        fracao = sum(self.pesos[etapa] for etapa in ORDEM_ETAPAS[:indice])
+        if self._total:
+            fracao += self.pesos[self._etapa] * min(self._pontos / self._total, 1.0)
+
+        tempo_etapa = agora - self._inicio_etapa
+        vazao = self._pontos / tempo_etapa if self._pontos and tempo_etapa > 0 else None
+
+        # Tempo restante pelo ritmo observado até agora
+        restante = decorrido * (1 - fracao) / fracao if fracao >= 0.01 else None
+        return EstadoProgresso(self._etapa, fracao, self._pontos, self._total, vazao, restante, decorrido)
+
+
+def formatar_progresso(estado):
+    """
+    Descreve o progresso em uma linha (ex: "Tabela de coordenadas: 45% | 12.345 pontos/s | restante 1:23").
+
+    Args:
+        estado (EstadoProgresso): Situação do processamento
+
+    Returns:
+        str: Descrição para a interface
+    """
+    if estado.etapa is None:
+        return f"Concluído em {_formatar_tempo(estado.decorrido)}"
+
+    partes = [f"{NOMES_ETAPAS.get(estado.etapa, estado.etapa)}: {estado.percentual}%"]
+    if estado.pontos_por_segundo:
+        partes.append(f"{estado.pontos_por_segundo:,.0f} pontos/s".replace(",", "."))
+    if estado.restante is not None:
+        partes.append(f"restante {_formatar_tempo(estado.restante)}")
+    return " | ".join(partes)
+
+
+def _formatar_tempo(segundos):
+    minutos, segundos = divmod(int(round(segundos)), 60)
+    horas, minutos = divmod(minutos, 60)
+    if horas:
+        return f"{horas}:{minutos:02d}:{segundos:02d}"
+    return f"{minutos}:{segundos:02d}"
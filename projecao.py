@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Projeção Vetorizada
+-------------------
+Conversão de coordenadas em lote para o Gerador de Vértices. Em vez de
+projetar um ponto de cada vez, as coordenadas de todos os pontos são
+extraídas de uma só vez em arrays NumPy e projetadas com chamadas
+`transform` em lote (uma por CRS de origem e uma por fuso/hemisfério UTM).
+
+Por padrão cada ponto usa o seu próprio fuso UTM; opcionalmente, um fuso de
+referência (fixo ou o do centro dos pontos) pode ser imposto a todo o
+trabalho.
+"""
+
+import numpy as np
+
+from transformadores import pool_transformadores
+
+# Valor de fuso_referencia que usa o fuso do centro dos pontos
+FUSO_CENTROIDE = "centroide"
+
+
+def calcular_fusos_utm(longitudes):
+    """
+    Calcula o número do fuso UTM para um array de longitudes.
+
+    Args:
+        longitudes (numpy.ndarray): Longitudes em graus decimais
+
+    Returns:
+        numpy.ndarray: Fusos UTM (1-60), em int8
+    """
+    return (((np.asarray(longitudes) + 180) / 6) % 60).astype(np.int8) + np.int8(1)
+
+
+def projetar_para_geografico(x, y, crs_origem):
+    """
+    Converte arrays de coordenadas do CRS de origem para WGS84.
+
+    Args:
+        x (numpy.ndarray): Coordenadas x no CRS de origem
+        y (numpy.ndarray): Coordenadas y no CRS de origem
+        crs_origem: CRS das coordenadas de entrada
+
+    Returns:
+        tuple: (array de latitudes, array de longitudes)
+    """
+    transformer = pool_transformadores.obter_geografico(crs_origem)
+    longitudes, latitudes = transformer.transform(x, y)
+    return np.asarray(latitudes, dtype=np.float64), np.asarray(longitudes, dtype=np.float64)
+
+
+def resolver_fuso_referencia(fuso_referencia, latitudes, longitudes):
+    """
+    Resolve o fuso UTM de referência usado para todos os pontos do trabalho.
+
+    Args:
+        fuso_referencia: None (cada ponto no seu próprio fuso), "centroide"
+            (fuso e hemisfério do centro dos pontos), um número de fuso
+            (ex: 24, hemisfério do centro dos pontos) ou fuso com hemisfério
+            (ex: "24S")
+        latitudes (numpy.ndarray): Latitudes em graus decimais
+        longitudes (numpy.ndarray): Longitudes em graus decimais
+
+    Returns:
+        tuple: (fuso, True se hemisfério sul) ou None se cada ponto usa o seu fuso
+
+    Raises:
+        ValueError: Se o fuso de referência for inválido
+    """
+    if fuso_referencia is None:
+        return None
+
+    latitude_centro = float(np.mean(latitudes))
+    if isinstance(fuso_referencia, str) and fuso_referencia.strip().lower() == FUSO_CENTROIDE:
+        longitude_centro = float(np.mean(longitudes))
+        return int(calcular_fusos_utm(longitude_centro)), latitude_centro < 0
+
+    texto = str(fuso_referencia).strip().upper()
+    hemisferio = None
+    if texto[-1:] in ("N", "S"):
+        texto, hemisferio = texto[:-1], texto[-1]
+    try:
+        fuso = int(texto)
+    except ValueError:
+        raise ValueError(f"Fuso de referência inválido: {fuso_referencia!r}") from None
+    if not 1 <= fuso <= 60:
+        raise ValueError(f"Fuso de referência fora do intervalo 1-60: {fuso_referencia!r}")
+
+    sul = latitude_centro < 0 if hemisferio is None else hemisferio == "S"
+    return fuso, sul
+
+
+def rotular_fusos(fusos, sul):
+    """
+    Monta os rótulos de fuso e hemisfério (ex: "24S") de cada ponto.
+
+    Args:
+        fusos (numpy.ndarray): Fusos UTM
+        sul (numpy.ndarray): True para os pontos projetados no hemisfério sul
+
+    Returns:
+        numpy.ndarray: Rótulos de fuso
+    """
+    return np.char.add(np.asarray(fusos).astype(str), np.where(sul, "S", "N"))
+
+
+def projetar_para_utm(latitudes, longitudes, fuso_referencia=None):
+    """
+    Converte arrays de coordenadas geográficas para UTM.
+
+    Por padrão cada ponto é projetado no seu próprio fuso e hemisfério, como
+    em `converter_para_utm`, mas com uma única chamada `transform` por grupo
+    (fuso, hemisfério). Com um fuso de referência, todos os pontos são
+    projetados no mesmo fuso, o que mantém as coordenadas consistentes em
+    levantamentos que cruzam a divisa entre fusos.
+
+    Args:
+        latitudes (numpy.ndarray): Latitudes em graus decimais
+        longitudes (numpy.ndarray): Longitudes em graus decimais
+        fuso_referencia (opcional): Fuso único para todos os pontos
+            (ver `resolver_fuso_referencia`)
+
+    Returns:
+        tuple: (array de nortes, array de lestes, array de fusos,
+        array booleano do hemisfério sul)
+    """
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+
+    referencia = resolver_fuso_referencia(fuso_referencia, latitudes, longitudes)
+    if referencia is None:
+        fusos = calcular_fusos_utm(longitudes)
+        sul = latitudes < 0
+    else:
+        fusos = np.full(len(latitudes), referencia[0], dtype=np.int8)
+        sul = np.full(len(latitudes), referencia[1])
+
+    nortes = np.empty_like(latitudes)
+    lestes = np.empty_like(longitudes)
+
+    # Agrupar os pontos por (fuso, hemisfério) e projetar cada grupo de uma vez
+    grupos = np.unique(np.stack([fusos, sul.astype(np.int64)]), axis=1)
+    for fuso, grupo_sul in grupos.T:
+        mascara = (fusos == fuso) & (sul == bool(grupo_sul))
+        hemisferio = "S" if grupo_sul else "N"
+        transformer = pool_transformadores.obter_utm(int(fuso), hemisferio)
+        leste, norte = transformer.transform(longitudes[mascara], latitudes[mascara])
+        lestes[mascara] = leste
+        nortes[mascara] = norte
+
+    return nortes, lestes, fusos, sul
+
+
+def projetar_coordenadas(pontos, crs_origem, fuso_referencia=None):
+    """
+    Calcula as coordenadas geográficas e UTM dos pontos.
+
+    Args:
+        pontos (PontosColunares): Pontos com as colunas 'x' e 'y' no CRS de origem
+        crs_origem: CRS das coordenadas de entrada
+        fuso_referencia (opcional): Fuso único para todos os pontos
+
+    Returns:
+        PontosColunares: Os mesmos pontos, com as colunas 'latitude', 'longitude',
+        'norte_utm', 'leste_utm', 'fuso' e 'sul'
+    """
+    return adicionar_utm(projetar_geografico(pontos, crs_origem), fuso_referencia)
+
+
+def projetar_geografico(pontos, crs_origem):
+    """
+    Calcula apenas as coordenadas geográficas dos pontos.
+
+    Args:
+        pontos (PontosColunares): Pontos com as colunas 'x' e 'y' no CRS de origem
+        crs_origem: CRS das coordenadas de entrada
+
+    Returns:
+        PontosColunares: Os mesmos pontos, com as colunas 'latitude' e 'longitude'
+    """
+    latitudes, longitudes = projetar_para_geografico(pontos["x"], pontos["y"], crs_origem)
+    pontos["latitude"] = latitudes
+    pontos["longitude"] = longitudes
+    return pontos
+
+
+def adicionar_utm(pontos, fuso_referencia=None):
+    """
+    Acrescenta as coordenadas UTM aos pontos.
+
+    Args:
+        pontos (PontosColunares): Pontos com as colunas 'latitude' e 'longitude'
+        fuso_referencia (opcional): Fuso único para todos os pontos
+
+    Returns:
+        PontosColunares: Os mesmos pontos, com as colunas 'norte_utm',
+        'leste_utm', 'fuso' e 'sul'
+    """
+    nortes, lestes, fusos, sul = projetar_para_utm(
+        pontos["latitude"], pontos["longitude"], fuso_referencia
+    )
+    pontos["norte_utm"] = nortes
+    pontos["leste_utm"] = lestes
+    pontos["fuso"] = fusos
+    pontos["sul"] = sul
+    return pontos
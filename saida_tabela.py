@@ -0,0 +1,431 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Saída em Tabela
+---------------
+Escrita da "TABELA DE COORDENADAS" do Gerador de Vértices.
+
+O formato é escolhido pela extensão do arquivo de saída ou explicitamente
+pelo nome do formato:
+
+- excel (.xlsx): planilha formatada gerada pelo openpyxl, o formato original;
+- xlsxwriter (.xlsx): a mesma planilha gerada pelo xlsxwriter no modo de
+  memória constante, bem mais rápido em tabelas grandes (requer xlsxwriter);
+- csv (.csv): apenas os valores, com o separador decimal escolhido; é a
+  saída mais rápida, para sistemas que só precisam dos números.
+
+As planilhas são geradas em uma única passagem: título, cabeçalho e linhas
+de dados são enviados ao arquivo à medida que são produzidos, já com a
+formatação final. Assim a memória fica limitada mesmo em tabelas grandes e
+o arquivo não precisa ser reaberto para formatação.
+
+Tabelas maiores que o limite de linhas do Excel (ou que o tamanho de
+planilha escolhido) são divididas em planilhas numeradas ("Tabela 1",
+"Tabela 2", ...), cada uma com o título e o cabeçalho. As planilhas são
+preenchidas uma após a outra, à medida que as linhas chegam.
+
+Cada tabela é gravada em um arquivo temporário no mesmo diretório, que só
+substitui o destino quando a escrita termina: uma falha ou um cancelamento
+não deixa um arquivo vazio ou incompleto e preserva a tabela anterior.
+"""
+
+import contextlib
+import csv
+import importlib.util
+import os
+import uuid
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+# Título e colunas da tabela de coordenadas
+TITULO_TABELA = "TABELA DE COORDENADAS"
+COLUNAS_TABELA = ["PONTOS", "LATITUDE", "LONGITUDE", "ESTE", "NORTE"]
+
+# Largura de cada coluna na planilha
+LARGURAS_COLUNAS = {
+    "PONTOS": 15,
+    "LATITUDE": 25,
+    "LONGITUDE": 25,
+    "ESTE": 15,
+    "NORTE": 15,
+    "FUSO": 10
+}
+LARGURA_PADRAO = 15
+
+# Limite de linhas de uma planilha do Excel e linhas de dados que cabem em
+# uma planilha, descontando o título e o cabeçalho
+LIMITE_LINHAS_EXCEL = 1048576
+LINHAS_POR_PLANILHA_PADRAO = LIMITE_LINHAS_EXCEL - 2
+
+# Nome das planilhas, numeradas a partir de 1
+NOME_PLANILHA = "Tabela"
+
+# Separador decimal padrão do CSV (pt-BR); com a vírgula decimal, as colunas
+# são separadas por ponto e vírgula, como o Excel em português espera
+SEPARADOR_DECIMAL_PADRAO = ","
+
+# Casas decimais dos números no CSV, as mesmas do arredondamento de ESTE e NORTE
+CASAS_DECIMAIS_CSV = 3
+
+# Colunas em graus, minutos e segundos, cujos segundos também usam o separador decimal
+COLUNAS_GMS = ("LATITUDE", "LONGITUDE")
+
+
+def criar_estilos():
+    """
+    Cria os estilos nomeados usados na tabela de coordenadas.
+
+    Returns:
+        dict: Estilos 'titulo', 'cabecalho' e 'dados'
+    """
+    # Cores, fontes e alinhamento iguais aos da planilha de referência
+    cor_cabecalho = PatternFill(start_color="A6A6A6", end_color="A6A6A6", fill_type="solid")
+    fonte = Font(bold=True, size=11)
+    alinhamento_centro = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    borda_fina = Side(style="thin", color="000000")
+    borda_completa = Border(left=borda_fina, right=borda_fina, top=borda_fina, bottom=borda_fina)
+
+    return {
+        "titulo": NamedStyle(
+            name="Tabela Titulo", font=fonte, fill=cor_cabecalho, alignment=alinhamento_centro
+        ),
+        "cabecalho": NamedStyle(
+            name="Tabela Cabecalho", font=fonte, fill=cor_cabecalho,
+            alignment=alinhamento_centro, border=borda_completa
+        ),
+        "dados": NamedStyle(
+            name="Tabela Dados", font=fonte, alignment=alinhamento_centro, border=borda_completa
+        )
+    }
+
+
+def _validar_linhas_por_planilha(linhas_por_planilha):
+    """
+    Raises:
+        ValueError: Se o número de linhas por planilha estiver fora do limite do Excel
+    """
+    if not 1 <= linhas_por_planilha <= LINHAS_POR_PLANILHA_PADRAO:
+        raise ValueError(f"Linhas por planilha devem estar entre 1 e {LINHAS_POR_PLANILHA_PADRAO}: "
+                         f"{linhas_por_planilha}")
+
+
+@contextlib.contextmanager
+def _gravar_por_temporario(caminho):
+    """
+    Grava um arquivo por meio de um temporário no mesmo diretório.
+
+    O temporário é criado imediatamente, para falhar cedo se o caminho for
+    inválido, e substitui o destino (os.replace) apenas se o bloco terminar
+    sem erro; em qualquer exceção ele é apagado e o destino fica intacto.
+
+    Args:
+        caminho (str): Caminho final do arquivo
+
+    Yields:
+        str: Caminho do arquivo temporário, com a mesma extensão
+    """
+    diretorio, nome = os.path.split(os.path.abspath(caminho))
+    base, extensao = os.path.splitext(nome)
+    temporario = os.path.join(diretorio, f".{base}.{uuid.uuid4().hex[:8]}{extensao}")
+    open(temporario, "xb").close()
+    try:
+        yield temporario
+        os.replace(temporario, caminho)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temporario)
+        raise
+
+
+def escrever_planilha_excel(caminho_excel, linhas, colunas=COLUNAS_TABELA,
+                            linhas_por_planilha=LINHAS_POR_PLANILHA_PADRAO):
+    """
+    Escreve a tabela de coordenadas formatada em uma única passagem, com o
+    modo somente escrita (write-only) do openpyxl e estilos nomeados compartilhados.
+
+    Args:
+        caminho_excel (str): Caminho para o arquivo Excel de saída
+        linhas (iterable): Linhas da tabela, cada uma com um valor por coluna
+        colunas (list, opcional): Nomes das colunas da tabela
+        linhas_por_planilha (int, opcional): Linhas de dados por planilha; as
+            demais vão para novas planilhas (padrão: o limite do Excel)
+
+    Returns:
+        int: Número de linhas de dados escritas
+
+    Raises:
+        ValueError: Se linhas_por_planilha estiver fora do limite do Excel
+    """
+    _validar_linhas_por_planilha(linhas_por_planilha)
+
+    with _gravar_por_temporario(caminho_excel) as temporario:
+        return _escrever_planilha_excel(temporario, linhas, colunas, linhas_por_planilha)
+
+
+def _escrever_planilha_excel(caminho_excel, linhas, colunas, linhas_por_planilha):
+    """Corpo de escrever_planilha_excel, gravando no arquivo temporário."""
+    wb = openpyxl.Workbook(write_only=True)
+
+    # Registrar os estilos nomeados uma única vez no workbook
+    estilos = criar_estilos()
+    for estilo in estilos.values():
+        wb.add_named_style(estilo)
+    estilo_titulo = estilos["titulo"].name
+    estilo_cabecalho = estilos["cabecalho"].name
+    estilo_dados = estilos["dados"].name
+
+    def nova_planilha():
+        ws = wb.create_sheet(f"{NOME_PLANILHA} {len(wb.worksheets) + 1}")
+
+        # As larguras das colunas precisam ser definidas antes de escrever as linhas
+        for indice, coluna in enumerate(colunas, 1):
+            ws.column_dimensions[get_column_letter(indice)].width = LARGURAS_COLUNAS.get(coluna, LARGURA_PADRAO)
+
+        # Título mesclado sobre todas as colunas
+        titulo = WriteOnlyCell(ws, value=TITULO_TABELA)
+        titulo.style = estilo_titulo
+        ws.append([titulo])
+        ws.merged_cells.add(f"A1:{get_column_letter(len(colunas))}1")
+
+        # Cabeçalhos
+        cabecalho = []
+        for coluna in colunas:
+            celula = WriteOnlyCell(ws, value=coluna)
+            celula.style = estilo_cabecalho
+            cabecalho.append(celula)
+        ws.append(cabecalho)
+        return ws
+
+    # Linhas de dados, escritas à medida que são produzidas
+    num_linhas = 0
+    ws = None
+    try:
+        for linha in linhas:
+            if num_linhas % linhas_por_planilha == 0:
+                ws = nova_planilha()
+            celulas = []
+            for valor in linha:
+                celula = WriteOnlyCell(ws, value=valor)
+                celula.style = estilo_dados
+                celulas.append(celula)
+            ws.append(celulas)
+            num_linhas += 1
+        if ws is None:
+            # Tabela vazia: apenas o título e o cabeçalho
+            nova_planilha()
+    except BaseException:
+        # Interrompido (ex: cancelamento): salvar é o que libera os arquivos
+        # temporários das planilhas; o arquivo parcial é apagado em seguida
+        with contextlib.suppress(Exception):
+            wb.save(caminho_excel)
+        raise
+
+    wb.save(caminho_excel)
+    return num_linhas
+
+
+def escrever_planilha_xlsxwriter(caminho_excel, linhas, colunas=COLUNAS_TABELA,
+                                 linhas_por_planilha=LINHAS_POR_PLANILHA_PADRAO):
+    """
+    Escreve a tabela de coordenadas formatada com o xlsxwriter no modo de
+    memória constante (cada linha vai para o disco assim que é escrita).
+
+    A planilha tem o mesmo título, cabeçalho, larguras e formatação da
+    gerada por escrever_planilha_excel.
+
+    Args:
+        caminho_excel (str): Caminho para o arquivo Excel de saída
+        linhas (iterable): Linhas da tabela, cada uma com um valor por coluna
+        colunas (list, opcional): Nomes das colunas da tabela
+        linhas_por_planilha (int, opcional): Linhas de dados por planilha; as
+            demais vão para novas planilhas (padrão: o limite do Excel)
+
+    Returns:
+        int: Número de linhas de dados escritas
+
+    Raises:
+        ValueError: Se linhas_por_planilha estiver fora do limite do Excel
+    """
+    if importlib.util.find_spec("xlsxwriter") is None:
+        raise ImportError("A planilha com o xlsxwriter requer o pacote xlsxwriter (pip install xlsxwriter).")
+    import xlsxwriter
+
+    _validar_linhas_por_planilha(linhas_por_planilha)
+
+    with _gravar_por_temporario(caminho_excel) as temporario:
+        return _escrever_planilha_xlsxwriter(xlsxwriter.Workbook(temporario, {"constant_memory": True}),
+                                             linhas, colunas, linhas_por_planilha)
+
+
+def _escrever_planilha_xlsxwriter(wb, linhas, colunas, linhas_por_planilha):
+    """Corpo de escrever_planilha_xlsxwriter, gravando no workbook aberto no arquivo temporário."""
+    # Formatos equivalentes aos estilos nomeados de criar_estilos
+    base = {"bold": True, "font_size": 11, "align": "center", "valign": "vcenter", "text_wrap": True}
+    borda = {"border": 1, "border_color": "#000000"}
+    formato_titulo = wb.add_format(dict(base, bg_color="#A6A6A6"))
+    formato_cabecalho = wb.add_format(dict(base, bg_color="#A6A6A6", **borda))
+    formato_dados = wb.add_format(dict(base, **borda))
+
+    def nova_planilha():
+        ws = wb.add_worksheet(f"{NOME_PLANILHA} {len(wb.worksheets()) + 1}")
+        for indice, coluna in enumerate(colunas):
+            ws.set_column(indice, indice, LARGURAS_COLUNAS.get(coluna, LARGURA_PADRAO))
+
+        # No modo de memória constante as linhas precisam ser escritas em ordem
+        if len(colunas) > 1:
+            ws.merge_range(0, 0, 0, len(colunas) - 1, TITULO_TABELA, formato_titulo)
+        else:
+            ws.write(0, 0, TITULO_TABELA, formato_titulo)
+        ws.write_row(1, 0, colunas, formato_cabecalho)
+        return ws
+
+    num_linhas = 0
+    ws = None
+    try:
+        for linha in linhas:
+            posicao = num_linhas % linhas_por_planilha
+            if posicao == 0:
+                ws = nova_planilha()
+            ws.write_row(posicao + 2, 0, linha, formato_dados)
+            num_linhas += 1
+        if ws is None:
+            # Tabela vazia: apenas o título e o cabeçalho
+            nova_planilha()
+    except BaseException:
+        # Interrompido (ex: cancelamento): fechar é o que libera os arquivos
+        # temporários das linhas; o arquivo parcial é apagado em seguida
+        with contextlib.suppress(Exception):
+            wb.close()
+        raise
+
+    wb.close()
+    return num_linhas
+
+
+def escrever_csv(caminho_csv, linhas, colunas=COLUNAS_TABELA, separador_decimal=SEPARADOR_DECIMAL_PADRAO):
+    """
+    Escreve a tabela de coordenadas como CSV, sem título nem formatação.
+
+    Os números são gravados com CASAS_DECIMAIS_CSV casas e o separador
+    decimal informado, que também é usado nos segundos da latitude e da
+    longitude em graus, minutos e segundos (COLUNAS_GMS); com a vírgula, as
+    colunas são separadas por ponto e vírgula. O arquivo é gravado em UTF-8
+    com BOM, para que o Excel o abra corretamente.
+
+    Args:
+        caminho_csv (str): Caminho para o arquivo CSV de saída
+        linhas (iterable): Linhas da tabela, cada uma com um valor por coluna
+        colunas (list, opcional): Nomes das colunas da tabela
+        separador_decimal (str, opcional): "," (padrão) ou "."
+
+    Returns:
+        int: Número de linhas de dados escritas
+
+    Raises:
+        ValueError: Se o separador decimal não for "," nem "."
+    """
+    if separador_decimal not in (",", "."):
+        raise ValueError(f'Separador decimal não suportado: {separador_decimal!r} (use "," ou ".")')
+    delimitador = ";" if separador_decimal == "," else ","
+    posicoes_gms = [posicao for posicao, coluna in enumerate(colunas) if coluna in COLUNAS_GMS]
+
+    num_linhas = 0
+    with _gravar_por_temporario(caminho_csv) as temporario, \
+            open(temporario, "w", encoding="utf-8-sig", newline="") as arquivo:
+        escritor = csv.writer(arquivo, delimiter=delimitador)
+        escritor.writerow(colunas)
+        for num_linhas, linha in enumerate(linhas, 1):
+            linha = [f"{valor:.{CASAS_DECIMAIS_CSV}f}".replace(".", separador_decimal)
+                     if isinstance(valor, float) else valor for valor in linha]
+            if separador_decimal == ",":
+                for posicao in posicoes_gms:
+                    linha[posicao] = str(linha[posicao]).replace(".", ",")
+            escritor.writerow(linha)
+    return num_linhas
+
+
+# Formatos da tabela de coordenadas: nome -> (extensão, função de escrita)
+FORMATOS_TABELA = {
+    "excel": (".xlsx", escrever_planilha_excel),
+    "xlsxwriter": (".xlsx", escrever_planilha_xlsxwriter),
+    "csv": (".csv", escrever_csv),
+}
+
+# Formato usado quando o caminho não indica nenhum
+FORMATO_TABELA_PADRAO = "excel"
+
+
+def identificar_formato_tabela(caminho, formato=None):
+    """
+    Identifica o formato da tabela de coordenadas de um caminho.
+
+    Args:
+        caminho (str): Caminho do arquivo de saída
+        formato (str, opcional): Nome do formato; tem precedência sobre a extensão
+
+    Returns:
+        str: Nome do formato (chave de FORMATOS_TABELA); .xlsx corresponde a "excel"
+
+    Raises:
+        ValueError: Se o formato ou a extensão não forem suportados
+    """
+    if formato is not None:
+        formato = formato.lower()
+        if formato not in FORMATOS_TABELA:
+            raise ValueError(f"Formato de tabela não suportado: {formato} "
+                             f"(use {', '.join(FORMATOS_TABELA)})")
+        return formato
+
+    extensao = os.path.splitext(caminho)[1].lower()
+    if not extensao:
+        return FORMATO_TABELA_PADRAO
+    for nome, (extensao_formato, _) in FORMATOS_TABELA.items():
+        if extensao == extensao_formato:
+            return nome
+    raise ValueError(f"Extensão de tabela não suportada: {extensao} "
+                     f"(use {', '.join(sorted({ext for ext, _ in FORMATOS_TABELA.values()}))})")
+
+
+def ajustar_extensao_tabela(caminho, formato):
+    """
+    Garante que o caminho da tabela tenha a extensão do formato.
+
+    Args:
+        caminho (str): Caminho do arquivo de saída
+        formato (str): Nome do formato
+
+    Returns:
+        str: Caminho com a extensão do formato
+    """
+    extensao = FORMATOS_TABELA[formato][0]
+    base, extensao_atual = os.path.splitext(caminho)
+    if extensao_atual.lower() == extensao:
+        return caminho
+    return f"{base}{extensao}"
+
+
+def escrever_tabela(caminho, linhas, colunas=COLUNAS_TABELA, formato=None,
+                    separador_decimal=SEPARADOR_DECIMAL_PADRAO, linhas_por_planilha=LINHAS_POR_PLANILHA_PADRAO):
+    """
+    Escreve a tabela de coordenadas no formato indicado pelo caminho ou pelo nome.
+
+    Args:
+        caminho (str): Caminho do arquivo de saída
+        linhas (iterable): Linhas da tabela, cada uma com um valor por coluna
+        colunas (list, opcional): Nomes das colunas da tabela
+        formato (str, opcional): Nome do formato; por padrão usa a extensão
+        separador_decimal (str, opcional): Separador decimal do CSV
+        linhas_por_planilha (int, opcional): Linhas de dados por planilha do Excel
+            (o CSV não é dividido)
+
+    Returns:
+        int: Número de linhas de dados escritas
+    """
+    formato = identificar_formato_tabela(caminho, formato)
+    if formato == "csv":
+        return escrever_csv(caminho, linhas, colunas, separador_decimal)
+    return FORMATOS_TABELA[formato][1](caminho, linhas, colunas, linhas_por_planilha)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Saída Vetorial
+--------------
+Escrita da camada de vértices renomeados do Gerador de Vértices.
+
+O formato é escolhido pela extensão do arquivo de saída ou explicitamente
+pelo nome do formato:
+
+- shapefile (.shp): ESRI Shapefile, o formato original;
+- gpkg (.gpkg): GeoPackage, um único arquivo com índice espacial;
+- parquet (.parquet): GeoParquet, colunar e comprimido (requer pyarrow).
+
+Todos os formatos recebem o mesmo esquema de colunas (PONTOS, LATITUDE,
+LONGITUDE, ESTE, NORTE, FUSO). Shapefile e GeoPackage são gravados pelo
+GDAL com o motor escolhido em motor_io.
+
+Com o índice espacial, o shapefile ganha um arquivo .qix (quadtree do
+GDAL/MapServer, lido pelo QGIS e pelo próprio GDAL) e o GeoParquet ganha a
+coluna "bbox" de cobertura do GeoParquet 1.1, que permite filtrar por
+extensão sem ler as geometrias. O GeoPackage sempre tem índice R-tree.
+As linhas mantêm a ordem dos vértices.
+"""
+
+import importlib.util
+import os
+
+from motor_io import opcoes_motor, resolver_motor
+
+# Compressão usada no GeoParquet
+COMPRESSAO_PARQUET = "zstd"
+
+
+def escrever_shapefile(camada, caminho, motor=None, indice_espacial=False):
+    """
+    Escreve a camada como ESRI Shapefile.
+
+    Args:
+        camada (GeoDataFrame): Camada de vértices
+        caminho (str): Caminho do arquivo .shp
+        motor (str, opcional): Motor de escrita ("arrow" ou "padrao")
+        indice_espacial (bool, opcional): Grava também o índice espacial .qix
+    """
+    # Não deixar o índice de uma gravação anterior descrevendo a nova camada
+    caminho_indice = f"{os.path.splitext(caminho)[0]}.qix"
+    if os.path.exists(caminho_indice):
+        os.remove(caminho_indice)
+    opcoes = {"SPATIAL_INDEX": "YES"} if indice_espacial else {}
+    camada.to_file(caminho, driver="ESRI Shapefile", **opcoes, **opcoes_motor(resolver_motor(motor)))
+
+
+def escrever_geopackage(camada, caminho, motor=None, indice_espacial=False):
+    """
+    Escreve a camada como GeoPackage, em uma camada com o nome do arquivo.
+
+    Args:
+        camada (GeoDataFrame): Camada de vértices
+        caminho (str): Caminho do arquivo .gpkg
+        motor (str, opcional): Motor de escrita ("arrow" ou "padrao")
+        indice_espacial (bool, opcional): Ignorado: o GeoPackage sempre tem índice R-tree
+    """
+    nome_camada = os.path.splitext(os.path.basename(caminho))[0]
+    # Regravar o arquivo inteiro, como nos demais formatos
+    if os.path.exists(caminho):
+        os.remove(caminho)
+    camada.to_file(caminho, driver="GPKG", layer=nome_camada, SPATIAL_INDEX="YES",
+                   **opcoes_motor(resolver_motor(motor)))
+
+
+def escrever_geoparquet(camada, caminho, motor=None, indice_espacial=False):
+    """
+    Escreve a camada como GeoParquet.
+
+    O GeoParquet é sempre gravado pelo pyarrow, qualquer que seja o motor.
+
+    Args:
+        camada (GeoDataFrame): Camada de vértices
+        caminho (str): Caminho do arquivo .parquet
+        motor (str, opcional): Ignorado
+        indice_espacial (bool, opcional): Grava a coluna "bbox" de cobertura
+    """
+    if importlib.util.find_spec("pyarrow") is None:
+        raise ImportError("A saída GeoParquet requer o pacote pyarrow (pip install pyarrow).")
+    opcoes = {"write_covering_bbox": True} if indice_espacial else {}
+    camada.to_parquet(caminho, index=False, compression=COMPRESSAO_PARQUET, **opcoes)
+
+
+# Formatos de saída: nome -> (extensão, função de escrita)
+FORMATOS_SAIDA = {
+    "shapefile": (".shp", escrever_shapefile),
+    "gpkg": (".gpkg", escrever_geopackage),
+    "parquet": (".parquet", escrever_geoparquet),
+}
+
+# Formato usado quando o caminho não indica nenhum
+FORMATO_PADRAO = "shapefile"
+
+
+def identificar_formato(caminho, formato=None):
+    """
+    Identifica o formato de saída de um caminho.
+
+    Args:
+        caminho (str): Caminho do arquivo de saída
+        formato (str, opcional): Nome do formato; tem precedência sobre a extensão
+
+    Returns:
+        str: Nome do formato (chave de FORMATOS_SAIDA)
+
+    Raises:
+        ValueError: Se o formato ou a extensão não forem suportados
+    """
+    if formato is not None:
+        formato = formato.lower()
+        if formato not in FORMATOS_SAIDA:
+            raise ValueError(f"Formato de saída não suportado: {formato} "
+                             f"(use {', '.join(FORMATOS_SAIDA)})")
+        return formato
+
+    extensao = os.path.splitext(caminho)[1].lower()
+    if not extensao:
+        return FORMATO_PADRAO
+    for nome, (extensao_formato, _) in FORMATOS_SAIDA.items():
+        if extensao == extensao_formato:
+            return nome
+    raise ValueError(f"Extensão de saída não suportada: {extensao} "
+                     f"(use {', '.join(ext for ext, _ in FORMATOS_SAIDA.values())})")
+
+
+def ajustar_extensao(caminho, formato):
+    """
+    Garante que o caminho de saída tenha a extensão do formato.
+
+    Args:
+        caminho (str): Caminho do arquivo de saída
+        formato (str): Nome do formato
+
+    Returns:
+        str: Caminho com a extensão do formato
+    """
+    extensao = FORMATOS_SAIDA[formato][0]
+    base, extensao_atual = os.path.splitext(caminho)
+    if extensao_atual.lower() == extensao:
+        return caminho
+    return f"{base}{extensao}"
+
+
+def escrever_camada(camada, caminho, formato=None, motor=None, indice_espacial=False):
+    """
+    Escreve a camada de vértices no formato indicado pelo caminho ou pelo nome.
+
+    Args:
+        camada (GeoDataFrame): Camada de vértices
+        caminho (str): Caminho do arquivo de saída
+        formato (str, opcional): Nome do formato; por padrão usa a extensão
+        motor (str, opcional): Motor de escrita ("arrow" ou "padrao", ver motor_io)
+        indice_espacial (bool, opcional): Grava também o índice espacial da camada
+
+    Returns:
+        str: Nome do formato usado
+    """
+    formato = identificar_formato(caminho, formato)
+    FORMATOS_SAIDA[formato][1](camada, caminho, motor, indice_espacial)
+    return formato
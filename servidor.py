@@ -0,0 +1,375 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Servidor de Trabalhos
+---------------------
+Modo servidor do Gerador de Vértices: um processo de longa duração que
+recebe trabalhos por uma API HTTP/JSON local e os executa em um pool de
+processos limitado. Cada processo do pool importa geopandas, pyproj e
+openpyxl uma única vez ao ser criado e mantém o seu pool de
+transformadores entre os trabalhos, de modo que o tempo de trabalhos
+pequenos é o do processamento e não o da inicialização do Python.
+
+API (JSON em UTF-8):
+
+- POST /trabalhos: cria um trabalho. Corpo:
+  {"entrada": "pontos.shp", "excel": "tabela.xlsx", "saida": "vertices.gpkg",
+  "opcoes": {"fuso_referencia": "centroide"}}. Apenas "entrada" é
+  obrigatória; sem "excel" e "saida", as saídas são gravadas ao lado da
+  entrada. Responde 202 com o trabalho criado.
+- GET /trabalhos: lista os trabalhos.
+- GET /trabalhos/<id>: estado e, ao final, resultado do trabalho. Em caso
+  de falha, o resultado traz apenas a mensagem de erro; o rastreamento da
+  exceção é registrado no log do servidor.
+- DELETE /trabalhos/<id>: cancela um trabalho que ainda está na fila.
+- GET /saude: estado do servidor.
+
+Por segurança o servidor escuta apenas em 127.0.0.1 por padrão: os
+trabalhos leem e gravam arquivos com as permissões do usuário que o
+iniciou.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from processamento_lote import _processar_item, caminhos_saida, inicializar_processo
+
+logger = logging.getLogger(__name__)
+
+HOST_PADRAO = "127.0.0.1"
+PORTA_PADRAO = 8765
+
+# Trabalhos aguardando ou em execução aceitos ao mesmo tempo
+LIMITE_FILA = 1000
+
+# Trabalhos concluídos mantidos para consulta (os mais antigos são descartados)
+LIMITE_HISTORICO = 1000
+
+# Opções de processar_shapefile aceitas em "opcoes"
+OPCOES_PERMITIDAS = (
+    "tamanho_bloco", "fuso_referencia", "formato_saida", "motor", "medir_memoria",
+    "caminho_metricas", "usar_cache", "diretorio_cache", "escrita_paralela", "formato_tabela",
+    "separador_decimal", "linhas_por_planilha", "indice_espacial", "ordenacao", "contorno"
+)
+
+# Estados de um trabalho
+NA_FILA = "na_fila"
+EXECUTANDO = "executando"
+CONCLUIDO = "concluido"
+FALHOU = "falhou"
+CANCELADO = "cancelado"
+
+
+def _identificar_processo():
+    """Trabalho vazio usado para criar os processos do pool na partida."""
+    return os.getpid()
+
+
+class Trabalho:
+    """
+    Um trabalho enviado ao servidor.
+
+    Attributes:
+        id (str): Identificador do trabalho
+        entrada (str): Arquivo de entrada
+        excel (str): Caminho do Excel de saída
+        saida (str): Caminho da camada de saída
+        opcoes (dict): Argumentos adicionais de processar_shapefile
+        criado (float): Momento do envio (time.time())
+        futuro (Future): Execução no pool de processos
+    """
+
+    def __init__(self, entrada, excel, saida, opcoes, futuro):
+        self.id = uuid.uuid4().hex
+        self.entrada = entrada
+        self.excel = excel
+        self.saida = saida
+        self.opcoes = opcoes
+        self.criado = time.time()
+        self.futuro = futuro
+        futuro.add_done_callback(self._registrar_falha)
+
+    def _registrar_falha(self, futuro):
+        """Registra no log do servidor o rastreamento de um trabalho que falhou."""
+        if futuro.cancelled():
+            return
+        excecao = futuro.exception()
+        if excecao is not None:
+            logger.error(f"Trabalho {self.id} falhou: {type(excecao).__name__}: {excecao}", exc_info=excecao)
+        elif futuro.result().get("detalhes"):
+            logger.error(f"Trabalho {self.id} falhou: {futuro.result()['erro']}\n{futuro.result()['detalhes']}")
+
+    @property
+    def estado(self):
+        """Estado atual: na_fila, executando, concluido, falhou ou cancelado."""
+        if self.futuro.cancelled():
+            return CANCELADO
+        if not self.futuro.done():
+            return EXECUTANDO if self.futuro.running() else NA_FILA
+        if self.futuro.exception() is not None or not self.futuro.result()["sucesso"]:
+            return FALHOU
+        return CONCLUIDO
+
+    def para_dict(self):
+        """Representação do trabalho para a API."""
+        dados = {
+            "id": self.id,
+            "estado": self.estado,
+            "entrada": self.entrada,
+            "excel": self.excel,
+            "saida": self.saida,
+            "opcoes": self.opcoes,
+            "criado": self.criado
+        }
+        if self.futuro.done() and not self.futuro.cancelled():
+            excecao = self.futuro.exception()
+            if excecao is not None:
+                # Falha do próprio processo (ex: processo encerrado abruptamente)
+                dados["resultado"] = {"sucesso": False, "erro": f"{type(excecao).__name__}: {excecao}"}
+            else:
+                # O rastreamento fica no log do servidor: ele expõe caminhos e
+                # código do servidor e não é enviado aos clientes
+                dados["resultado"] = {chave: valor for chave, valor in self.futuro.result().items()
+                                      if chave != "detalhes"}
+        return dados
+
+
+class GerenciadorTrabalhos:
+    """Fila de trabalhos executados em um pool de processos pré-aquecidos."""
+
+    def __init__(self, workers=None, limite_fila=LIMITE_FILA, limite_historico=LIMITE_HISTORICO):
+        """
+        Args:
+            workers (int, opcional): Número de processos (padrão: número de CPUs)
+            limite_fila (int, opcional): Trabalhos pendentes aceitos ao mesmo tempo
+            limite_historico (int, opcional): Trabalhos concluídos mantidos para consulta
+        """
+        self.workers = workers or os.cpu_count()
+        self.limite_fila = limite_fila
+        self.limite_historico = limite_historico
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=inicializar_processo)
+        self._trabalhos = OrderedDict()
+        self._trava = threading.Lock()
+
+    def preaquecer(self):
+        """
+        Cria todos os processos do pool (que importam as bibliotecas ao
+        iniciar) e aguarda até que estejam prontos.
+
+        Returns:
+            int: Número de processos prontos
+        """
+        futuros = [self._executor.submit(_identificar_processo) for _ in range(self.workers)]
+        return len({futuro.result() for futuro in futuros})
+
+    def submeter(self, dados):
+        """
+        Valida um pedido e coloca o trabalho na fila.
+
+        Args:
+            dados (dict): Corpo do POST /trabalhos
+
+        Returns:
+            Trabalho: Trabalho criado
+
+        Raises:
+            ValueError: Se o pedido for inválido
+            OverflowError: Se a fila estiver cheia
+        """
+        if not isinstance(dados, dict):
+            raise ValueError("O corpo do pedido deve ser um objeto JSON.")
+        entrada = dados.get("entrada")
+        if not isinstance(entrada, str) or not entrada:
+            raise ValueError('O campo "entrada" é obrigatório.')
+        opcoes = dados.get("opcoes") or {}
+        if not isinstance(opcoes, dict):
+            raise ValueError('O campo "opcoes" deve ser um objeto JSON.')
+        desconhecidas = sorted(set(opcoes) - set(OPCOES_PERMITIDAS))
+        if desconhecidas:
+            raise ValueError(f"Opções desconhecidas: {', '.join(desconhecidas)}. "
+                             f"Aceitas: {', '.join(OPCOES_PERMITIDAS)}.")
+
+        entrada = os.path.abspath(entrada)
+        excel_padrao, saida_padrao = caminhos_saida(entrada, os.path.dirname(entrada), os.path.dirname(entrada))
+        excel = os.path.abspath(dados.get("excel") or excel_padrao)
+        saida = os.path.abspath(dados.get("saida") or saida_padrao)
+
+        with self._trava:
+            if self._contar_pendentes() >= self.limite_fila:
+                raise OverflowError(f"A fila está cheia ({self.limite_fila} trabalhos pendentes).")
+            # O servidor reaproveita o cache, como a linha de comando, salvo pedido em contrário
+            opcoes = {"usar_cache": True, **opcoes}
+            futuro = self._executor.submit(_processar_item, entrada, excel, saida, opcoes)
+            trabalho = Trabalho(entrada, excel, saida, opcoes, futuro)
+            self._trabalhos[trabalho.id] = trabalho
+            self._descartar_antigos()
+
+        logger.info(f"Trabalho {trabalho.id} recebido: {entrada}")
+        return trabalho
+
+    def pendentes(self):
+        """Número de trabalhos na fila ou em execução."""
+        with self._trava:
+            return self._contar_pendentes()
+
+    def _contar_pendentes(self):
+        # Chamado com a trava já adquirida
+        return sum(1 for trabalho in self._trabalhos.values() if not trabalho.futuro.done())
+
+    def _descartar_antigos(self):
+        concluidos = [id_ for id_, trabalho in self._trabalhos.items() if trabalho.futuro.done()]
+        for id_ in concluidos[:max(0, len(concluidos) - self.limite_historico)]:
+            del self._trabalhos[id_]
+
+    def obter(self, id_trabalho):
+        """Retorna o trabalho com o identificador, ou None."""
+        with self._trava:
+            return self._trabalhos.get(id_trabalho)
+
+    def listar(self):
+        """Retorna todos os trabalhos, do mais antigo ao mais recente."""
+        with self._trava:
+            return list(self._trabalhos.values())
+
+    def cancelar(self, id_trabalho):
+        """
+        Cancela um trabalho que ainda não começou.
+
+        Returns:
+            bool: True se o trabalho foi cancelado
+        """
+        trabalho = self.obter(id_trabalho)
+        return trabalho is not None and trabalho.futuro.cancel()
+
+    def encerrar(self):
+        """Cancela os trabalhos na fila e aguarda os que estão em execução."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class _ManipuladorHTTP(BaseHTTPRequestHandler):
+    """Traduz os pedidos HTTP para o GerenciadorTrabalhos do servidor."""
+
+    server_version = "GeradorVertices"
+
+    @property
+    def gerenciador(self):
+        return self.server.gerenciador
+
+    def _responder(self, status, dados):
+        corpo = json.dumps(dados, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _erro(self, status, mensagem):
+        self._responder(status, {"erro": mensagem})
+
+    def _id_trabalho(self):
+        partes = self.path.rstrip("/").split("/")
+        if len(partes) == 3 and partes[1] == "trabalhos":
+            return partes[2]
+        return None
+
+    def do_GET(self):
+        caminho = self.path.rstrip("/")
+        if caminho == "/saude":
+            self._responder(HTTPStatus.OK, {
+                "estado": "ok",
+                "workers": self.gerenciador.workers,
+                "pendentes": self.gerenciador.pendentes()
+            })
+        elif caminho == "/trabalhos":
+            self._responder(HTTPStatus.OK, [trabalho.para_dict() for trabalho in self.gerenciador.listar()])
+        else:
+            trabalho = self.gerenciador.obter(self._id_trabalho())
+            if trabalho is None:
+                self._erro(HTTPStatus.NOT_FOUND, f"Recurso não encontrado: {self.path}")
+            else:
+                self._responder(HTTPStatus.OK, trabalho.para_dict())
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/trabalhos":
+            self._erro(HTTPStatus.NOT_FOUND, f"Recurso não encontrado: {self.path}")
+            return
+        try:
+            tamanho = int(self.headers.get("Content-Length", 0))
+            dados = json.loads(self.rfile.read(tamanho).decode("utf-8"))
+        except (ValueError, UnicodeDecodeError) as e:
+            self._erro(HTTPStatus.BAD_REQUEST, f"JSON inválido: {e}")
+            return
+
+        try:
+            trabalho = self.gerenciador.submeter(dados)
+        except ValueError as e:
+            self._erro(HTTPStatus.BAD_REQUEST, str(e))
+        except OverflowError as e:
+            self._erro(HTTPStatus.SERVICE_UNAVAILABLE, str(e))
+        else:
+            self._responder(HTTPStatus.ACCEPTED, trabalho.para_dict())
+
+    def do_DELETE(self):
+        id_trabalho = self._id_trabalho()
+        trabalho = self.gerenciador.obter(id_trabalho)
+        if trabalho is None:
+            self._erro(HTTPStatus.NOT_FOUND, f"Recurso não encontrado: {self.path}")
+        elif self.gerenciador.cancelar(id_trabalho):
+            self._responder(HTTPStatus.OK, trabalho.para_dict())
+        else:
+            self._erro(HTTPStatus.CONFLICT, f"O trabalho já está {trabalho.estado} e não pode ser cancelado.")
+
+    def log_message(self, formato, *args):
+        logger.debug(f"{self.address_string()} - {formato % args}")
+
+
+def criar_servidor(host=HOST_PADRAO, porta=PORTA_PADRAO, workers=None):
+    """
+    Cria o servidor HTTP e o seu pool de processos.
+
+    Args:
+        host (str, opcional): Endereço de escuta (padrão: 127.0.0.1)
+        porta (int, opcional): Porta (0 escolhe uma porta livre)
+        workers (int, opcional): Número de processos (padrão: número de CPUs)
+
+    Returns:
+        ThreadingHTTPServer: Servidor com o atributo `gerenciador`
+    """
+    servidor = ThreadingHTTPServer((host, porta), _ManipuladorHTTP)
+    servidor.daemon_threads = True
+    servidor.gerenciador = GerenciadorTrabalhos(workers)
+    return servidor
+
+
+def servir(host=HOST_PADRAO, porta=PORTA_PADRAO, workers=None):
+    """
+    Inicia o servidor e atende pedidos até ser interrompido (Ctrl+C).
+
+    Args:
+        host (str, opcional): Endereço de escuta (padrão: 127.0.0.1)
+        porta (int, opcional): Porta
+        workers (int, opcional): Número de processos (padrão: número de CPUs)
+    """
+    servidor = criar_servidor(host, porta, workers)
+    host, porta = servidor.server_address[:2]
+    inicio = time.perf_counter()
+    prontos = servidor.gerenciador.preaquecer()
+    logger.info(f"{prontos} processo(s) pré-aquecido(s) em {time.perf_counter() - inicio:.2f}s.")
+    print(f"Servidor do Gerador de Vértices em http://{host}:{porta} "
+          f"com {servidor.gerenciador.workers} processo(s). Ctrl+C para encerrar.")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nEncerrando o servidor...")
+    finally:
+        servidor.server_close()
+        servidor.gerenciador.encerrar()
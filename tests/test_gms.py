@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Testes da Conversão para GMS
+----------------------------
+Casos de "vai um" do arredondamento dos segundos em decimal_para_gms e
+equivalência da versão vetorizada decimal_para_gms_lote.
+"""
+
+import numpy as np
+import pytest
+
+from gerador_vertices import decimal_para_gms, decimal_para_gms_lote
+
+
+def graus_decimais(graus, minutos, segundos):
+    """Coordenada decimal a partir de graus, minutos e segundos."""
+    return graus + minutos / 60 + segundos / 3600
+
+
+@pytest.mark.parametrize("coordenada, esperado", [
+    # 59,999999'' arredonda para 60'' e passa para o minuto seguinte
+    (graus_decimais(10, 30, 59.999999), "10 31' 0.00000''"),
+    # 59' 59,999999'' passa para o grau seguinte
+    (graus_decimais(10, 59, 59.999999), "11 00' 0.00000''"),
+    (-graus_decimais(35, 59, 59.999999), "-36 00' 0.00000''"),
+    # Sem "vai um"
+    (graus_decimais(7, 54, 0.09872), "07 54' 0.09872''"),
+    (0.0, "00 00' 0.00000''"),
+])
+def test_vai_um_dos_segundos(coordenada, esperado):
+    assert decimal_para_gms(coordenada) == esperado
+    assert decimal_para_gms_lote(np.array([coordenada]))[0] == esperado
+
+
+def test_lote_igual_ao_escalar():
+    gerador = np.random.default_rng(20240601)
+    coordenadas = np.concatenate([
+        gerador.uniform(-180, 180, 5000),
+        # Segundos logo abaixo e acima de 60'', onde o "vai um" acontece
+        graus_decimais(gerador.integers(0, 90, 1000), 59, 60 - gerador.uniform(0, 1e-5, 1000)),
+        -graus_decimais(gerador.integers(0, 90, 1000), gerador.integers(0, 60, 1000),
+                        gerador.uniform(59.99999, 60, 1000)),
+    ])
+
+    lote = decimal_para_gms_lote(coordenadas)
+
+    assert lote.tolist() == [decimal_para_gms(float(coordenada)) for coordenada in coordenadas]
+
+
+def test_lote_vazio():
+    assert len(decimal_para_gms_lote(np.array([]))) == 0
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Testes da Ordenação Angular
+---------------------------
+Equivalência da ordenação angular vetorizada (ordenar_sentido_horario,
+com np.lexsort) com a caminhada ponto a ponto original.
+"""
+
+import numpy as np
+import pytest
+
+from gerador_vertices import calcular_azimute
+from ordenacao import calcular_azimutes, calcular_centro, ordenar_sentido_horario
+
+
+def caminhada_original(azimutes, nortes_utm):
+    """
+    Ordem da caminhada original: a partir do ponto mais ao norte, o próximo
+    vértice é sempre o de menor azimute estritamente maior; sem nenhum, a
+    caminhada dá uma nova volta.
+    """
+    primeiro = max(range(len(azimutes)), key=lambda i: (nortes_utm[i], -i))
+    ordem = [primeiro]
+    restantes = [i for i in range(len(azimutes)) if i != primeiro]
+    atual = primeiro
+    while restantes:
+        proximos = [i for i in restantes if azimutes[i] > azimutes[atual]] or restantes
+        proximo = min(proximos, key=lambda i: azimutes[i] - azimutes[atual]
+                      if azimutes[i] > azimutes[atual] else azimutes[i] + 360 - azimutes[atual])
+        ordem.append(proximo)
+        restantes.remove(proximo)
+        atual = proximo
+    return ordem
+
+
+@pytest.mark.parametrize("semente", range(5))
+def test_igual_a_caminhada_original(semente):
+    gerador = np.random.default_rng(semente)
+    n = 300
+    # Azimutes arredondados a 5 graus para forçar empates (pontos alinhados com o centro)
+    azimutes = np.round(gerador.uniform(0, 360, n) / 5) * 5 % 360
+    nortes = gerador.uniform(9e6, 9.1e6, n)
+
+    assert ordenar_sentido_horario(azimutes, nortes).tolist() == caminhada_original(azimutes.tolist(), nortes.tolist())
+
+
+def test_azimutes_iguais_ao_calculo_original():
+    gerador = np.random.default_rng(7)
+    x = gerador.uniform(-35.1, -34.9, 1000)
+    y = gerador.uniform(-8.1, -7.9, 1000)
+    centro = calcular_centro(x, y)
+
+    esperado = [calcular_azimute((xi, yi), centro) for xi, yi in zip(x.tolist(), y.tolist())]
+
+    assert calcular_azimutes(x, y, centro).tolist() == esperado
+
+
+def test_sem_pontos():
+    assert len(ordenar_sentido_horario(np.array([]), np.array([]))) == 0
@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Pool de Transformadores
+-----------------------
+Registro de objetos pyproj.Transformer reutilizáveis, compartilhado por
+todas as conversões de coordenadas do Gerador de Vértices.
+
+Criar um Transformer é muito mais caro do que usá-lo, por isso os
+transformadores são mantidos em cache (com descarte LRU) e indexados pelo
+CRS de origem, CRS de destino, hemisfério e fuso UTM.
+"""
+
+import threading
+from collections import OrderedDict
+
+from pyproj import CRS, Transformer
+
+# Capacidade padrão do pool (número de transformadores mantidos em memória)
+CAPACIDADE_PADRAO = 32
+
+
+def _chave_crs(crs):
+    """
+    Retorna uma chave hashable e barata para identificar um CRS.
+
+    Args:
+        crs: CRS do pyproj, código EPSG (int) ou string aceita pelo pyproj
+
+    Returns:
+        Chave para o dicionário do pool
+    """
+    if isinstance(crs, (int, str)):
+        return crs
+    # CRS do pyproj: a string de definição original evita gerar o WKT a cada consulta
+    srs = getattr(crs, "srs", None)
+    return srs if srs else crs
+
+
+def crs_utm(fuso, hemisferio):
+    """
+    Monta a string PROJ do CRS UTM para um fuso e hemisfério.
+
+    Args:
+        fuso (int): Número do fuso UTM (1-60)
+        hemisferio (str): 'S' para o hemisfério sul ou 'N' para o norte
+
+    Returns:
+        str: Definição PROJ do CRS UTM
+    """
+    if hemisferio == "S":
+        return f"+proj=utm +zone={fuso} +south"
+    return f"+proj=utm +zone={fuso}"
+
+
+class PoolTransformadores:
+    """Cache LRU e thread-safe de transformadores do pyproj."""
+
+    def __init__(self, capacidade=CAPACIDADE_PADRAO):
+        if capacidade < 1:
+            raise ValueError("A capacidade do pool deve ser de pelo menos 1 transformador.")
+        self.capacidade = capacidade
+        self._transformadores = OrderedDict()
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, crs_origem, crs_destino, hemisferio=None, fuso=None):
+        """
+        Obtém um transformador do pool, criando-o se necessário.
+
+        Args:
+            crs_origem: CRS de origem (CRS do pyproj, EPSG ou string)
+            crs_destino: CRS de destino (CRS do pyproj, EPSG ou string)
+            hemisferio (str, opcional): Hemisfério ('N' ou 'S') quando o destino é UTM
+            fuso (int, opcional): Fuso UTM quando o destino é UTM
+
+        Returns:
+            Transformer: Transformador com always_xy=True
+        """
+        chave = (_chave_crs(crs_origem), _chave_crs(crs_destino), hemisferio, fuso)
+
+        with self._trava:
+            transformador = self._transformadores.get(chave)
+            if transformador is not None:
+                self._transformadores.move_to_end(chave)
+                self.acertos += 1
+                return transformador
+            self.falhas += 1
+
+        # Criar fora da trava para não serializar as outras threads
+        transformador = Transformer.from_crs(
+            CRS.from_user_input(crs_origem),
+            CRS.from_user_input(crs_destino),
+            always_xy=True
+        )
+
+        with self._trava:
+            # Outra thread pode ter criado o mesmo transformador nesse meio tempo
+            existente = self._transformadores.get(chave)
+            if existente is not None:
+                self._transformadores.move_to_end(chave)
+                return existente
+            self._transformadores[chave] = transformador
+            while len(self._transformadores) > self.capacidade:
+                self._transformadores.popitem(last=False)
+
+        return transformador
+
+    def obter_utm(self, fuso, hemisferio):
+        """
+        Obtém o transformador de WGS84 para o fuso UTM informado.
+
+        Args:
+            fuso (int): Número do fuso UTM
+            hemisferio (str): 'S' para o hemisfério sul ou 'N' para o norte
+
+        Returns:
+            Transformer: Transformador WGS84 -> UTM
+        """
+        return self.obter(4326, crs_utm(fuso, hemisferio), hemisferio, fuso)
+
+    def obter_geografico(self, crs_origem):
+        """
+        Obtém o transformador do CRS informado para WGS84.
+
+        Args:
+            crs_origem: CRS de origem (CRS do pyproj, EPSG ou string)
+
+        Returns:
+            Transformer: Transformador CRS de origem -> WGS84
+        """
+        return self.obter(crs_origem, 4326)
+
+    def estatisticas(self):
+        """
+        Retorna os contadores de uso do pool.
+
+        Returns:
+            dict: Acertos, falhas, tamanho atual e capacidade do pool
+        """
+        with self._trava:
+            return {
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "tamanho": len(self._transformadores),
+                "capacidade": self.capacidade
+            }
+
+    def zerar_estatisticas(self):
+        """Zera os contadores de acertos e falhas."""
+        with self._trava:
+            self.acertos = 0
+            self.falhas = 0
+
+    def limpar(self):
+        """Remove todos os transformadores do pool e zera os contadores."""
+        with self._trava:
+            self._transformadores.clear()
+            self.acertos = 0
+            self.falhas = 0
+
+
+# Pool compartilhado por todo o processo
+pool_transformadores = PoolTransformadores()